@@ -0,0 +1,85 @@
+"""
+Generate the bulk sheets of many accounts from one manifest.
+
+Each job in the manifest is one account or brand: its keyword and SKU lists (file
+paths or inline lists), settings overriding the manifest defaults, and optionally a
+keyword bid CSV and a bulk export of its live campaigns. A job may instead give a
+CSV of SKU/keyword "pairs", generating campaigns only for those pairs. Jobs run in
+threads of one process (generation uses one core; run several processes on split
+manifests to use more); inputs used by several jobs are loaded once, and keyword groups, negative
+keyword indexes and name templates are built once for all jobs sharing them.
+
+Example manifest:
+
+    {
+      "output_dir": "batch_output",
+      "formats": ["xlsx", "csv.gz"],
+      "defaults": {
+        "daily_budget": 10, "start_date": "2027-01-01",
+        "match_types": ["exact", "phrase"], "bids": {"exact": 0.75, "phrase": 0.6},
+        "campaign_name_template": "SP_[SKU]_match_type", "ad_group_name_template": "AG_[SKU]_match_type"
+      },
+      "jobs": [
+        {"name": "brand-a", "keywords": "keywords/core.csv", "skus": "skus/brand_a.csv"},
+        {"name": "brand-b", "keywords": "keywords/core.csv", "skus": "skus/brand_b.csv",
+         "settings": {"daily_budget": 25}, "existing": "exports/brand_b.xlsx"},
+        {"name": "brand-c", "pairs": "pairs/brand_c.csv"}
+      ]
+    }
+
+Outputs are written to OUTPUT_DIR/output as <job name>_<batch id>.<format>, with
+<job name>_campaign_ids_<batch id>.csv mapping the generated campaign IDs back to
+campaign names and a batch_<batch id>.json summary. The process exits with status 1 if any job failed.
+
+Usage:
+    python batch_generate.py manifest.json --workers 8 --metrics-port 9100
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from amazon_bulk_generator.core.batch import BATCH_JOB_DONE, BatchRunner, load_manifest
+from amazon_bulk_generator.utils.metrics import start_metrics_server
+from amazon_bulk_generator.utils.tracing import TraceWriter, trace_log_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate bulk sheets for every job of a batch manifest")
+    parser.add_argument('manifest', help="JSON manifest of jobs")
+    parser.add_argument('--workers', type=int, help="Jobs run concurrently in threads (default: the manifest's, or 4)")
+    parser.add_argument('--output-dir', help="Output directory (default: the manifest's, or batch_output)")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve Prometheus metrics on this port while running (default: METRICS_PORT)")
+    args = parser.parse_args()
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        parser.error(f"Invalid manifest: {e}")
+    if args.workers:
+        manifest.workers = args.workers
+    if args.output_dir:
+        manifest.output_dir = args.output_dir
+
+    start_metrics_server(args.metrics_port)
+    trace_path = trace_log_path(manifest.output_dir)
+    runner = BatchRunner(manifest, trace_writer=TraceWriter.shared(trace_path) if trace_path else None)
+
+    print(f"Running {len(manifest.jobs)} jobs with {manifest.workers} workers into {manifest.output_dir}")
+    results = runner.run()
+
+    print(f"{'job':<24} {'status':<8} {'rows':>10} {'seconds':>9}  outputs")
+    for result in results:
+        outputs = ', '.join(result.paths.values()) or result.error
+        print(f"{result.name:<24} {result.status:<8} {result.rows:>10,} {result.seconds:>9.2f}  {outputs}")
+
+    failed = [result for result in results if result.status != BATCH_JOB_DONE]
+    print(f"{len(results) - len(failed)} of {len(results)} jobs done; "
+          f"{runner.inputs.loads} inputs loaded, generation cache {runner.generator.cache.hits} hits")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
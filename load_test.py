@@ -0,0 +1,188 @@
+"""
+Load test for the Streamlit app: drive many headless sessions in parallel.
+
+Each session enters synthetic keywords and SKUs (step 1), continues to campaign
+settings (step 2) and generates a bulk sheet, waiting for the background job to
+finish. Sessions run in one process against shared caches, like users of a single
+server. For every concurrency level the script reports throughput, latency
+percentiles and the process's resident memory.
+
+Streamlit's AppTest installs a process-wide runtime for each script run, so script
+runs are serialized by a lock; the generation jobs they start overlap freely. Stage
+latencies therefore include waiting for other sessions' script runs, much as a busy
+single-process server queues them behind the GIL.
+
+Usage:
+    python load_test.py --concurrency 1,2,4,8 --keywords 200 --skus 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from streamlit.testing.v1 import AppTest
+
+from amazon_bulk_generator.utils.metrics import peak_memory_bytes, resident_memory_bytes
+
+APP_SCRIPT = str(Path(__file__).parent / 'streamlit_app.py')
+CONTINUE_LABEL = "Continue to Campaign Settings ➡️"
+GENERATE_LABEL = "🎯 Generate Bulk Sheet"
+STAGES = ('load', 'step1', 'step2', 'generate', 'total')
+
+_script_run_lock = threading.Lock()
+
+def run_script(element) -> AppTest:
+    """Run the app script for an AppTest or a widget interaction, one session at a time"""
+    with _script_run_lock:
+        return element.run()
+
+def synthetic_inputs(keyword_count: int, sku_count: int, seed: int) -> Dict[str, str]:
+    """Distinct keyword and SKU lists per session, so sessions do not share stored inputs"""
+    keywords = [f"synthetic term {seed} {i} widget" for i in range(keyword_count)]
+    skus = [f"LT{seed:04d}-{i:05d}" for i in range(sku_count)]
+    return {'keywords': '\n'.join(keywords), 'skus': '\n'.join(skus)}
+
+def click(at: AppTest, label: str, timeout: float) -> None:
+    for button in at.button:
+        if button.label == label:
+            with _script_run_lock:
+                button.click().run(timeout=timeout)
+            return
+    raise RuntimeError(f"Button not found: {label}")
+
+def run_session(seed: int, args: argparse.Namespace) -> Dict[str, float]:
+    """Run one session through step 1, step 2 and generation; return stage latencies in seconds"""
+    inputs = synthetic_inputs(args.keywords, args.skus, seed)
+    timings = {}
+    start = time.perf_counter()
+
+    at = run_script(AppTest.from_file(APP_SCRIPT, default_timeout=args.timeout))
+    timings['load'] = time.perf_counter() - start
+
+    mark = time.perf_counter()
+    run_script(at.text_area(key="keyword_text_input").set_value(inputs['keywords']))
+    run_script(at.text_area(key="sku_text_input").set_value(inputs['skus']))
+    click(at, CONTINUE_LABEL, args.timeout)
+    timings['step1'] = time.perf_counter() - mark
+    if at.session_state['step'] != 2:
+        raise RuntimeError(f"Session {seed} did not reach step 2: {[e.value for e in at.error]}")
+
+    mark = time.perf_counter()
+    run_script(at)
+    timings['step2'] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    click(at, GENERATE_LABEL, args.timeout)
+    job = at.session_state['generation_job']
+    job.join(args.timeout)
+    if job.status != 'done':
+        raise RuntimeError(f"Session {seed} generation {job.status}: {job.error}")
+    timings['generate'] = time.perf_counter() - mark
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return float('nan')
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+def run_level(concurrency: int, args: argparse.Namespace, seed_offset: int) -> Dict:
+    """Run sessions at one concurrency level while sampling resident memory"""
+    sessions = args.sessions or concurrency * 2
+    samples = [resident_memory_bytes()]
+    stop = threading.Event()
+
+    def sample_memory():
+        while not stop.wait(0.2):
+            samples.append(resident_memory_bytes())
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    results, errors = [], []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(run_session, seed_offset + i, args) for i in range(sessions)]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+    wall = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+
+    summary = {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'errors': len(errors),
+        'wall_seconds': round(wall, 3),
+        'sessions_per_second': round(len(results) / wall, 3) if wall else 0.0,
+        'rss_start_mb': round(samples[0] / 1024 / 1024, 1),
+        'rss_max_mb': round(max(samples) / 1024 / 1024, 1),
+        'peak_rss_mb': round(peak_memory_bytes() / 1024 / 1024, 1),
+        'latency': {
+            stage: {
+                'p50': round(percentile([r[stage] for r in results], 0.50), 3),
+                'p95': round(percentile([r[stage] for r in results], 0.95), 3),
+                'max': round(max((r[stage] for r in results), default=float('nan')), 3),
+            }
+            for stage in STAGES
+        },
+    }
+    if errors:
+        summary['first_error'] = errors[0]
+    return summary
+
+def print_summary(summary: Dict) -> None:
+    total = summary['latency']['total']
+    generate = summary['latency']['generate']
+    print(
+        f"{summary['concurrency']:>5} {summary['sessions']:>8} {summary['errors']:>6} "
+        f"{summary['sessions_per_second']:>9.2f} {total['p50']:>8.2f} {total['p95']:>8.2f} "
+        f"{generate['p50']:>8.2f} {generate['p95']:>8.2f} {summary['rss_max_mb']:>9.1f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the bulk campaign Streamlit app")
+    parser.add_argument('--concurrency', default='1,2,4,8',
+                        help="Comma-separated numbers of parallel sessions (default: 1,2,4,8)")
+    parser.add_argument('--sessions', type=int, default=0,
+                        help="Sessions per concurrency level (default: twice the concurrency)")
+    parser.add_argument('--keywords', type=int, default=200, help="Keywords per session (default: 200)")
+    parser.add_argument('--skus', type=int, default=20, help="SKUs per session (default: 20)")
+    parser.add_argument('--timeout', type=float, default=300, help="Seconds allowed per script run or job")
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    print(f"Sessions of {args.keywords} keywords x {args.skus} SKUs against {APP_SCRIPT} (pid {os.getpid()})")
+    print(f"{'conc':>5} {'sessions':>8} {'errors':>6} {'sess/s':>9} {'p50 s':>8} {'p95 s':>8} "
+          f"{'gen p50':>8} {'gen p95':>8} {'RSS MB':>9}")
+
+    summaries = []
+    seed_offset = 0
+    for concurrency in levels:
+        summary = run_level(concurrency, args, seed_offset)
+        seed_offset += summary['sessions']
+        summaries.append(summary)
+        print_summary(summary)
+        if summary.get('first_error'):
+            print(f"      first error: {summary['first_error']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'keywords': args.keywords, 'skus': args.skus, 'levels': summaries}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
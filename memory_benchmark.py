@@ -0,0 +1,198 @@
+"""
+Memory benchmark for the bulk sheet pipeline, with per-stage ceilings.
+
+For each input scale (keywords x SKUs) the pipeline runs stage by stage under
+tracemalloc, recording each stage's peak allocation above what was live when it
+started, and what it left allocated once finished:
+
+    rows        campaign rows as a list of dicts
+    dataframe   the unformatted DataFrame
+    format      _format_dataframe (replace and numeric formatting copies)
+    write_xlsx  the workbook written by FileHandler.save_bulk_sheet
+    write_csv   FileHandler.save_bulk_sheet as CSV
+    stream      the chunked path: iter_bulk_sheet_chunks into save_bulk_sheet_chunks (xlsx)
+
+Ceilings (peak MB) come from a JSON file mapping scale -> stage -> MB, with "*"
+for every scale, and/or --ceiling [SCALE:]STAGE=MB options. The run exits with
+status 1 if any stage exceeds its ceiling, so it can gate a deploy.
+
+tracemalloc sees allocations made through Python and NumPy. Arrow buffers backing
+pandas string columns are not traced; when pyarrow is installed their retained
+size is reported separately. Nor does it see other processes, so XLSX_WORKERS is
+set to 1: sheets of any size are serialized in this process, where their memory
+is measured, rather than by worker processes (which only start above
+XLSX_PARALLEL_MIN_ROWS rows anyway, more than the default scales produce).
+
+Usage:
+    python memory_benchmark.py --scales 50x5,100x10 --ceilings memory_ceilings.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import pandas as pd
+
+from amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignSettings
+from amazon_bulk_generator.utils.file_handlers import FileHandler
+
+try:
+    import pyarrow
+except ImportError:  # Optional: only used to report Arrow buffer sizes
+    pyarrow = None
+
+STAGES = ('rows', 'dataframe', 'format', 'write_xlsx', 'write_csv', 'stream')
+MB = 1024 * 1024
+
+def parse_scale(scale: str) -> Tuple[int, int]:
+    keywords, skus = scale.lower().split('x')
+    return int(keywords), int(skus)
+
+def make_inputs(keyword_count: int, sku_count: int) -> Tuple[List[str], List[str], CampaignSettings]:
+    keywords = [f"benchmark term {i} widget" for i in range(keyword_count)]
+    skus = [f"MB-{i:06d}" for i in range(sku_count)]
+    settings = CampaignSettings(
+        daily_budget=10.0,
+        start_date=date(2025, 1, 1),
+        match_types=['exact', 'phrase', 'broad'],
+        bids={'exact': 0.75, 'phrase': 0.6, 'broad': 0.5},
+        campaign_name_template="SP_[SKU]_match_type",
+        ad_group_name_template="AG_[SKU]_match_type"
+    )
+    return keywords, skus, settings
+
+def arrow_bytes() -> int:
+    return pyarrow.total_allocated_bytes() if pyarrow is not None else 0
+
+def measure(stage: Callable[[], object]) -> Tuple[object, Dict[str, float]]:
+    """Run a stage and return its result with peak and retained allocation in MB (and its time)"""
+    gc.collect()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    arrow_before = arrow_bytes()
+    start = time.perf_counter()
+    result = stage()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    return result, {
+        'peak_mb': round((peak - before) / MB, 2),
+        'retained_mb': round((after - before) / MB, 2),
+        'arrow_retained_mb': round((arrow_bytes() - arrow_before) / MB, 2),
+        'seconds': round(seconds, 3),
+    }
+
+def run_scale(keyword_count: int, sku_count: int, output_dir: str,
+              stages: Sequence[str] = STAGES) -> Dict[str, Dict[str, float]]:
+    """Measure the selected stages for one input scale (rows, dataframe and format always run)"""
+    generator = BulkSheetGenerator()
+    file_handler = FileHandler(base_dir=output_dir)
+    keywords, skus, settings = make_inputs(keyword_count, sku_count)
+    results = {}
+
+    rows, results['rows'] = measure(lambda: [
+        row for campaign in generator._iter_campaign_rows(keywords, skus, settings, None) for row in campaign
+    ])
+    raw, results['dataframe'] = measure(lambda: pd.DataFrame(rows, columns=generator.headers))
+    del rows
+    df, results['format'] = measure(lambda: generator._format_dataframe(raw))
+    del raw
+    if 'write_xlsx' in stages:
+        _, results['write_xlsx'] = measure(lambda: file_handler.save_bulk_sheet(df, 'xlsx'))
+    if 'write_csv' in stages:
+        _, results['write_csv'] = measure(lambda: file_handler.save_bulk_sheet(df, 'csv'))
+    row_count = len(df)
+    del df
+    if 'stream' in stages:
+        _, results['stream'] = measure(lambda: file_handler.save_bulk_sheet_chunks(
+            generator.iter_bulk_sheet_chunks(keywords, skus, settings), 'xlsx'
+        ))
+    results = {stage: values for stage, values in results.items() if stage in stages}
+    for stage in results.values():
+        stage['rows'] = row_count
+    return results
+
+def load_ceilings(path: Optional[str], options: List[str]) -> Dict[str, Dict[str, float]]:
+    """Merge ceilings from a JSON file and [SCALE:]STAGE=MB options into scale -> stage -> MB"""
+    ceilings: Dict[str, Dict[str, float]] = {}
+    if path:
+        with open(path, encoding='utf-8') as f:
+            for scale, stages in json.load(f).items():
+                ceilings.setdefault(scale.lower(), {}).update({stage: float(mb) for stage, mb in stages.items()})
+    for option in options:
+        target, mb = option.split('=')
+        scale, _, stage = target.rpartition(':')
+        ceilings.setdefault(scale.lower() or '*', {})[stage] = float(mb)
+    for stages in ceilings.values():
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages in ceilings: {', '.join(sorted(unknown))}")
+    return ceilings
+
+def ceiling_for(ceilings: Dict[str, Dict[str, float]], scale: str, stage: str) -> Optional[float]:
+    return ceilings.get(scale, {}).get(stage, ceilings.get('*', {}).get(stage))
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage memory benchmark for bulk sheet generation")
+    parser.add_argument('--scales', default='50x5,100x10',
+                        help="Comma-separated KEYWORDSxSKUS input sizes (default: 50x5,100x10)")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help="Comma-separated stages to measure (default: all). Writing XLSX under "
+                             "tracemalloc is slow, so leave out write_xlsx and stream for quick runs")
+    parser.add_argument('--ceilings', help="JSON file of peak MB ceilings: {scale or '*': {stage: MB}}")
+    parser.add_argument('--ceiling', action='append', default=[], metavar='[SCALE:]STAGE=MB',
+                        help="Peak MB ceiling for a stage, optionally for one scale only (repeatable)")
+    parser.add_argument('--json', help="Also write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    ceilings = load_ceilings(args.ceilings, args.ceiling)
+    scales = [scale.strip().lower() for scale in args.scales.split(',') if scale.strip()]
+    selected = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(selected) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+    report = {}
+    failures = []
+
+    # Worker processes are invisible to tracemalloc, so XLSX rows are serialized here at every scale
+    os.environ['XLSX_WORKERS'] = '1'
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as output_dir:
+        for scale in scales:
+            stages = run_scale(*parse_scale(scale), output_dir, selected)
+            report[scale] = stages
+            print(f"\n{scale} ({next(iter(stages.values()))['rows']:,} rows)")
+            print(f"{'stage':<12} {'peak MB':>9} {'retained MB':>12} {'arrow MB':>9} {'ceiling':>9} {'seconds':>8}")
+            for stage, values in stages.items():
+                ceiling = ceiling_for(ceilings, scale, stage)
+                exceeded = ceiling is not None and values['peak_mb'] > ceiling
+                if exceeded:
+                    failures.append(f"{scale} {stage}: peak {values['peak_mb']} MB > ceiling {ceiling} MB")
+                print(f"{stage:<12} {values['peak_mb']:>9.2f} {values['retained_mb']:>12.2f} "
+                      f"{values['arrow_retained_mb']:>9.2f} {'-' if ceiling is None else ceiling:>9} {values['seconds']:>8.2f}"
+                      f"{'  EXCEEDED' if exceeded else ''}")
+    tracemalloc.stop()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'stages': report, 'failures': failures}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if failures:
+        print("\nMemory ceilings exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,9 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=[
-        "streamlit>=1.31.0",
+        "streamlit>=1.37.0",
         "pandas>=2.0.0",
+        "pyarrow>=14.0.0",
         "openpyxl>=3.1.5",
         "streamlit-aggrid==0.3.5",
         "python-decouple>=3.8",
@@ -32,20 +32,34 @@ __version__ = '1.0.0'
 
 # Import main classes for easier access
 from .core.generator import BulkSheetGenerator, CampaignSettings
+from .core.bulk_export import BulkExportIndex
 from .core.validators import (
     validate_keywords,
     validate_skus,
     validate_campaign_settings,
-    validate_name_template
+    validate_name_template,
+    validate_keywords_report,
+    validate_skus_report,
+    validate_asins,
+    validate_asins_report,
+    ValidationReport,
+    ValidationIssue
 )
 from .web.app import BulkCampaignApp
 
 __all__ = [
     'BulkSheetGenerator',
     'CampaignSettings',
+    'BulkExportIndex',
     'validate_keywords',
     'validate_skus',
     'validate_campaign_settings',
     'validate_name_template',
+    'validate_keywords_report',
+    'validate_skus_report',
+    'validate_asins',
+    'validate_asins_report',
+    'ValidationReport',
+    'ValidationIssue',
     'BulkCampaignApp'
 ]
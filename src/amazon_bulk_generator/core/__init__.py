@@ -1,18 +1,32 @@
 """Core functionality for Amazon Bulk Campaign Generator"""
 
 from .generator import BulkSheetGenerator, CampaignSettings
+from .bulk_export import BulkExportIndex
 from .validators import (
     validate_keywords,
     validate_skus,
     validate_campaign_settings,
-    validate_name_template
+    validate_name_template,
+    validate_keywords_report,
+    validate_skus_report,
+    validate_asins,
+    validate_asins_report,
+    ValidationReport,
+    ValidationIssue
 )
 
 __all__ = [
     'BulkSheetGenerator',
     'CampaignSettings',
+    'BulkExportIndex',
     'validate_keywords',
     'validate_skus',
     'validate_campaign_settings',
-    'validate_name_template'
+    'validate_name_template',
+    'validate_keywords_report',
+    'validate_skus_report',
+    'validate_asins',
+    'validate_asins_report',
+    'ValidationReport',
+    'ValidationIssue'
 ]
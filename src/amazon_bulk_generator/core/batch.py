@@ -0,0 +1,415 @@
+from typing import List, Dict, Any, Optional, Union, Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields, replace, asdict
+from datetime import datetime
+import json
+import logging
+import os
+import re
+import threading
+import time
+import pandas as pd
+
+from .bulk_export import BulkExportIndex
+from .checkpoint import GenerationCheckpoint, checkpoint_min_rows_from_env, generation_fingerprint, iter_checkpointed_chunks
+from .generator import BulkSheetGenerator, CampaignSettings, GenerationCache, CAMPAIGN_ID_MAP_PREFIX
+from .validators import validate_campaign_settings, validate_keywords_report, validate_skus_report, ValidationReport
+from ..utils.file_handlers import FileHandler, DEFAULT_COMPRESS_LEVEL, STREAM_FORMATS, new_job_id
+from ..utils.formatters import TextFormatter
+from ..utils.metrics import ACTIVE_JOBS, JOBS, record_generation
+from ..utils.output_store import RetentionPolicy, atomic_path
+from ..utils.tracing import JobTrace, TraceWriter
+
+logger = logging.getLogger(__name__)
+
+# Manifest defaults
+DEFAULT_BATCH_WORKERS = 4
+DEFAULT_BATCH_FORMATS = ('xlsx', 'csv')
+DEFAULT_BATCH_OUTPUT_DIR = 'batch_output'
+MANIFEST_DATE_FORMAT = '%Y-%m-%d'
+JOB_KEYS = {'name', 'keywords', 'skus', 'pairs', 'settings', 'keyword_bids', 'existing'}
+JOB_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')  # Used in output filenames
+
+# Job outcomes (same values as the web app's background jobs)
+BATCH_JOB_DONE = 'done'
+BATCH_JOB_FAILED = 'failed'
+
+# An input list is a file path (relative to the manifest) or the items themselves
+InputSource = Union[str, List[str]]
+
+@dataclass
+class BatchJob:
+    """One account's bulk sheet in a batch"""
+    name: str
+    keywords: Optional[InputSource]  # None when the job has pairs
+    skus: Optional[InputSource]
+    settings: CampaignSettings
+    keyword_bids: Optional[str] = None  # CSV with Keyword and Bid columns
+    existing: Optional[str] = None  # Bulk export of the account's live campaigns
+    pairs: Optional[str] = None  # CSV of SKU/keyword pairs, used instead of keywords and skus
+
+@dataclass
+class BatchManifest:
+    """Jobs of a batch and where and how their outputs are written"""
+    jobs: List[BatchJob]
+    output_dir: str
+    formats: List[str] = field(default_factory=lambda: list(DEFAULT_BATCH_FORMATS))
+    compress_level: int = DEFAULT_COMPRESS_LEVEL
+    workers: int = DEFAULT_BATCH_WORKERS
+
+@dataclass
+class BatchJobResult:
+    """Outcome of one batch job"""
+    name: str
+    status: str = BATCH_JOB_FAILED
+    paths: Dict[str, str] = field(default_factory=dict)
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+def settings_from_dict(values: Dict[str, Any]) -> CampaignSettings:
+    """
+    Build validated CampaignSettings from manifest values
+
+    Args:
+        values: CampaignSettings fields; start_date as YYYY-MM-DD
+
+    Raises:
+        ValueError: If a field is unknown or missing, or the settings are invalid
+    """
+    unknown = set(values) - {setting.name for setting in fields(CampaignSettings)}
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+
+    values = dict(values)
+    if isinstance(values.get('start_date'), str):
+        values['start_date'] = datetime.strptime(values['start_date'], MANIFEST_DATE_FORMAT).date()
+    try:
+        settings = CampaignSettings(**values)
+    except TypeError as e:
+        raise ValueError(f"Incomplete settings: {str(e)}")
+
+    valid, error = validate_campaign_settings(settings)
+    if not valid:
+        raise ValueError(error)
+    return settings
+
+def load_manifest(path: str) -> BatchManifest:
+    """
+    Read a batch manifest from a JSON file
+
+    The manifest holds "jobs", each with a unique "name", "keywords" and "skus" (file
+    paths or inline lists) or instead "pairs" (a CSV of SKU/keyword pairs, see
+    BulkSheetGenerator.generate_keyword_pairs_sheet), optional "settings" overriding the manifest's "defaults",
+    and optional "keyword_bids" and "existing" file paths. "output_dir", "formats",
+    "compress_level" and "workers" are optional. Relative paths are resolved against
+    the manifest's directory.
+
+    Raises:
+        ValueError: If the manifest or one of its jobs is invalid
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return parse_manifest(data, os.path.dirname(os.path.abspath(path)))
+
+def parse_manifest(data: Dict[str, Any], base_dir: str) -> BatchManifest:
+    """Build a BatchManifest from parsed manifest data, resolving paths against base_dir"""
+    def resolve(source):
+        return os.path.join(base_dir, source) if isinstance(source, str) else source
+
+    defaults = data.get('defaults', {})
+    jobs = []
+    names = set()
+    for number, entry in enumerate(data.get('jobs') or [], start=1):
+        name = str(entry.get('name', ''))
+        if not JOB_NAME_PATTERN.match(name):
+            raise ValueError(f"Job {number}: name must use letters, digits, '_', '.' or '-' (got {name!r})")
+        if name in names:
+            raise ValueError(f"Duplicate job name: {name}")
+        names.add(name)
+
+        unknown = set(entry) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"Job {name}: unknown keys {', '.join(sorted(unknown))}")
+        if entry.get('pairs'):
+            if entry.get('keywords') or entry.get('skus'):
+                raise ValueError(f"Job {name}: pairs replace keywords and skus, give one or the other")
+        else:
+            missing = [key for key in ('keywords', 'skus') if not entry.get(key)]
+            if missing:
+                raise ValueError(f"Job {name}: missing {', '.join(missing)}")
+        try:
+            settings = settings_from_dict({**defaults, **entry.get('settings', {})})
+        except ValueError as e:
+            raise ValueError(f"Job {name}: {str(e)}")
+
+        jobs.append(BatchJob(
+            name=name,
+            keywords=resolve(entry.get('keywords')),
+            skus=resolve(entry.get('skus')),
+            settings=settings,
+            keyword_bids=resolve(entry.get('keyword_bids')),
+            existing=resolve(entry.get('existing')),
+            pairs=resolve(entry.get('pairs'))
+        ))
+    if not jobs:
+        raise ValueError("Manifest has no jobs")
+
+    formats = [format.lower() for format in data.get('formats', DEFAULT_BATCH_FORMATS)]
+    unsupported = [format for format in formats if format not in STREAM_FORMATS]
+    if unsupported or not formats:
+        raise ValueError(f"Unsupported formats: {', '.join(unsupported) or 'none given'}")
+
+    return BatchManifest(
+        jobs=jobs,
+        output_dir=resolve(data.get('output_dir', DEFAULT_BATCH_OUTPUT_DIR)),
+        formats=formats,
+        compress_level=int(data.get('compress_level', DEFAULT_COMPRESS_LEVEL)),
+        workers=int(data.get('workers', DEFAULT_BATCH_WORKERS))
+    )
+
+class SharedInputs:
+    """Inputs of a batch, loaded once per source and shared by every job using them
+
+    Keyword and SKU lists are read, validated and de-duplicated the way the app does;
+    bulk exports are indexed once. Bid files and pair tables are not held here: their
+    loaders already cache them in the process-wide ResourceCache. File sources are keyed by path,
+    modification time and size, inline lists by content. A job asking for a source
+    that another job is loading waits for that load instead of repeating it, and load
+    errors are shared as well, so every job using a bad file fails with the same error.
+    """
+
+    def __init__(self, file_handler: FileHandler, text_formatter: Optional[TextFormatter] = None):
+        self.file_handler = file_handler
+        self.text_formatter = text_formatter or TextFormatter()
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._results: Dict[Hashable, Future] = {}
+
+    def keywords(self, source: InputSource) -> List[str]:
+        """Validated keywords, with case variants merged"""
+        return self._get('keywords', source, lambda: self._load_list(source, validate_keywords_report, case_fold=True))
+
+    def skus(self, source: InputSource) -> List[str]:
+        """Validated, de-duplicated SKUs"""
+        return self._get('skus', source, lambda: self._load_list(source, validate_skus_report, case_fold=False))
+
+    def keyword_bids(self, path: str) -> Dict[str, float]:
+        return BulkSheetGenerator.load_keyword_bids(path)
+
+    def keyword_pairs(self, path: str) -> pd.DataFrame:
+        return BulkSheetGenerator.load_keyword_pairs(path)
+
+    def existing(self, path: str) -> BulkExportIndex:
+        cache_dir = self.file_handler.get_cache_dir('bulk_exports')
+        return self._get('existing', path, lambda: BulkExportIndex.from_file(path, cache_dir=cache_dir))
+
+    def _load_list(self, source: InputSource, validate: Callable[[List[str]], ValidationReport],
+                   case_fold: bool) -> List[str]:
+        if isinstance(source, str):
+            items = self.file_handler.load_input_data(source)
+        else:
+            items = [str(item) for item in source]
+
+        # Normalization can change an item, so the normalized items are what gets validated,
+        # and violations are reported against the rows they came from
+        unique, stats = self.text_formatter.deduplicate(items, case_fold=case_fold)
+        report = validate(unique).for_rows(stats.rows, stats.total, stats.empty_rows)
+        if not report.is_valid:
+            _, error = report.to_result()
+            if len(report.issues) > 1:
+                error = f"{error} (and {len(report.issues) - 1} more invalid items)"
+            raise ValueError(error)
+        return unique
+
+    def _get(self, kind: str, source: InputSource, build: Callable[[], Any]) -> Any:
+        if isinstance(source, str):
+            stat = os.stat(source)
+            key = (kind, os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+        else:
+            key = (kind, tuple(source))
+
+        with self._lock:
+            result = self._results.get(key)
+            owner = result is None
+            if owner:
+                result = self._results[key] = Future()
+        if owner:
+            try:
+                result.set_result(build())
+                with self._lock:
+                    self.loads += 1
+            except Exception as e:
+                result.set_exception(e)
+        return result.result()
+
+class BatchRunner:
+    """Run the jobs of a manifest concurrently over shared inputs and generation caches
+
+    Jobs run in threads of one process so they share loaded inputs and one
+    GenerationCache (keyword groups, negative keyword indexes, name templates) in
+    memory. Each job streams its chunks into FileHandler.save_bulk_sheet_formats, whose
+    writer threads overlap compression and file I/O with other jobs' generation.
+    Row generation itself holds the GIL, so the threads do not use more than one core
+    for it: more workers only help while jobs wait on I/O or compression. To spread
+    generation over several cores, split the manifest and run one process per part.
+    Outputs are named after the job, so every account gets its own files, including a
+    CSV mapping its campaign IDs back to campaign names. A failing job is reported in
+    its result and does not stop the others.
+    """
+
+    def __init__(self, manifest: BatchManifest, file_handler: Optional[FileHandler] = None,
+                 trace_writer: Optional[TraceWriter] = None, generator: Optional[BulkSheetGenerator] = None):
+        """
+        Initialize BatchRunner
+
+        Args:
+            manifest: Jobs to run
+            file_handler: Where outputs are written. Defaults to a FileHandler on the
+                manifest's output directory that never evicts outputs.
+            trace_writer: Writer for one JobTrace record per job
+            generator: Generator shared by all jobs. Defaults to one with a new cache.
+        """
+        self.manifest = manifest
+        self.file_handler = file_handler or FileHandler(
+            base_dir=manifest.output_dir,
+            retention=RetentionPolicy(max_bytes=None, max_age_seconds=None, max_files=None)
+        )
+        self.trace_writer = trace_writer
+        self.generator = generator or BulkSheetGenerator(cache=GenerationCache())
+        self.inputs = SharedInputs(self.file_handler)
+
+    def run(self, batch_id: Optional[str] = None) -> List[BatchJobResult]:
+        """
+        Run every job and write a batch summary next to the outputs
+
+        Returns:
+            One result per job, in manifest order
+        """
+        batch_id = batch_id or new_job_id()
+        workers = max(1, min(self.manifest.workers, len(self.manifest.jobs)))
+        logger.info(f"Starting batch {batch_id}: {len(self.manifest.jobs)} jobs, {workers} workers")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as executor:
+            results = list(executor.map(lambda job: self._run_job(job, batch_id), self.manifest.jobs))
+
+        self._write_summary(batch_id, results)
+        return results
+
+    def summary_path(self, batch_id: str) -> str:
+        return os.path.join(self.file_handler.base_dir, 'output', f"batch_{batch_id}.json")
+
+    def _run_job(self, job: BatchJob, batch_id: str) -> BatchJobResult:
+        result = BatchJobResult(job.name)
+        trace = JobTrace(f"{batch_id}_{job.name}", 'batch')
+        trace.set(batch_id=batch_id, account=job.name)
+        started = time.perf_counter()
+        ACTIVE_JOBS.inc()
+        try:
+            with trace.stage('load'):
+                if job.pairs:
+                    pairs = self.inputs.keyword_pairs(job.pairs)
+                else:
+                    keywords = self.inputs.keywords(job.keywords)
+                    skus = self.inputs.skus(job.skus)
+                settings = job.settings
+                if job.keyword_bids:
+                    keyword_bids = {**(settings.keyword_bids or {}), **self.inputs.keyword_bids(job.keyword_bids)}
+                    settings = replace(settings, keyword_bids=keyword_bids)
+                existing = self.inputs.existing(job.existing) if job.existing else None
+
+            if job.pairs:
+                self._run_pairs_job(job, batch_id, pairs, settings, existing, trace, result)
+                result.status = BATCH_JOB_DONE
+                return result
+
+            planned_rows = self.generator.planned_rows(keywords, skus, settings)
+            trace.set_inputs({'keywords': keywords, 'skus': skus})
+            trace.set_settings(settings)
+            trace.set(planned_rows=planned_rows, formats=self.manifest.formats,
+                      compress_level=self.manifest.compress_level)
+
+            checkpoint = None
+            min_rows = checkpoint_min_rows_from_env()
+            if min_rows and planned_rows >= min_rows:
+                fingerprint = generation_fingerprint('keywords', {'keywords': keywords, 'skus': skus}, settings, existing)
+                if fingerprint:
+                    checkpoint = GenerationCheckpoint.open(self.file_handler.get_cache_dir('checkpoints'), fingerprint)
+                    trace.set(checkpoint=fingerprint)
+
+            generation_started = time.perf_counter()
+            if checkpoint is not None:
+                # Long jobs are generated into a checkpoint first, so a rerun resumes after the last SKU group
+                with checkpoint:
+                    trace.set(resumed_rows=checkpoint.rows)
+                    with trace.stage('generate'):
+                        for _ in iter_checkpointed_chunks(self.generator, keywords, skus, settings, checkpoint, existing):
+                            pass
+                    with trace.stage('write'):
+                        result.paths = self._save(job, batch_id, self._count_rows(checkpoint.iter_chunks(), result))
+                    checkpoint.clear()
+            else:
+                # Chunks are written as they are generated, so this stage times both
+                with trace.stage('generate_write'):
+                    chunks = self.generator.iter_bulk_sheet_chunks(keywords, skus, settings, existing)
+                    result.paths = self._save(job, batch_id, self._count_rows(chunks, result))
+            record_generation('keywords', result.rows, time.perf_counter() - generation_started)
+            for path in result.paths.values():
+                trace.add_output(path)
+            result.status = BATCH_JOB_DONE
+        except Exception as e:
+            logger.error(f"Batch job {job.name} failed: {str(e)}")
+            result.error = str(e)
+        finally:
+            result.seconds = round(time.perf_counter() - started, 3)
+            ACTIVE_JOBS.dec()
+            JOBS.inc(status=result.status)
+            trace.set(rows=result.rows)
+            trace.finish(result.status, result.error, self.trace_writer)
+        return result
+
+    def _run_pairs_job(self, job: BatchJob, batch_id: str, pairs: pd.DataFrame, settings: CampaignSettings,
+                       existing: Optional[BulkExportIndex], trace: JobTrace, result: BatchJobResult) -> None:
+        """Generate and write a job's sheet from its SKU/keyword pairs"""
+        trace.set_inputs({'skus': pairs['SKU'].tolist(), 'keywords': pairs['Keyword'].tolist()})
+        trace.set_settings(settings)
+        trace.set(planned_rows=self.generator.planned_keyword_pairs_rows(pairs, settings),
+                  formats=self.manifest.formats, compress_level=self.manifest.compress_level)
+
+        # Pair sheets are not checkpointed: they are generated per SKU rather than per SKU group
+        generation_started = time.perf_counter()
+        with trace.stage('generate_write'):
+            chunks = self.generator.iter_keyword_pairs_chunks(pairs, settings, existing)
+            result.paths = self._save(job, batch_id, self._count_rows(chunks, result))
+        record_generation('keywords', result.rows, time.perf_counter() - generation_started)
+        for path in result.paths.values():
+            trace.add_output(path)
+
+    def _save(self, job: BatchJob, batch_id: str, chunks: Iterable[pd.DataFrame]) -> Dict[str, str]:
+        return self.file_handler.save_bulk_sheet_formats(
+            chunks, self.manifest.formats, job_id=batch_id, prefix=job.name, compress_level=self.manifest.compress_level,
+            side_outputs={CAMPAIGN_ID_MAP_PREFIX: self.generator.campaign_id_map}
+        )
+
+    def _count_rows(self, chunks: Iterable[pd.DataFrame], result: BatchJobResult) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            result.rows += len(chunk)
+            yield chunk
+
+    def _write_summary(self, batch_id: str, results: List[BatchJobResult]) -> None:
+        cache = self.generator.cache
+        summary = {
+            'batch_id': batch_id,
+            'jobs': [asdict(result) for result in results],
+            'shared': {
+                'inputs_loaded': self.inputs.loads,
+                'generation_cache_hits': cache.hits,
+                'generation_cache_misses': cache.misses,
+            },
+        }
+        try:
+            with atomic_path(self.summary_path(batch_id)) as temp_path:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(summary, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error writing batch summary: {str(e)}")
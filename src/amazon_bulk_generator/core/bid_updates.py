@@ -0,0 +1,215 @@
+from typing import List, Dict, Iterator, Optional
+from dataclasses import dataclass
+import operator
+import numpy as np
+import pandas as pd
+
+from .generator import BulkSheetGenerator
+from .validators import MIN_BID_AMOUNT
+from ..utils.readers import Source, iter_bulk_export_chunks, iter_table_chunks
+
+# Report metrics available to bid rules
+METRIC_ACOS = "acos"
+METRIC_ROAS = "roas"
+METRIC_CLICKS = "clicks"
+METRIC_ORDERS = "orders"
+METRIC_SPEND = "spend"
+METRIC_SALES = "sales"
+VALID_METRICS = {METRIC_ACOS, METRIC_ROAS, METRIC_CLICKS, METRIC_ORDERS, METRIC_SPEND, METRIC_SALES}
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+}
+
+# Performance report layout (alternative header names map to the canonical ones)
+REPORT_COLUMNS = ['Keyword ID', 'Clicks', 'Spend', 'Sales', 'Orders']
+REPORT_NUMERIC_COLUMNS = ['Clicks', 'Spend', 'Sales', 'Orders']
+REPORT_HEADER_ALIASES = {
+    'Keyword Id': 'Keyword ID',
+    'keywordId': 'Keyword ID',
+    'clicks': 'Clicks',
+    'Cost': 'Spend',
+    'cost': 'Spend',
+    '7 Day Total Sales': 'Sales',
+    'sales7d': 'Sales',
+    '7 Day Total Orders (#)': 'Orders',
+    'purchases7d': 'Orders',
+}
+KEYWORD_EXPORT_COLUMNS = ['Entity', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 'State', 'Ad Group Default Bid', 'Bid']
+UPDATE_CHUNK_SIZE = 50_000  # Update rows per yielded chunk
+
+@dataclass
+class BidRule:
+    """A rule changing the bid of keywords whose metric matches a condition"""
+    metric: str  # One of VALID_METRICS
+    operator: str  # One of OPERATORS
+    threshold: float
+    change: float  # Relative bid change, e.g. -0.2 lowers the bid by 20%
+    min_clicks: int = 0  # Only apply to keywords with at least this many clicks
+
+    def __post_init__(self):
+        if self.metric not in VALID_METRICS:
+            raise ValueError(f"Invalid metric for bid rule: {self.metric}")
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Invalid operator for bid rule: {self.operator}")
+
+# Rules applied when none are configured; the first matching rule wins
+DEFAULT_BID_RULES = [
+    BidRule(METRIC_ORDERS, '==', 0, -0.30, min_clicks=20),  # Many clicks, no orders
+    BidRule(METRIC_ACOS, '>', 0.50, -0.20, min_clicks=10),  # Unprofitable
+    BidRule(METRIC_ACOS, '<', 0.20, 0.15, min_clicks=10),  # Very profitable, room to grow
+]
+
+def _to_number(values: pd.Series) -> np.ndarray:
+    """Parse report numbers such as '$1,234.50' or '12%' into floats (NaN if empty)"""
+    cleaned = values.astype(str).str.replace(r'[^0-9.\-]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+
+def load_performance_report(source: Source) -> pd.DataFrame:
+    """
+    Stream a keyword performance report and aggregate its metrics per Keyword ID
+
+    Args:
+        source: Report file (CSV, XLSX, .gz or .zip) with Keyword ID, Clicks, Spend,
+            Sales and Orders columns (Amazon's report header names are recognised)
+
+    Returns:
+        DataFrame indexed by Keyword ID with summed numeric metrics
+    """
+    totals = None
+    for chunk in iter_table_chunks(source, REPORT_COLUMNS, aliases=REPORT_HEADER_ALIASES):
+        chunk = chunk[chunk['Keyword ID'].str.strip() != '']
+        metrics = pd.DataFrame(
+            {column: np.nan_to_num(_to_number(chunk[column])) for column in REPORT_NUMERIC_COLUMNS},
+            index=chunk['Keyword ID'].str.strip()
+        )
+        # Reports hold one row per keyword per day, so chunks are reduced before combining
+        partial = metrics.groupby(level=0).sum()
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+    if totals is None:
+        return pd.DataFrame(columns=REPORT_NUMERIC_COLUMNS, index=pd.Index([], name='Keyword ID'))
+    totals.index.name = 'Keyword ID'
+    return totals
+
+def load_keyword_table(source: Source) -> pd.DataFrame:
+    """
+    Stream a bulk export and collect its live keywords with their effective bids
+
+    Keywords without their own bid use the ad group default bid.
+
+    Returns:
+        DataFrame with Keyword ID, Campaign ID, Ad Group ID, State and Bid columns
+    """
+    keyword_chunks = []
+    default_bids: Dict[str, str] = {}
+    for chunk in iter_bulk_export_chunks(source, KEYWORD_EXPORT_COLUMNS):
+        entities = chunk['Entity'].str.strip().str.lower()
+        live = chunk['State'].str.strip().str.lower() != 'archived'
+        ad_groups = chunk[(entities == 'ad group') & live]
+        default_bids.update(zip(ad_groups['Ad Group ID'].str.strip(), ad_groups['Ad Group Default Bid']))
+        keyword_chunks.append(chunk.loc[(entities == 'keyword') & live, ['Campaign ID', 'Ad Group ID', 'Keyword ID', 'State', 'Bid']])
+
+    keywords = pd.concat(keyword_chunks, ignore_index=True) if keyword_chunks else pd.DataFrame(
+        columns=['Campaign ID', 'Ad Group ID', 'Keyword ID', 'State', 'Bid']
+    )
+    for column in ['Campaign ID', 'Ad Group ID', 'Keyword ID']:
+        keywords[column] = keywords[column].str.strip()
+    missing_bid = keywords['Bid'].str.strip() == ''
+    keywords.loc[missing_bid, 'Bid'] = keywords.loc[missing_bid, 'Ad Group ID'].map(default_bids).fillna('')
+    return keywords
+
+class BidUpdateEngine:
+    """Compute rule-based bid changes and emit them as bulk sheet Update rows"""
+
+    def __init__(self, rules: Optional[List[BidRule]] = None, min_bid: float = MIN_BID_AMOUNT,
+                 max_bid: Optional[float] = None):
+        """
+        Initialize BidUpdateEngine
+
+        Args:
+            rules: Rules in priority order (first match wins). Defaults to DEFAULT_BID_RULES.
+            min_bid: Lower bound for new bids
+            max_bid: Optional upper bound for new bids
+        """
+        self.rules = list(rules) if rules is not None else list(DEFAULT_BID_RULES)
+        self.min_bid = min_bid
+        self.max_bid = max_bid
+        self.headers = BulkSheetGenerator().headers
+
+    def compute(self, keywords: pd.DataFrame, performance: pd.DataFrame) -> pd.DataFrame:
+        """
+        Join keywords with their performance and apply the rules as array operations
+
+        Args:
+            keywords: Output of load_keyword_table
+            performance: Output of load_performance_report
+
+        Returns:
+            DataFrame of changed keywords with Campaign ID, Ad Group ID, Keyword ID, State,
+            Bid (current), New Bid and Rule (index of the applied rule) columns
+        """
+        merged = keywords.merge(performance, left_on='Keyword ID', right_index=True, how='inner')
+        bids = _to_number(merged['Bid'])
+        clicks = merged['Clicks'].to_numpy(dtype=float)
+        spend = merged['Spend'].to_numpy(dtype=float)
+        sales = merged['Sales'].to_numpy(dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics = {
+                METRIC_ACOS: np.where(sales > 0, spend / sales, np.where(spend > 0, np.inf, np.nan)),
+                METRIC_ROAS: np.where(spend > 0, sales / spend, np.nan),
+                METRIC_CLICKS: clicks,
+                METRIC_ORDERS: merged['Orders'].to_numpy(dtype=float),
+                METRIC_SPEND: spend,
+                METRIC_SALES: sales,
+            }
+
+        conditions = [
+            OPERATORS[rule.operator](metrics[rule.metric], rule.threshold) & (clicks >= rule.min_clicks)
+            for rule in self.rules
+        ]
+        changes = np.select(conditions, [rule.change for rule in self.rules], default=0.0)
+        rule_ids = np.select(conditions, list(range(len(self.rules))), default=-1)
+
+        new_bids = np.round(bids * (1 + changes), 2)
+        new_bids = np.maximum(new_bids, self.min_bid)
+        if self.max_bid is not None:
+            new_bids = np.minimum(new_bids, self.max_bid)
+
+        changed = (rule_ids >= 0) & ~np.isnan(bids) & (np.abs(new_bids - bids) >= 0.005)
+        updates = merged.loc[changed, ['Campaign ID', 'Ad Group ID', 'Keyword ID', 'State', 'Bid']].copy()
+        updates['New Bid'] = new_bids[changed]
+        updates['Rule'] = rule_ids[changed]
+        return updates.reset_index(drop=True)
+
+    def iter_update_rows(self, updates: pd.DataFrame, chunksize: int = UPDATE_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Stream bid changes as bulk sheet Update rows in the standard header layout
+
+        Args:
+            updates: Output of compute
+            chunksize: Rows per yielded DataFrame
+
+        Yields:
+            DataFrames with the BulkSheetGenerator headers
+        """
+        for start in range(0, len(updates), chunksize):
+            chunk = updates.iloc[start:start + chunksize]
+            rows = pd.DataFrame(None, index=range(len(chunk)), columns=self.headers, dtype=object)
+            rows['Product'] = BulkSheetGenerator.PRODUCT
+            rows['Entity'] = BulkSheetGenerator.ENTITY_KEYWORD
+            rows['Operation'] = BulkSheetGenerator.OPERATION_UPDATE
+            for column in ['Campaign ID', 'Ad Group ID', 'Keyword ID', 'State']:
+                rows[column] = chunk[column].to_numpy()
+            rows['Bid'] = [f'{bid:.2f}' for bid in chunk['New Bid'].to_numpy()]
+            yield rows
+
+    def run(self, export_source: Source, report_source: Source) -> Iterator[pd.DataFrame]:
+        """Load an export and a performance report and stream the resulting Update rows"""
+        updates = self.compute(load_keyword_table(export_source), load_performance_report(report_source))
+        return self.iter_update_rows(updates)
@@ -0,0 +1,218 @@
+from typing import List, Dict, Set, Tuple, Optional, Iterable
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import os
+import pickle
+import pandas as pd
+
+from ..utils.output_store import OutputStore, RetentionPolicy, atomic_path
+from ..utils.readers import Source, iter_bulk_export_chunks
+
+logger = logging.getLogger(__name__)
+
+# Columns read from bulk exports
+EXPORT_COLUMNS = [
+    'Entity',
+    'Campaign ID',
+    'Ad Group ID',
+    'Keyword ID',
+    'Product Targeting ID',
+    'Campaign Name',
+    'Ad Group Name',
+    'State',
+    'SKU',
+    'Ad Group Default Bid',
+    'Bid',
+    'Keyword Text',
+    'Match Type',
+    'Product Targeting Expression'
+]
+
+# Entities and states as they appear in exports
+ENTITY_CAMPAIGN = "campaign"
+ENTITY_AD_GROUP = "ad group"
+ENTITY_PRODUCT_AD = "product ad"
+ENTITY_KEYWORD = "keyword"
+ENTITY_PRODUCT_TARGETING = "product targeting"
+STATE_ARCHIVED = "archived"
+
+INDEX_FORMAT_VERSION = 1  # Bump when the pickled layout changes
+
+# Retention defaults of persisted indexes (overridable through BULK_EXPORT_CACHE_MAX_MB,
+# BULK_EXPORT_CACHE_MAX_AGE_HOURS and BULK_EXPORT_CACHE_MAX_FILES)
+DEFAULT_INDEX_CACHE_MAX_MB = 256
+DEFAULT_INDEX_CACHE_MAX_AGE_HOURS = 72
+DEFAULT_INDEX_CACHE_MAX_FILES = 50
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+def normalize_keyword_key(keyword: str) -> str:
+    """Key used to compare keyword text case- and whitespace-insensitively"""
+    return ' '.join(keyword.split()).casefold()
+
+def source_fingerprint(source: Source) -> str:
+    """
+    Fingerprint a bulk export for index caching
+
+    Paths are fingerprinted by location, size and modification time; uploaded file
+    objects by a SHA-256 of their content.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        key = f"{os.path.realpath(source)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    digest = hashlib.sha256()
+    source.seek(0)
+    for block in iter(lambda: source.read(FINGERPRINT_BLOCK_SIZE), b''):
+        digest.update(block)
+    source.seek(0)
+    return digest.hexdigest()
+
+@dataclass
+class KeywordRecord:
+    """A keyword row from a bulk export"""
+    keyword_id: str
+    campaign_id: str
+    ad_group_id: str
+    keyword_text: str
+    match_type: str
+    bid: str
+    state: str
+
+@dataclass
+class BulkExportIndex:
+    """In-memory indexes over an Amazon bulk export for O(1) existence queries"""
+    campaigns: Dict[str, str] = field(default_factory=dict)  # Campaign ID -> campaign name
+    ad_groups: Dict[str, str] = field(default_factory=dict)  # Ad Group ID -> Campaign ID
+    skus_by_ad_group: Dict[str, Set[str]] = field(default_factory=dict)
+    ad_groups_by_sku: Dict[str, Set[str]] = field(default_factory=dict)
+    keywords: Dict[str, KeywordRecord] = field(default_factory=dict)  # Keyword ID -> record
+    keyword_ids_by_ad_group: Dict[str, List[str]] = field(default_factory=dict)
+    keyword_ids_by_text: Dict[str, List[str]] = field(default_factory=dict)
+    targeted: Set[Tuple[str, str, str]] = field(default_factory=set)  # (SKU, keyword key, match type)
+    product_targets: Set[Tuple[str, str]] = field(default_factory=set)  # (SKU, expression)
+    fingerprint: Optional[str] = None  # source_fingerprint of the export, when built by from_file
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> 'BulkExportIndex':
+        """Build the indexes from DataFrame chunks with the EXPORT_COLUMNS layout"""
+        index = cls()
+        targets_by_ad_group: Dict[str, List[str]] = {}
+
+        for chunk in chunks:
+            entities = chunk['Entity'].str.strip().str.lower()
+            states = chunk['State'].str.strip().str.lower()
+            live = chunk[states != STATE_ARCHIVED]
+            live_entities = entities[live.index]
+
+            for campaign_id, name in zip(*_columns(live[live_entities == ENTITY_CAMPAIGN], 'Campaign ID', 'Campaign Name')):
+                index.campaigns[campaign_id] = name
+
+            for campaign_id, ad_group_id in zip(*_columns(live[live_entities == ENTITY_AD_GROUP], 'Campaign ID', 'Ad Group ID')):
+                index.ad_groups[ad_group_id] = campaign_id
+
+            for ad_group_id, sku in zip(*_columns(live[live_entities == ENTITY_PRODUCT_AD], 'Ad Group ID', 'SKU')):
+                if sku:
+                    index.skus_by_ad_group.setdefault(ad_group_id, set()).add(sku)
+                    index.ad_groups_by_sku.setdefault(sku, set()).add(ad_group_id)
+
+            keyword_rows = live[live_entities == ENTITY_KEYWORD]
+            for record in zip(*_columns(keyword_rows, 'Keyword ID', 'Campaign ID', 'Ad Group ID',
+                                        'Keyword Text', 'Match Type', 'Bid', 'State')):
+                keyword = KeywordRecord(*record)
+                keyword.match_type = keyword.match_type.strip().lower()
+                index.keywords[keyword.keyword_id] = keyword
+                index.keyword_ids_by_ad_group.setdefault(keyword.ad_group_id, []).append(keyword.keyword_id)
+                index.keyword_ids_by_text.setdefault(normalize_keyword_key(keyword.keyword_text), []).append(keyword.keyword_id)
+
+            for ad_group_id, expression in zip(*_columns(live[live_entities == ENTITY_PRODUCT_TARGETING],
+                                                         'Ad Group ID', 'Product Targeting Expression')):
+                targets_by_ad_group.setdefault(ad_group_id, []).append(expression.strip().lower())
+
+        # Product ads and targets can appear in any order, so combinations are joined at the end
+        for keyword in index.keywords.values():
+            key = normalize_keyword_key(keyword.keyword_text)
+            for sku in index.skus_by_ad_group.get(keyword.ad_group_id, ()):
+                index.targeted.add((sku, key, keyword.match_type))
+        for ad_group_id, expressions in targets_by_ad_group.items():
+            for sku in index.skus_by_ad_group.get(ad_group_id, ()):
+                index.product_targets.update((sku, expression) for expression in expressions)
+
+        return index
+
+    @classmethod
+    def from_file(cls, source: Source, cache_dir: Optional[str] = None) -> 'BulkExportIndex':
+        """
+        Stream a bulk export (XLSX, CSV, .gz or .zip) and build its indexes
+
+        Args:
+            source: File path or uploaded file object
+            cache_dir: Directory for persisted indexes. When given, an index built for the
+                same file before is loaded instead of re-reading the export. The directory
+                is an OutputStore, so indexes beyond its retention limits are deleted
+                least recently used first.
+
+        Returns:
+            BulkExportIndex for the export
+        """
+        fingerprint = source_fingerprint(source)
+        store = None
+        if cache_dir:
+            store = OutputStore.shared(cache_dir, RetentionPolicy.from_env(
+                'BULK_EXPORT_CACHE', DEFAULT_INDEX_CACHE_MAX_MB, DEFAULT_INDEX_CACHE_MAX_AGE_HOURS,
+                DEFAULT_INDEX_CACHE_MAX_FILES
+            ))
+            cache_path = store.path_for(f"bulk_export_{fingerprint}.pkl")
+            cached = cls.load(cache_path)
+            if cached is not None:
+                logger.info(f"Loaded cached bulk export index: {cache_path}")
+                store.touch(cache_path)
+                cached.fingerprint = fingerprint
+                return cached
+
+        index = cls.from_chunks(iter_bulk_export_chunks(source, EXPORT_COLUMNS))
+        index.fingerprint = fingerprint
+        logger.info(
+            f"Indexed bulk export: {len(index.campaigns)} campaigns, {len(index.ad_groups)} ad groups, "
+            f"{len(index.keywords)} keywords"
+        )
+        if store is not None:
+            index.save(cache_path)
+            store.add(cache_path)
+        return index
+
+    def save(self, path: str) -> None:
+        """Persist the index for reuse"""
+        with atomic_path(path) as temp_path:
+            with open(temp_path, 'wb') as f:
+                pickle.dump((INDEX_FORMAT_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BulkExportIndex']:
+        """Load a persisted index, returning None if it is missing or from another version"""
+        try:
+            with open(path, 'rb') as f:
+                version, index = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable bulk export index {path}: {str(e)}")
+            return None
+        return index if version == INDEX_FORMAT_VERSION else None
+
+    def is_targeted(self, sku: str, keyword: str, match_type: str) -> bool:
+        """Check whether a SKU already targets a keyword with a match type"""
+        return (sku, normalize_keyword_key(keyword), match_type.lower()) in self.targeted
+
+    def is_product_targeted(self, sku: str, expression: str) -> bool:
+        """Check whether a SKU's ad groups already contain a product targeting expression"""
+        return (sku, expression.strip().lower()) in self.product_targets
+
+    def keyword_records(self, keyword: str) -> List[KeywordRecord]:
+        """Get all keyword rows with the given text"""
+        return [self.keywords[keyword_id] for keyword_id in self.keyword_ids_by_text.get(normalize_keyword_key(keyword), [])]
+
+def _columns(df: pd.DataFrame, *names: str) -> List[List[str]]:
+    """Extract stripped column values as lists for fast zipped iteration"""
+    return [df[name].str.strip().tolist() for name in names]
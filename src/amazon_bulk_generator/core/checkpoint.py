@@ -0,0 +1,307 @@
+from typing import List, Dict, Any, Optional, Sequence, Iterator
+from dataclasses import asdict
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import pandas as pd
+
+from .bulk_export import BulkExportIndex
+from .generator import BulkSheetGenerator, CampaignIdIndex, CampaignSettings, BULK_SHEET_CHUNK_ROWS
+from ..utils.input_store import input_digest
+from ..utils.output_store import atomic_path
+from ..utils.spill import default_spill_format, read_part, write_part
+
+try:
+    import fcntl
+except ImportError:  # Windows: checkpoints are not locked against concurrent jobs
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint defaults (overridable through environment variables; 0 disables)
+DEFAULT_CHECKPOINT_MIN_ROWS = 200_000  # Jobs planned below this size are not checkpointed
+DEFAULT_CHECKPOINT_MAX_AGE_HOURS = 72  # Abandoned checkpoints older than this are deleted
+
+CHECKPOINT_FORMAT_VERSION = 2  # Bump when generated rows or the checkpoint layout change
+CHECKPOINT_STATE_FILE = 'checkpoint.json'
+CHECKPOINT_LOCK_FILE = 'checkpoint.lock'
+
+def checkpoint_min_rows_from_env() -> int:
+    """Planned rows from which generation is checkpointed (CHECKPOINT_MIN_ROWS); 0 disables checkpoints"""
+    return int(float(os.environ.get('CHECKPOINT_MIN_ROWS', DEFAULT_CHECKPOINT_MIN_ROWS)))
+
+def generation_fingerprint(kind: str, inputs: Dict[str, Sequence[str]], settings: CampaignSettings,
+                           existing: Optional[BulkExportIndex] = None) -> Optional[str]:
+    """
+    Fingerprint everything that determines a generated sheet
+
+    Args:
+        kind: Generation kind, e.g. 'keywords'
+        inputs: Input lists by name
+        settings: Campaign settings
+        existing: Bulk export whose combinations are skipped
+
+    Returns:
+        Hex digest, or None if the sheet cannot be fingerprinted (an export index that
+        was not built from a file)
+    """
+    if existing is not None and existing.fingerprint is None:
+        return None
+    digest = hashlib.sha256()
+    digest.update(f"{CHECKPOINT_FORMAT_VERSION}|{kind}|".encode('utf-8'))
+    for name, items in sorted(inputs.items()):
+        digest.update(f"{name}:{input_digest(items)}|".encode('utf-8'))
+    digest.update(json.dumps(asdict(settings), sort_keys=True, default=str).encode('utf-8'))
+    digest.update(f"|existing:{existing.fingerprint if existing is not None else ''}".encode('utf-8'))
+    return digest.hexdigest()
+
+def _fsync(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Not supported for directories on every platform
+    finally:
+        os.close(fd)
+
+class GenerationCheckpoint:
+    """Durable progress of a chunked generation, committed at SKU group boundaries
+
+    Chunks appended to the checkpoint are written to part files straight away, but only
+    count once their SKU groups are committed: the state file listing the committed parts
+    is then replaced atomically after the parts are synced to disk. A job that dies
+    mid-commit resumes at the first uncommitted group, and its uncommitted parts are deleted.
+    Committed chunks are read back in order by iter_chunks(), so a finished checkpoint
+    can be exported like a SpillBuffer.
+
+    Checkpoints live in a directory named after the generation fingerprint and are
+    locked while open, so two jobs never write the same one. Use as a context manager
+    (or call close()) to release the lock, and clear() once the output is written.
+    """
+
+    def __init__(self, directory: str, spill_format: Optional[str] = None):
+        """
+        Open (or create) the checkpoint in a directory, waiting for no lock
+
+        Raises:
+            BlockingIOError: If another job holds the checkpoint
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fd = self._lock()
+        self._state_path = os.path.join(directory, CHECKPOINT_STATE_FILE)
+        self._state = self._load_state(spill_format or default_spill_format())
+        self._pending: List[Dict[str, Any]] = []
+        self._remove_uncommitted_parts()
+
+    @classmethod
+    def open(cls, cache_dir: str, fingerprint: str,
+             max_age_seconds: Optional[float] = None) -> Optional['GenerationCheckpoint']:
+        """
+        Open the checkpoint for a fingerprint under cache_dir, pruning abandoned ones
+
+        Args:
+            cache_dir: Directory holding all checkpoints
+            fingerprint: Result of generation_fingerprint
+            max_age_seconds: Age after which other checkpoints are deleted. Defaults to
+                CHECKPOINT_MAX_AGE_HOURS.
+
+        Returns:
+            The checkpoint, or None if another job is using it
+        """
+        if max_age_seconds is None:
+            max_age_seconds = float(os.environ.get('CHECKPOINT_MAX_AGE_HOURS', DEFAULT_CHECKPOINT_MAX_AGE_HOURS)) * 3600
+        if max_age_seconds:
+            prune_checkpoints(cache_dir, max_age_seconds, keep=fingerprint)
+        try:
+            return cls(os.path.join(cache_dir, fingerprint))
+        except BlockingIOError:
+            logger.warning(f"Checkpoint {fingerprint[:12]} is in use by another job; generating without it")
+            return None
+
+    def __enter__(self) -> 'GenerationCheckpoint':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def completed_groups(self) -> int:
+        return self._state['groups']
+
+    @property
+    def rows(self) -> int:
+        """Rows in committed groups"""
+        return self._state['rows']
+
+    @property
+    def spilled(self) -> bool:
+        return True
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        """Write a chunk of the current SKU group to a part file"""
+        if chunk.empty:
+            return
+        if self._state['dtypes'] is None:
+            self._state['dtypes'] = {column: str(dtype) for column, dtype in chunk.dtypes.items()}
+        name = f"part_{len(self._state['parts']) + len(self._pending):06d}.{self._state['format']}"
+        path = os.path.join(self.directory, name)
+        write_part(chunk, path, self._state['format'])
+        self._pending.append({'file': name, 'rows': len(chunk)})
+
+    def commit_group(self, groups: int = 1) -> None:
+        """Record the parts appended since the last commit as the next `groups` complete SKU groups"""
+        for part in self._pending:
+            _fsync(os.path.join(self.directory, part['file']))
+        self._state['parts'].extend(self._pending)
+        self._state['rows'] += sum(part['rows'] for part in self._pending)
+        self._state['groups'] += groups
+        self._pending = []
+        self._save_state()
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield the committed chunks in order"""
+        dtypes = pd.Series({column: pd.api.types.pandas_dtype(dtype)
+                            for column, dtype in (self._state['dtypes'] or {}).items()}, dtype=object)
+        for part in self._state['parts']:
+            yield read_part(os.path.join(self.directory, part['file']), dtypes, self._state['format'])
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Get the first n committed rows"""
+        frames = []
+        remaining = n
+        for chunk in self.iter_chunks():
+            frames.append(chunk.head(remaining))
+            remaining -= len(frames[-1])
+            if remaining <= 0:
+                break
+        if not frames:
+            return pd.DataFrame(columns=list(self._state['dtypes'] or []))
+        return pd.concat(frames, ignore_index=True)
+
+    def clear(self) -> None:
+        """Delete the checkpoint, e.g. once its output is written"""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def close(self) -> None:
+        """Drop uncommitted parts and release the lock; committed groups are kept for resuming"""
+        if self._lock_fd is None:
+            return
+        self._pending = []
+        self._remove_uncommitted_parts()
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+    def _lock(self) -> int:
+        fd = os.open(os.path.join(self.directory, CHECKPOINT_LOCK_FILE), os.O_RDWR | os.O_CREAT)
+        if fcntl is not None:
+            try:
+                # Released by the OS if the process dies, so a crash never leaves it locked
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                raise BlockingIOError(f"Checkpoint is locked: {self.directory}")
+        return fd
+
+    def _load_state(self, spill_format: str) -> Dict[str, Any]:
+        try:
+            with open(self._state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == CHECKPOINT_FORMAT_VERSION:
+                logger.info(f"Resuming from checkpoint after {state['groups']} SKU groups ({state['rows']} rows)")
+                return state
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self._state_path}: {str(e)}")
+        return {'version': CHECKPOINT_FORMAT_VERSION, 'format': spill_format, 'dtypes': None,
+                'groups': 0, 'rows': 0, 'parts': []}
+
+    def _save_state(self) -> None:
+        with atomic_path(self._state_path) as temp_path:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+                f.flush()
+                os.fsync(f.fileno())
+        _fsync(self.directory)
+
+    def _remove_uncommitted_parts(self) -> None:
+        committed = {part['file'] for part in self._state['parts']}
+        for name in os.listdir(self.directory):
+            if name.startswith('part_') and name not in committed:
+                os.remove(os.path.join(self.directory, name))
+
+def prune_checkpoints(cache_dir: str, max_age_seconds: float, keep: Optional[str] = None) -> int:
+    """Delete checkpoints not updated for max_age_seconds that no job holds; returns how many"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    pruned = 0
+    cutoff = time.time() - max_age_seconds
+    for name in os.listdir(cache_dir):
+        directory = os.path.join(cache_dir, name)
+        if name == keep or not os.path.isdir(directory) or os.path.getmtime(directory) > cutoff:
+            continue
+        try:
+            GenerationCheckpoint(directory).clear()
+            pruned += 1
+        except BlockingIOError:
+            continue
+    if pruned:
+        logger.info(f"Deleted {pruned} abandoned checkpoints")
+    return pruned
+
+def iter_checkpointed_chunks(generator: BulkSheetGenerator, keywords: List[str], skus: List[str],
+                             settings: CampaignSettings, checkpoint: GenerationCheckpoint,
+                             existing: Optional[BulkExportIndex] = None,
+                             chunk_rows: int = BULK_SHEET_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Generate the SKU groups a checkpoint has not completed, appending them to it
+
+    Each SKU group is generated on its own, which yields exactly its share of
+    generator.iter_bulk_sheet_chunks. Small groups (every SKU is its own group when
+    sku_group_size is unset) are buffered and written together, and groups are
+    committed once about chunk_rows rows have accumulated, so part files and state
+    writes grow with the rows rather than the SKUs. The newly generated chunks are
+    yielded (e.g. for progress); once exhausted, the checkpoint's iter_chunks() holds
+    the whole sheet.
+    
+    Campaign IDs are assigned by one index across the groups, seeded with the IDs of
+    the committed groups when resuming, so they match an uninterrupted run.
+    """
+    ids = CampaignIdIndex()
+    if checkpoint.completed_groups:
+        for chunk in checkpoint.iter_chunks():
+            ids.add(chunk.loc[chunk['Entity'] == BulkSheetGenerator.ENTITY_CAMPAIGN, 'Campaign ID'])
+    
+    buffered: List[pd.DataFrame] = []
+    buffered_rows = 0
+    uncommitted_rows = 0  # Rows of uncommitted groups, written or buffered
+    uncommitted_groups = 0
+
+    def flush() -> None:
+        nonlocal buffered, buffered_rows
+        if buffered:
+            checkpoint.append(buffered[0] if len(buffered) == 1 else pd.concat(buffered, ignore_index=True))
+        buffered, buffered_rows = [], 0
+
+    sku_groups = generator._group_skus(skus, settings.sku_group_size)
+    for sku_group in sku_groups[checkpoint.completed_groups:]:
+        for chunk in generator.iter_bulk_sheet_chunks(keywords, sku_group, settings, existing, chunk_rows, ids):
+            buffered.append(chunk)
+            buffered_rows += len(chunk)
+            uncommitted_rows += len(chunk)
+            if buffered_rows >= chunk_rows:
+                flush()
+            yield chunk
+        uncommitted_groups += 1
+        if uncommitted_rows >= chunk_rows:
+            flush()
+            checkpoint.commit_group(uncommitted_groups)
+            uncommitted_rows = uncommitted_groups = 0
+    if uncommitted_groups:
+        flush()
+        checkpoint.commit_group(uncommitted_groups)
@@ -1,10 +1,40 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Callable, Hashable
 import pandas as pd
 from datetime import datetime
 from dataclasses import dataclass
+import hashlib
+import logging
+import os
 import re
+import threading
 from itertools import zip_longest
 
+from .bulk_export import BulkExportIndex
+from .negatives import NegativeKeywordIndex, MATCH_TYPE_NEGATIVE_EXACT
+from .validators import (
+    MIN_BID_AMOUNT, NUMERIC_ERROR, validate_keywords_report, validate_skus_report
+)
+from ..utils.formatters import TextFormatter
+from ..utils.metrics import CAMPAIGN_ID_COLLISIONS
+from ..utils.input_store import input_digest
+from ..utils.lru import BoundedLRU, approximate_size
+from ..utils.resource_cache import ResourceCache
+
+logger = logging.getLogger(__name__)
+
+BULK_SHEET_CHUNK_ROWS = 20_000  # Approximate rows per chunk in chunked generation (campaigns are never split)
+DEFAULT_GENERATION_CACHE_MAX_MB = 128  # Memory held by the shared GenerationCache (GENERATION_CACHE_MAX_MB)
+CAMPAIGN_ID_LENGTH = 12  # Hex digits of a generated campaign ID (a 48-bit hash)
+
+# Filename prefix of the CSV mapping generated campaign IDs back to their names
+CAMPAIGN_ID_MAP_PREFIX = 'campaign_ids'
+CAMPAIGN_ID_MAP_COLUMNS = ['Campaign ID', 'Campaign Name', 'Ad Group Name', 'SKU', 'Targeting', 'First Target']
+
+# Columns of a SKU/keyword pair table; Bid and Match Type are optional
+KEYWORD_PAIR_COLUMNS = ['SKU', 'Keyword', 'Bid', 'Match Type']
+
+NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9]')
+
 @dataclass
 class CampaignSettings:
     """Data class for campaign settings"""
@@ -19,6 +49,132 @@ class CampaignSettings:
     placement: str = ""  # No default placement
     keyword_group_size: int = None  # New field for keyword grouping
     sku_group_size: int = None  # New field for SKU grouping
+    isolate_match_types: bool = False  # Add exact keywords as negatives to broad/phrase campaigns
+    product_targeting_bid: float = None  # Default bid for ASIN targets (product targeting campaigns)
+
+_MISSING = object()  # GenerationCache lookup sentinel
+
+class GenerationCache:
+    """Thread-safe LRU cache of intermediate results that depend only on inputs and settings
+    
+    Keyword groups, negative keyword indexes and name templates with their dates filled
+    in are identical for every sheet generated from the same keyword list and settings.
+    Generators sharing a cache build them once, e.g. across sessions or the accounts of
+    a batch that use the same keyword library. Keyword lists are keyed by their content
+    digest, so the cache holds no copy of them. Entries are evicted least recently used
+    first once their approximate size exceeds the memory limit. Values are built outside
+    the lock, so two threads missing the same key at once may both build it; the results
+    are equal. Use GenerationCache.shared() to get the process-wide instance.
+    """
+    
+    _shared: Optional['GenerationCache'] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize GenerationCache
+        
+        Args:
+            max_bytes: Memory limit. Defaults to GENERATION_CACHE_MAX_MB; 0 disables caching.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('GENERATION_CACHE_MAX_MB', DEFAULT_GENERATION_CACHE_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: BoundedLRU[Hashable, Any] = BoundedLRU(max_size=max_bytes)
+    
+    @classmethod
+    def shared(cls) -> 'GenerationCache':
+        """Get the process-wide cache, creating it on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def total_bytes(self) -> float:
+        return self._entries.size
+    
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for key, building and storing it on a miss"""
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            if hasattr(value, 'nbytes'):
+                # Values such as negative keyword indexes grow as they memoize results
+                self._store(key, value)
+            return value
+        value = build()
+        self.misses += 1
+        self._store(key, value)
+        return value
+    
+    def _store(self, key: Hashable, value: Any) -> None:
+        nbytes = approximate_size(value)
+        if nbytes > self.max_bytes:
+            self._entries.pop(key)
+            return
+        self._entries.put(key, value, nbytes)
+        self._entries.evict(protect=[key])
+
+class CampaignIdIndex:
+    """Assigns the short campaign IDs of a sheet, detecting and resolving collisions
+    
+    A campaign's ID is a hash of its readable name SKU_matchtype_group, the group being
+    its first keyword (or ASIN) cleaned for use in names, so regenerating a sheet gives
+    the same IDs. Two campaigns can still end up with one ID: keywords differing only in
+    punctuation clean to the same group, and distinct names may hash alike. The later
+    campaign's group then gets a _2, _3... suffix, in its ID and names, until its ID is
+    free; every such collision is logged and counted.
+    
+    Use one index for all chunks of a sheet. Seed it with the IDs already generated when
+    resuming a sheet part-way.
+    """
+    
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids = set(ids)
+        self.collisions = 0
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, campaign_id: str) -> bool:
+        return campaign_id in self._ids
+    
+    @staticmethod
+    def campaign_id(readable: str) -> str:
+        """Stable short ID of a readable campaign name"""
+        return hashlib.blake2b(readable.encode('utf-8'), digest_size=CAMPAIGN_ID_LENGTH // 2).hexdigest()
+    
+    def add(self, campaign_ids: Iterable[str]) -> None:
+        """Mark IDs as taken, e.g. those of a checkpoint's completed groups"""
+        self._ids.update(campaign_ids)
+    
+    def assign(self, sku: str, targeting_label: str, group_identifier: str) -> Tuple[str, str]:
+        """
+        Assign the ID of a new campaign
+        
+        Returns:
+            Tuple of (campaign ID, group identifier to use in its names)
+        """
+        identifier = group_identifier
+        campaign_id = self.campaign_id(f"{sku}_{targeting_label}_{identifier}")
+        suffix = 1
+        while campaign_id in self._ids:
+            suffix += 1
+            identifier = f"{group_identifier}_{suffix}"
+            campaign_id = self.campaign_id(f"{sku}_{targeting_label}_{identifier}")
+        if suffix > 1:
+            self.collisions += 1
+            CAMPAIGN_ID_COLLISIONS.inc()
+            logger.warning(f"Campaign {sku}_{targeting_label}_{group_identifier} collides with an earlier "
+                           f"campaign; generated as {sku}_{targeting_label}_{identifier}")
+        self._ids.add(campaign_id)
+        return campaign_id, identifier
 
 class BulkSheetGenerator:
     """Class to handle the generation of Amazon Ads bulk sheets"""
@@ -29,6 +185,7 @@ class BulkSheetGenerator:
     BIDDING_STRATEGY = "Dynamic bids - down only"
     STATE = "enabled"
     OPERATION = "Create"
+    OPERATION_UPDATE = "Update"
     PRODUCT = "Sponsored Products"
     DATE_FORMAT = "%Y%m%d"
 
@@ -38,13 +195,22 @@ class BulkSheetGenerator:
     ENTITY_BIDDING_ADJUSTMENT = "Bidding Adjustment"
     ENTITY_PRODUCT_AD = "Product Ad"
     ENTITY_KEYWORD = "Keyword"
+    ENTITY_NEGATIVE_KEYWORD = "Negative Keyword"
+    ENTITY_PRODUCT_TARGETING = "Product Targeting"
 
     # Match types
     MATCH_TYPE_EXACT = "exact"
     MATCH_TYPE_PHRASE = "phrase"
     MATCH_TYPE_BROAD = "broad"
+
+    # Product targeting
+    TARGETING_ASIN = "asin"  # Used in place of the match type in names and IDs
+    ASIN_EXPRESSION = 'asin="{}"'
     
-    def __init__(self):
+    def __init__(self, cache: Optional[GenerationCache] = None):
+        # Intermediate results reused across sheets and generators; defaults to the process-wide cache
+        self.cache = cache if cache is not None else GenerationCache.shared()
+        
         # Headers exactly as provided by Amazon
         self.headers = [
             'Product',
@@ -100,13 +266,49 @@ class BulkSheetGenerator:
             sku_groups.append(group)
         return sku_groups
 
-    def generate_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings) -> pd.DataFrame:
-        """Generate bulk sheet from inputs"""
-        rows = []
+    def generate_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                            existing: Optional[BulkExportIndex] = None,
+                            ids: Optional[CampaignIdIndex] = None) -> pd.DataFrame:
+        """Generate bulk sheet from inputs
+        
+        If `existing` is given, SKU/keyword/match type combinations already live in the
+        account are skipped, and campaigns left without keywords are not generated.
+        
+        If `settings.isolate_match_types` is set and exact match is generated, broad and
+        phrase campaigns get the exact keywords they could match as negative exact keywords.
+        
+        Campaign IDs are assigned by `ids`; pass the same index to every call generating
+        part of one sheet (e.g. per SKU group) so IDs stay unique across the parts.
+        """
+        rows = [row for campaign_rows in self._iter_campaign_rows(keywords, skus, settings, existing, ids) for row in campaign_rows]
+        df = pd.DataFrame(rows, columns=self.headers)
+        return self._format_dataframe(df)
+
+    def iter_bulk_sheet_chunks(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                               existing: Optional[BulkExportIndex] = None,
+                               chunk_rows: int = BULK_SHEET_CHUNK_ROWS,
+                               ids: Optional[CampaignIdIndex] = None) -> Iterator[pd.DataFrame]:
+        """Generate the same bulk sheet as generate_bulk_sheet as a stream of formatted chunks
+        
+        Only one chunk is held in memory at a time, so the output size is not limited by RAM
+        when chunks are written out (or spilled) as they are produced.
+        """
+        return self._iter_chunks(self._iter_campaign_rows(keywords, skus, settings, existing, ids), chunk_rows)
+
+    def _iter_campaign_rows(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                            existing: Optional[BulkExportIndex],
+                            ids: Optional[CampaignIdIndex] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the rows of each keyword campaign in output order"""
         start_date = settings.start_date.strftime(self.DATE_FORMAT)
+        ids = ids if ids is not None else CampaignIdIndex()
+        keywords_key = input_digest(keywords)
+        negative_index = self._build_negative_index(keywords, settings, keywords_key)
         
         # Group keywords if group size is specified
-        keyword_groups = self._group_keywords(keywords, settings.keyword_group_size)
+        keyword_groups = self.cache.get(
+            ('keyword_groups', keywords_key, settings.keyword_group_size),
+            lambda: self._group_keywords(keywords, settings.keyword_group_size)
+        )
         
         # Group SKUs if group size is specified
         sku_groups = self._group_skus(skus, settings.sku_group_size)
@@ -115,19 +317,306 @@ class BulkSheetGenerator:
             for keyword_group in keyword_groups:
                 for match_type in settings.match_types:
                     for sku in sku_group:
+                        campaign_keywords = keyword_group
+                        if existing is not None:
+                            campaign_keywords = [
+                                kw for kw in keyword_group
+                                if not existing.is_targeted(sku, kw, match_type)
+                            ]
+                            if not campaign_keywords:
+                                continue
+                        
+                        negative_keywords = None
+                        if negative_index is not None:
+                            negative_keywords = negative_index.negatives_for(campaign_keywords, match_type)
+                        
                         # Generate campaign rows for the entire keyword group
-                        group_rows = self._generate_campaign_rows(
+                        yield self._generate_campaign_rows(
                             sku=sku,
-                            keywords=keyword_group,
+                            keywords=campaign_keywords,
                             match_type=match_type.lower(),
                             start_date=start_date,
-                            settings=settings
+                            settings=settings,
+                            negative_keywords=negative_keywords,
+                            ids=ids
                         )
-                        rows.extend(group_rows)
+
+    def generate_product_targeting_sheet(self, asins: List[str], skus: List[str], settings: CampaignSettings,
+                                         existing: Optional[BulkExportIndex] = None,
+                                         pairs: Optional[Iterable[Tuple[str, str]]] = None,
+                                         ids: Optional[CampaignIdIndex] = None) -> pd.DataFrame:
+        """Generate a bulk sheet of product targeting campaigns advertising SKUs on ASINs
+        
+        Every SKU targets every ASIN unless `pairs` of (SKU, ASIN) is given, in which case
+        each SKU targets only its paired ASINs and `asins`/`skus` are ignored. ASINs are
+        grouped per campaign by `settings.keyword_group_size`. If `existing` is given,
+        ASINs a SKU already targets are skipped.
+        """
+        campaigns = self._iter_product_targeting_campaign_rows(asins, skus, settings, existing, pairs, ids)
+        rows = [row for campaign_rows in campaigns for row in campaign_rows]
+        df = pd.DataFrame(rows, columns=self.headers)
+        return self._format_dataframe(df)
+
+    def iter_product_targeting_chunks(self, asins: List[str], skus: List[str], settings: CampaignSettings,
+                                      existing: Optional[BulkExportIndex] = None,
+                                      pairs: Optional[Iterable[Tuple[str, str]]] = None,
+                                      chunk_rows: int = BULK_SHEET_CHUNK_ROWS,
+                                      ids: Optional[CampaignIdIndex] = None) -> Iterator[pd.DataFrame]:
+        """Generate the same sheet as generate_product_targeting_sheet as a stream of formatted chunks"""
+        campaigns = self._iter_product_targeting_campaign_rows(asins, skus, settings, existing, pairs, ids)
+        return self._iter_chunks(campaigns, chunk_rows)
+
+    def _iter_product_targeting_campaign_rows(self, asins: List[str], skus: List[str], settings: CampaignSettings,
+                                              existing: Optional[BulkExportIndex],
+                                              pairs: Optional[Iterable[Tuple[str, str]]],
+                                              ids: Optional[CampaignIdIndex] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the rows of each product targeting campaign in output order"""
+        if settings.product_targeting_bid is None:
+            raise ValueError("A product targeting bid is required for ASIN campaigns")
+        
+        start_date = settings.start_date.strftime(self.DATE_FORMAT)
+        ids = ids if ids is not None else CampaignIdIndex()
+        if pairs is not None:
+            asins_by_sku = self._group_pairs(pairs)
+        else:
+            asins_by_sku = {sku: [asin.strip().upper() for asin in asins] for sku in skus}
+        
+        for sku, sku_asins in asins_by_sku.items():
+            if existing is not None:
+                sku_asins = [
+                    asin for asin in sku_asins
+                    if not existing.is_product_targeted(sku, self.ASIN_EXPRESSION.format(asin))
+                ]
+            for asin_group in self._group_keywords(sku_asins, settings.keyword_group_size):
+                yield self._generate_product_targeting_rows(sku, asin_group, start_date, settings, ids)
+
+    def generate_keyword_pairs_sheet(self, pairs: pd.DataFrame, settings: CampaignSettings,
+                                     existing: Optional[BulkExportIndex] = None,
+                                     ids: Optional[CampaignIdIndex] = None) -> pd.DataFrame:
+        """Generate a keyword bulk sheet from a table of SKU/keyword pairs
+        
+        Each SKU gets campaigns only for its own keywords instead of every keyword of a
+        library, so the work scales with the number of pairs. `pairs` has the
+        KEYWORD_PAIR_COLUMNS: a pair's Bid overrides the keyword's default bid, and its
+        Match Type limits it to that match type (otherwise it gets all of
+        `settings.match_types`). A SKU's keywords are grouped per campaign by
+        `settings.keyword_group_size`; `settings.sku_group_size` does not apply. Pairs
+        covering every SKU and keyword give the same sheet as generate_bulk_sheet.
+        
+        If `existing` is given, combinations already live in the account are skipped. If
+        `settings.isolate_match_types` is set, broad and phrase campaigns get the exact
+        keywords of their SKU they could match as negative exact keywords.
         
+        Raises:
+            ValueError: If the pairs lack a column or use a match type not in the settings
+        """
+        campaigns = self._iter_keyword_pair_campaign_rows(pairs, settings, existing, ids)
+        rows = [row for campaign_rows in campaigns for row in campaign_rows]
         df = pd.DataFrame(rows, columns=self.headers)
         return self._format_dataframe(df)
 
+    def iter_keyword_pairs_chunks(self, pairs: pd.DataFrame, settings: CampaignSettings,
+                                  existing: Optional[BulkExportIndex] = None,
+                                  chunk_rows: int = BULK_SHEET_CHUNK_ROWS,
+                                  ids: Optional[CampaignIdIndex] = None) -> Iterator[pd.DataFrame]:
+        """Generate the same sheet as generate_keyword_pairs_sheet as a stream of formatted chunks"""
+        return self._iter_chunks(self._iter_keyword_pair_campaign_rows(pairs, settings, existing, ids), chunk_rows)
+
+    def _iter_keyword_pair_campaign_rows(self, pairs: pd.DataFrame, settings: CampaignSettings,
+                                         existing: Optional[BulkExportIndex],
+                                         ids: Optional[CampaignIdIndex] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the rows of each campaign of a pair table in output order"""
+        start_date = settings.start_date.strftime(self.DATE_FORMAT)
+        ids = ids if ids is not None else CampaignIdIndex()
+        isolate = self._isolates_match_types(settings)
+        
+        for sku, targets in self._group_keyword_pairs(pairs, settings):
+            negative_index = None
+            if isolate:
+                negative_index = NegativeKeywordIndex(
+                    keyword for keyword, match_types in targets.items() if self.MATCH_TYPE_EXACT in match_types
+                )
+            
+            for match_type, campaign_keywords, pair_bids in self._keyword_pair_campaigns(targets, settings):
+                if existing is not None:
+                    campaign_keywords = [
+                        kw for kw in campaign_keywords
+                        if not existing.is_targeted(sku, kw, match_type)
+                    ]
+                    if not campaign_keywords:
+                        continue
+                
+                negative_keywords = None
+                if negative_index is not None:
+                    negative_keywords = negative_index.negatives_for(campaign_keywords, match_type)
+                
+                yield self._generate_campaign_rows(
+                    sku=sku,
+                    keywords=campaign_keywords,
+                    match_type=match_type,
+                    start_date=start_date,
+                    settings=settings,
+                    negative_keywords=negative_keywords,
+                    ids=ids,
+                    pair_bids=pair_bids
+                )
+
+    def planned_rows(self, keywords: List[str], skus: List[str], settings: CampaignSettings) -> int:
+        """Rows generate_bulk_sheet produces before existing combinations and negatives are applied"""
+        campaigns = len(self._group_keywords(keywords, settings.keyword_group_size)) * len(settings.match_types) * len(skus)
+        return campaigns * self._structure_row_count(settings) + len(keywords) * len(settings.match_types) * len(skus)
+
+    def planned_product_targeting_rows(self, asins: List[str], skus: List[str], settings: CampaignSettings) -> int:
+        """Rows generate_product_targeting_sheet produces before existing targets are skipped"""
+        campaigns = len(self._group_keywords(asins, settings.keyword_group_size)) * len(skus)
+        return campaigns * self._structure_row_count(settings) + len(asins) * len(skus)
+
+    def planned_keyword_pairs_rows(self, pairs: pd.DataFrame, settings: CampaignSettings) -> int:
+        """Rows generate_keyword_pairs_sheet produces before existing combinations and negatives are applied"""
+        rows = 0
+        for _, targets in self._group_keyword_pairs(pairs, settings):
+            for _, campaign_keywords, _ in self._keyword_pair_campaigns(targets, settings):
+                rows += self._structure_row_count(settings) + len(campaign_keywords)
+        return rows
+
+    def _structure_row_count(self, settings: CampaignSettings) -> int:
+        """Campaign, ad group, optional bidding adjustment and product ad rows per campaign"""
+        return 4 if settings.placement and settings.bid_adjustment else 3
+
+    def _iter_chunks(self, campaigns: Iterable[List[Dict[str, Any]]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Collect campaign rows into formatted DataFrames of about chunk_rows rows"""
+        rows = []
+        for campaign_rows in campaigns:
+            rows.extend(campaign_rows)
+            if len(rows) >= chunk_rows:
+                yield self._format_dataframe(pd.DataFrame(rows, columns=self.headers))
+                rows = []
+        if rows:
+            yield self._format_dataframe(pd.DataFrame(rows, columns=self.headers))
+
+    def _group_pairs(self, pairs: Iterable[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """Collect the ASINs of each SKU from (SKU, ASIN) pairs, keeping first-seen order"""
+        asins_by_sku: Dict[str, Dict[str, None]] = {}
+        for sku, asin in pairs:
+            asins_by_sku.setdefault(sku.strip(), {})[asin.strip().upper()] = None
+        return {sku: list(asins) for sku, asins in asins_by_sku.items()}
+
+    def _group_keyword_pairs(self, pairs: pd.DataFrame,
+                             settings: CampaignSettings) -> Iterator[Tuple[str, Dict[str, Dict[str, Optional[float]]]]]:
+        """
+        Yield each SKU of a pair table with its keywords, in first-seen order
+        
+        Each keyword maps to the match types it is targeted with and the pair's bid for
+        each (None for the default bid); the first pair of a SKU, keyword and match type wins.
+        """
+        pairs = self.normalize_keyword_pairs(pairs)
+        match_types = [match_type.lower() for match_type in settings.match_types]
+        unknown = set(pairs['Match Type']) - set(match_types) - {''}
+        if unknown:
+            raise ValueError(f"Pair match types not in the campaign match types: {', '.join(sorted(unknown))}")
+        
+        keywords = pairs['Keyword'].tolist()
+        bids = [None if pd.isna(bid) else float(bid) for bid in pairs['Bid'].tolist()]
+        pair_match_types = pairs['Match Type'].tolist()
+        # Hash groupby: positions of each SKU's pairs, SKUs in first-seen order, without sorting the table
+        for sku, positions in pairs.groupby('SKU', sort=False).indices.items():
+            targets: Dict[str, Dict[str, Optional[float]]] = {}
+            for position in positions:
+                keyword_targets = targets.setdefault(keywords[position], {})
+                match_type = pair_match_types[position]
+                for target in ([match_type] if match_type else match_types):
+                    keyword_targets.setdefault(target, bids[position])
+            yield sku, targets
+
+    def _keyword_pair_campaigns(self, targets: Dict[str, Dict[str, Optional[float]]],
+                                settings: CampaignSettings) -> Iterator[Tuple[str, List[str], Dict[str, float]]]:
+        """Yield the match type, keywords and pair bids of each campaign of one SKU"""
+        match_types = [match_type.lower() for match_type in settings.match_types]
+        for keyword_group in self._group_keywords(list(targets), settings.keyword_group_size):
+            for match_type in match_types:
+                campaign_keywords = [kw for kw in keyword_group if match_type in targets[kw]]
+                if not campaign_keywords:
+                    continue
+                pair_bids = {
+                    kw: targets[kw][match_type] for kw in campaign_keywords if targets[kw][match_type] is not None
+                }
+                yield match_type, campaign_keywords, pair_bids
+
+    @staticmethod
+    def normalize_keyword_pairs(pairs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean a SKU/keyword pair table into the KEYWORD_PAIR_COLUMNS
+        
+        SKUs and keywords are normalized like keyword and SKU lists and pairs missing
+        either are dropped. Keywords differing only in case are merged into their first
+        spelling. Bids that are not numbers are ignored and match types are lowercased.
+        
+        Raises:
+            ValueError: If the SKU or Keyword column is missing, a SKU or keyword is
+                invalid, a bid is not above MIN_BID_AMOUNT or a match type is unknown
+        """
+        if 'SKU' not in pairs.columns or 'Keyword' not in pairs.columns:
+            raise ValueError("Keyword pairs must contain 'SKU' and 'Keyword' columns")
+        
+        def text(column: str) -> pd.Series:
+            if column not in pairs.columns:
+                return pd.Series('', index=pairs.index, dtype=object)
+            return pairs[column].fillna('').astype(str).str.strip()
+        
+        table = pd.DataFrame({
+            'SKU': text('SKU'),
+            'Keyword': text('Keyword'),
+            'Bid': pd.to_numeric(pairs['Bid'], errors='coerce') if 'Bid' in pairs.columns else float('nan'),
+            'Match Type': text('Match Type').str.lower()
+        }, columns=KEYWORD_PAIR_COLUMNS)
+        
+        valid_match_types = {BulkSheetGenerator.MATCH_TYPE_EXACT, BulkSheetGenerator.MATCH_TYPE_PHRASE,
+                             BulkSheetGenerator.MATCH_TYPE_BROAD, ''}
+        invalid = set(table['Match Type']) - valid_match_types
+        if invalid:
+            raise ValueError(f"Invalid match types in keyword pairs: {', '.join(sorted(invalid))}")
+        
+        # Normalized before validating, as normalization can change an item
+        for column, validate, case_fold in (('SKU', validate_skus_report, False),
+                                            ('Keyword', validate_keywords_report, True)):
+            values = table[column].unique().tolist()
+            unique, _ = TextFormatter.deduplicate(values, case_fold=case_fold)
+            spellings = {TextFormatter.normalize_item(item, case_fold=case_fold): item for item in unique}
+            table[column] = table[column].map({
+                value: spellings.get(TextFormatter.normalize_item(value, case_fold=case_fold), '') for value in values
+            })
+            report = validate(unique)
+            if report.issues:
+                error = f"Invalid keyword pairs: {report.issues[0].reason}"
+                if len(report.issues) > 1:
+                    error = f"{error} (and {len(report.issues) - 1} more invalid items)"
+                raise ValueError(error)
+        
+        low_bids = table['Bid'] <= MIN_BID_AMOUNT
+        if low_bids.any():
+            raise ValueError(
+                f"{NUMERIC_ERROR.format('Bid', MIN_BID_AMOUNT)}: {', '.join(map(str, table.loc[low_bids, 'Bid'].unique()))}"
+            )
+        
+        table = table[(table['SKU'] != '') & (table['Keyword'] != '')]
+        return table.reset_index(drop=True)
+
+    def _isolates_match_types(self, settings: CampaignSettings) -> bool:
+        """Whether broad/phrase campaigns get the exact keywords as negatives"""
+        match_types = {match_type.lower() for match_type in settings.match_types}
+        if not settings.isolate_match_types or self.MATCH_TYPE_EXACT not in match_types:
+            return False
+        return bool(match_types & {self.MATCH_TYPE_PHRASE, self.MATCH_TYPE_BROAD})
+
+    def _build_negative_index(self, keywords: List[str], settings: CampaignSettings,
+                              keywords_key: Optional[str] = None) -> Optional[NegativeKeywordIndex]:
+        """Index the exact keywords when broad/phrase campaigns must be isolated from them"""
+        if not self._isolates_match_types(settings):
+            return None
+        # The index also memoizes the negatives found per keyword, so sharing it shares those too
+        key = ('negative_index', keywords_key if keywords_key is not None else input_digest(keywords))
+        return self.cache.get(key, lambda: NegativeKeywordIndex(keywords))
+
     def _generate_campaign_name(self, template: str, sku: str, match_type: str, start_date: str) -> str:
         """Generate campaign name using template"""
         # Map of placeholders to their values
@@ -139,7 +628,20 @@ class BulkSheetGenerator:
             '[KW]': '[KW]'
         }
         
-        # Handle date formats
+        # Date formats only depend on the template and start date, so they are filled in once
+        template = self.cache.get(
+            ('name_template', template, start_date),
+            lambda: self._fill_template_dates(template, start_date)
+        )
+        
+        # Replace other placeholders
+        for placeholder, value in replacements.items():
+            template = template.replace(placeholder, value)
+        
+        return template
+
+    def _fill_template_dates(self, template: str, start_date: str) -> str:
+        """Replace the example dates in a name template with the start date in the same format"""
         date_obj = datetime.strptime(start_date, '%Y%m%d')
         date_formats = {
             '250423': date_obj.strftime('%d%m%y'),
@@ -152,37 +654,30 @@ class BulkSheetGenerator:
         for date_format in date_formats:
             if date_format in template:
                 template = template.replace(date_format, date_formats[date_format])
-        
-        # Replace other placeholders
-        for placeholder, value in replacements.items():
-            template = template.replace(placeholder, value)
-        
         return template
 
-    def _generate_campaign_rows(self, sku: str, keywords: List[str], match_type: str, 
-                              start_date: str, settings: CampaignSettings) -> List[Dict[str, Any]]:
-        """Generate all rows for a single campaign with multiple keywords"""
-        rows = []
-        
-        # Clean keywords for use in names
-        clean_keywords = [re.sub(r'[^a-zA-Z0-9]', '_', kw).lower() for kw in keywords]
-        group_identifier = clean_keywords[0]  # Use first keyword as group identifier
+    def _generate_campaign_structure(self, sku: str, campaign_id: str, targeting_label: str, group_identifier: str,
+                                     default_bid: float, start_date: str,
+                                     settings: CampaignSettings) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Generate the campaign, ad group, bidding adjustment and product ad rows of a campaign
         
-        # Generate a unique campaign ID using the group identifier
-        campaign_id = f"{sku}_{match_type}_{group_identifier}"
+        Returns:
+            Tuple of (base row for the campaign's targeting rows, structure rows)
+        """
+        rows = []
         
         # Generate base names
         base_campaign_name = self._generate_campaign_name(
             settings.campaign_name_template, 
             sku, 
-            match_type,
+            targeting_label,
             start_date
         )
         
         base_ad_group_name = self._generate_campaign_name(
             settings.ad_group_name_template,
             sku,
-            match_type,
+            targeting_label,
             start_date
         )
         
@@ -236,7 +731,7 @@ class BulkSheetGenerator:
             'Entity': self.ENTITY_AD_GROUP,
             'Ad Group ID': campaign_id,
             'Ad Group Name': f"{base_ad_group_name}_{group_identifier}",
-            'Ad Group Default Bid': settings.bids[match_type],
+            'Ad Group Default Bid': default_bid,
             'State': self.STATE
         })
         rows.append(ad_group_row)
@@ -263,10 +758,32 @@ class BulkSheetGenerator:
         })
         rows.append(product_ad_row)
         
+        return base_row, rows
+
+    def _generate_campaign_rows(self, sku: str, keywords: List[str], match_type: str, 
+                              start_date: str, settings: CampaignSettings,
+                              negative_keywords: Optional[List[str]] = None,
+                              ids: Optional[CampaignIdIndex] = None,
+                              pair_bids: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Generate all rows for a single campaign with multiple keywords"""
+        # Use the first keyword, cleaned for use in names, as group identifier
+        group_identifier = NON_ALPHANUMERIC.sub('_', keywords[0]).lower()
+        
+        # Generate a short unique campaign ID (the identifier is suffixed if it collides)
+        ids = ids if ids is not None else CampaignIdIndex()
+        campaign_id, group_identifier = ids.assign(sku, match_type, group_identifier)
+        
+        base_row, rows = self._generate_campaign_structure(
+            sku, campaign_id, match_type, group_identifier, settings.bids[match_type], start_date, settings
+        )
+        
         # Keyword rows
         for keyword in keywords:
-            # Get bid for this keyword (use default if no specific bid)
-            keyword_bid = settings.keyword_bids.get(keyword, settings.bids[match_type]) if settings.keyword_bids else settings.bids[match_type]
+            # Get bid for this keyword (use default if no specific bid); a pair's own bid comes first
+            if pair_bids and keyword in pair_bids:
+                keyword_bid = pair_bids[keyword]
+            else:
+                keyword_bid = settings.keyword_bids.get(keyword, settings.bids[match_type]) if settings.keyword_bids else settings.bids[match_type]
             
             keyword_row = base_row.copy()
             keyword_row.update({
@@ -279,8 +796,70 @@ class BulkSheetGenerator:
             })
             rows.append(keyword_row)
         
+        # Negative exact keyword rows isolating this campaign from the exact campaigns
+        for negative_keyword in negative_keywords or []:
+            negative_row = base_row.copy()
+            negative_row.update({
+                'Entity': self.ENTITY_NEGATIVE_KEYWORD,
+                'Ad Group ID': campaign_id,
+                'Keyword Text': negative_keyword,
+                'Match Type': MATCH_TYPE_NEGATIVE_EXACT,
+                'State': self.STATE
+            })
+            rows.append(negative_row)
+        
         return rows
 
+    def _generate_product_targeting_rows(self, sku: str, asins: List[str], start_date: str,
+                                         settings: CampaignSettings,
+                                         ids: Optional[CampaignIdIndex] = None) -> List[Dict[str, Any]]:
+        """Generate all rows for a single campaign targeting multiple ASINs"""
+        group_identifier = asins[0].lower()  # Use first ASIN as group identifier
+        ids = ids if ids is not None else CampaignIdIndex()
+        campaign_id, group_identifier = ids.assign(sku, self.TARGETING_ASIN, group_identifier)
+        
+        base_row, rows = self._generate_campaign_structure(
+            sku, campaign_id, self.TARGETING_ASIN, group_identifier,
+            settings.product_targeting_bid, start_date, settings
+        )
+        
+        # Product Targeting rows
+        for asin in asins:
+            targeting_row = base_row.copy()
+            targeting_row.update({
+                'Entity': self.ENTITY_PRODUCT_TARGETING,
+                'Ad Group ID': campaign_id,
+                'Bid': settings.product_targeting_bid,
+                'Product Targeting Expression': self.ASIN_EXPRESSION.format(asin),
+                'State': self.STATE
+            })
+            rows.append(targeting_row)
+        
+        return rows
+
+    def campaign_id_map(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Map the campaign IDs of a generated sheet (or chunk) back to readable names
+        
+        Returns:
+            DataFrame with CAMPAIGN_ID_MAP_COLUMNS: one row per campaign with its name, ad
+            group name, SKU, match type (or 'asin') and first keyword or ASIN target
+        """
+        entities = chunk['Entity']
+        campaigns = chunk.loc[entities == self.ENTITY_CAMPAIGN, ['Campaign ID', 'Campaign Name']]
+        ad_groups = chunk.loc[entities == self.ENTITY_AD_GROUP, ['Campaign ID', 'Ad Group Name']]
+        product_ads = chunk.loc[entities == self.ENTITY_PRODUCT_AD, ['Campaign ID', 'SKU']]
+        targets = chunk[entities.isin([self.ENTITY_KEYWORD, self.ENTITY_PRODUCT_TARGETING])].drop_duplicates('Campaign ID')
+        targets = pd.DataFrame({
+            'Campaign ID': targets['Campaign ID'],
+            'Targeting': targets['Match Type'].fillna(self.TARGETING_ASIN),
+            'First Target': targets['Keyword Text'].fillna(targets['Product Targeting Expression']),
+        })
+        # Campaigns are never split across chunks, so every merge is one-to-one
+        id_map = (campaigns.merge(ad_groups, on='Campaign ID', how='left')
+                  .merge(product_ads, on='Campaign ID', how='left')
+                  .merge(targets, on='Campaign ID', how='left'))
+        return id_map[CAMPAIGN_ID_MAP_COLUMNS]
+
     def _format_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Format the DataFrame for proper display and export"""
         # Convert empty strings to None for better Excel export
@@ -289,7 +868,11 @@ class BulkSheetGenerator:
         # Format numeric columns
         numeric_columns = ['Daily Budget', 'Bid', 'Ad Group Default Bid']
         for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='ignore')
+            # Equivalent of errors='ignore', which pandas 3 removed: keep the column as-is if not numeric
+            try:
+                df[col] = pd.to_numeric(df[col])
+            except (ValueError, TypeError):
+                pass
             df[col] = df[col].map(lambda x: f'{x:.2f}' if pd.notnull(x) else None)
         
         return df
@@ -309,16 +892,25 @@ class BulkSheetGenerator:
         }
 
     @staticmethod
-    def load_keyword_bids(csv_path: str) -> Dict[str, float]:
+    def load_keyword_bids(csv_path: str, cache: Optional[ResourceCache] = None) -> Dict[str, float]:
         """Load keyword-specific bids from a CSV file.
         
         The CSV file should have two columns:
         - Keyword: The exact keyword text
         - Bid: The bid amount for that keyword
         
+        The parsed bids are cached until the file changes, in `cache` or the process-wide
+        ResourceCache.
+        
         Returns:
             Dict[str, float]: Dictionary mapping keywords to their specific bids
         """
+        cache = cache if cache is not None else ResourceCache.shared()
+        # A copy, so callers adding bids do not change the cached dictionary
+        return dict(cache.get(csv_path, 'keyword_bids', BulkSheetGenerator._parse_keyword_bids))
+
+    @staticmethod
+    def _parse_keyword_bids(csv_path: str) -> Dict[str, float]:
         df = pd.read_csv(csv_path)
         if 'Keyword' not in df.columns or 'Bid' not in df.columns:
             raise ValueError("CSV must contain 'Keyword' and 'Bid' columns")
@@ -331,3 +923,22 @@ class BulkSheetGenerator:
         
         # Create dictionary with keyword as key and bid as float value
         return dict(zip(df['Keyword'], df['Bid'].astype(float)))
+
+    @staticmethod
+    def load_keyword_pairs(csv_path: str, cache: Optional[ResourceCache] = None) -> pd.DataFrame:
+        """Load a SKU/keyword pair table from a CSV file.
+        
+        The CSV file needs SKU and Keyword columns and may have Bid and Match Type
+        columns (see generate_keyword_pairs_sheet). The cleaned table is cached until
+        the file changes, in `cache` or the process-wide ResourceCache.
+        
+        Returns:
+            pd.DataFrame: Pairs with the KEYWORD_PAIR_COLUMNS
+        """
+        cache = cache if cache is not None else ResourceCache.shared()
+        return cache.get(csv_path, 'keyword_pairs', BulkSheetGenerator._parse_keyword_pairs).copy()
+
+    @staticmethod
+    def _parse_keyword_pairs(csv_path: str) -> pd.DataFrame:
+        # Read as text so SKUs like 00123 keep their leading zeros
+        return BulkSheetGenerator.normalize_keyword_pairs(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
@@ -0,0 +1,157 @@
+from typing import List, Optional, Iterable
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from .validators import validate_keywords_report, ValidationReport
+from ..utils.readers import Source, iter_table_chunks
+
+# Search term report layout (alternative header names map to the canonical ones)
+SEARCH_TERM_COLUMN = 'Customer Search Term'
+REPORT_COLUMNS = [SEARCH_TERM_COLUMN, 'Clicks', 'Spend', 'Sales', 'Orders']
+METRIC_COLUMNS = ['Clicks', 'Spend', 'Sales', 'Orders']
+REPORT_HEADER_ALIASES = {
+    'Search Term': SEARCH_TERM_COLUMN,
+    'searchTerm': SEARCH_TERM_COLUMN,
+    'clicks': 'Clicks',
+    'Cost': 'Spend',
+    'cost': 'Spend',
+    '7 Day Total Sales': 'Sales',
+    'sales7d': 'Sales',
+    '7 Day Total Orders (#)': 'Orders',
+    'purchases7d': 'Orders',
+}
+
+HARVEST_CHUNK_SIZE = 200_000  # Report rows per chunk
+DEFAULT_MAX_TERMS = 2_000_000  # Aggregated terms kept in memory before pruning
+ASIN_TERM_PATTERN = r'^b0[a-z0-9]{8}$'  # Search terms that are product (ASIN) clicks, not queries
+
+@dataclass
+class HarvestThresholds:
+    """Minimum performance for a search term to become a keyword candidate"""
+    min_clicks: int = 5
+    min_orders: int = 1
+    max_acos: Optional[float] = None  # e.g. 0.35 for 35%; None disables the check
+
+@dataclass
+class HarvestResult:
+    """Outcome of a harvesting run"""
+    candidates: pd.DataFrame  # Search Term, Clicks, Spend, Sales, Orders, ACoS
+    rejected: ValidationReport  # Candidates failing keyword validation
+    rows_read: int = 0
+    terms_seen: int = 0
+    pruned_terms: int = 0  # Non-converting terms dropped to stay within max_terms
+
+    @property
+    def keywords(self) -> List[str]:
+        return self.candidates[SEARCH_TERM_COLUMN].tolist()
+
+def _to_number(values: pd.Series) -> np.ndarray:
+    """Parse report numbers such as '$1,234.50' into floats, treating blanks as 0"""
+    cleaned = values.str.strip().str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+    try:
+        # Direct casting is several times faster than to_numeric for well-formed reports
+        return cleaned.mask(cleaned == '', '0').astype(float).to_numpy()
+    except ValueError:
+        cleaned = cleaned.str.replace(r'[^0-9.\-]', '', regex=True)
+        return np.nan_to_num(pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float))
+
+def _normalize_terms(terms: pd.Series) -> pd.Series:
+    """Vectorized keyword normalization: collapse whitespace and fold case"""
+    return terms.str.replace(r'\s+', ' ', regex=True).str.strip().str.casefold()
+
+def _prune(totals: pd.DataFrame, max_terms: int) -> pd.DataFrame:
+    """Drop the lowest-click terms without orders until at most half of max_terms remain"""
+    excess = len(totals) - max_terms // 2
+    non_converting = totals[totals['Orders'] <= 0]
+    drop = non_converting.nsmallest(min(excess, len(non_converting)), 'Clicks').index
+    return totals.drop(drop)
+
+def aggregate_search_terms(chunks: Iterable[pd.DataFrame], max_terms: int = DEFAULT_MAX_TERMS):
+    """
+    Aggregate clicks, spend, sales and orders per normalized search term
+
+    Memory is bounded by max_terms: when exceeded, the lowest-click terms without any
+    orders are pruned. Converting terms are never pruned.
+
+    Returns:
+        Tuple of (totals indexed by search term, rows read, terms pruned)
+    """
+    totals = pd.DataFrame(columns=METRIC_COLUMNS, index=pd.Index([], dtype=object), dtype=float)
+    pending = []
+    pending_rows = 0
+    rows_read = 0
+    pruned = 0
+
+    def combine(totals: pd.DataFrame) -> pd.DataFrame:
+        return pd.concat([totals] + pending).groupby(level=0).sum()
+
+    for chunk in chunks:
+        rows_read += len(chunk)
+        terms = _normalize_terms(chunk[SEARCH_TERM_COLUMN])
+        metrics = pd.DataFrame({column: _to_number(chunk[column]) for column in METRIC_COLUMNS})
+        metrics.index = terms.to_numpy()
+        metrics = metrics[metrics.index != '']
+        partial = metrics.groupby(level=0).sum()
+        pending.append(partial)
+        pending_rows += len(partial)
+
+        # Partials are merged in batches rather than realigning the full totals on every chunk
+        if len(totals) + pending_rows > max_terms:
+            totals = combine(totals)
+            pending, pending_rows = [], 0
+            if len(totals) > max_terms:
+                before = len(totals)
+                totals = _prune(totals, max_terms)
+                pruned += before - len(totals)
+
+    if pending:
+        totals = combine(totals)
+    totals.index.name = SEARCH_TERM_COLUMN
+    return totals, rows_read, pruned
+
+def harvest_search_terms(source: Source, thresholds: Optional[HarvestThresholds] = None,
+                         existing_keywords: Iterable[str] = (), max_terms: int = DEFAULT_MAX_TERMS,
+                         chunksize: int = HARVEST_CHUNK_SIZE) -> HarvestResult:
+    """
+    Stream a search term report and select converting queries as new keyword candidates
+
+    Args:
+        source: Search term report (CSV, XLSX, .gz or .zip)
+        thresholds: Candidate thresholds. Defaults to HarvestThresholds().
+        existing_keywords: Keywords already targeted; matching terms are skipped
+        max_terms: Upper bound on aggregated terms held in memory
+        chunksize: Report rows per chunk
+
+    Returns:
+        HarvestResult with candidates ordered by orders and clicks (descending)
+    """
+    thresholds = thresholds or HarvestThresholds()
+    chunks = iter_table_chunks(source, REPORT_COLUMNS, chunksize=chunksize, aliases=REPORT_HEADER_ALIASES)
+    totals, rows_read, pruned = aggregate_search_terms(chunks, max_terms)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        totals['ACoS'] = np.where(totals['Sales'] > 0, totals['Spend'] / totals['Sales'], np.inf)
+
+    selected = (totals['Clicks'] >= thresholds.min_clicks) & (totals['Orders'] >= thresholds.min_orders)
+    if thresholds.max_acos is not None:
+        selected &= totals['ACoS'] <= thresholds.max_acos
+    selected &= ~pd.Series(totals.index, index=totals.index, dtype=object).str.match(ASIN_TERM_PATTERN).astype(bool)
+    existing = set(_normalize_terms(pd.Series(list(existing_keywords), dtype=object)))
+    if existing:
+        selected &= ~totals.index.isin(existing)
+
+    candidates = totals[selected].sort_values(['Orders', 'Clicks'], ascending=False).reset_index()
+
+    # Drop candidates that would fail keyword validation in the generator
+    rejected = validate_keywords_report(candidates[SEARCH_TERM_COLUMN].tolist())
+    if rejected.issues:
+        candidates = candidates.drop(index=[issue.index for issue in rejected.issues]).reset_index(drop=True)
+
+    return HarvestResult(
+        candidates=candidates,
+        rejected=rejected,
+        rows_read=rows_read,
+        terms_seen=len(totals),
+        pruned_terms=pruned
+    )
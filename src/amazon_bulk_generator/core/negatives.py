@@ -0,0 +1,115 @@
+import sys
+from typing import List, Dict, Set, Tuple, Iterable
+
+from .bulk_export import normalize_keyword_key
+from .validators import MATCH_TYPE_PHRASE, MATCH_TYPE_BROAD
+
+# Match types that compete with exact campaigns for the same queries
+ISOLATED_MATCH_TYPES = {MATCH_TYPE_BROAD, MATCH_TYPE_PHRASE}
+MATCH_TYPE_NEGATIVE_EXACT = "negativeExact"
+MEMO_ENTRY_BYTES = 150  # Dict slot and key tuple of one memoized lookup
+
+class NegativeKeywordIndex:
+    """Inverted token index over exact-match terms
+
+    A query equal to an exact term E reaches a phrase keyword k only if k's tokens appear
+    contiguously in E, and a broad keyword k only if all of k's tokens appear in E. The
+    index finds those terms by intersecting the posting lists of k's tokens, so each
+    campaign receives only the negatives that can actually match it instead of every
+    exact term.
+    """
+
+    def __init__(self, exact_terms: Iterable[str]):
+        """
+        Initialize NegativeKeywordIndex
+
+        Args:
+            exact_terms: Keywords targeted with exact match; duplicates (case- and
+                whitespace-insensitive) are kept once, in first-seen order
+        """
+        self.terms: List[str] = []
+        self.term_tokens: List[Tuple[str, ...]] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self.nbytes = 0  # Approximate memory held, including the memoized results
+        seen: Set[str] = set()
+
+        for term in exact_terms:
+            key = normalize_keyword_key(term)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            term_id = len(self.terms)
+            tokens = tuple(key.split(' '))
+            self.terms.append(term)
+            self.term_tokens.append(tokens)
+            self.nbytes += sys.getsizeof(term) + sys.getsizeof(tokens)
+            for token in set(tokens):
+                self.postings.setdefault(token, set()).add(term_id)
+        self.nbytes += sys.getsizeof(self.postings) + sum(
+            sys.getsizeof(token) + sys.getsizeof(posting) for token, posting in self.postings.items()
+        )
+
+        # Results depend only on the keyword and match type, which repeat across SKUs
+        self._cache: Dict[Tuple[str, str], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _matching_term_ids(self, keyword: str, match_type: str) -> List[int]:
+        """Ids of exact terms that a keyword with the given match type would also match"""
+        key = normalize_keyword_key(keyword)
+        cached = self._cache.get((key, match_type))
+        if cached is not None:
+            return cached
+
+        tokens = key.split(' ') if key else []
+        postings = [self.postings.get(token) for token in set(tokens)]
+        if not tokens or not all(postings):
+            matches = []
+        else:
+            # Start from the rarest token; set intersection iterates the smaller operand
+            postings.sort(key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = candidates & posting
+                if not candidates:
+                    break
+            if match_type == MATCH_TYPE_PHRASE:
+                candidates = {
+                    term_id for term_id in candidates
+                    if _contains_sequence(self.term_tokens[term_id], tokens)
+                }
+            matches = sorted(candidates)
+
+        self._cache[(key, match_type)] = matches
+        self.nbytes += sys.getsizeof(matches) + sys.getsizeof(key) + MEMO_ENTRY_BYTES
+        return matches
+
+    def negatives_for(self, keywords: Iterable[str], match_type: str) -> List[str]:
+        """
+        Get the exact terms to add as negative exact keywords to a campaign
+
+        Args:
+            keywords: Keywords targeted by the campaign
+            match_type: Campaign match type; only broad and phrase campaigns get negatives
+
+        Returns:
+            Exact terms in index order, each listed once
+        """
+        match_type = match_type.lower()
+        if match_type not in ISOLATED_MATCH_TYPES:
+            return []
+
+        term_ids: Set[int] = set()
+        for keyword in keywords:
+            term_ids.update(self._matching_term_ids(keyword, match_type))
+        return [self.terms[term_id] for term_id in sorted(term_ids)]
+
+def _contains_sequence(tokens: Tuple[str, ...], sequence: List[str]) -> bool:
+    """Check whether `sequence` appears contiguously in `tokens`"""
+    length = len(sequence)
+    first = sequence[0]
+    for start in range(len(tokens) - length + 1):
+        if tokens[start] == first and list(tokens[start:start + length]) == sequence:
+            return True
+    return False
@@ -1,10 +1,16 @@
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Union
+from typing import List, Dict, Tuple, Optional, Union, Sequence
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 import re
+import pandas as pd
+
+from ..utils.metrics import ITEMS_VALIDATED, VALIDATION_FAILURES
 
 # Amazon's validation limits
 MAX_KEYWORD_LENGTH = 80  # Maximum allowed length for keywords
 MAX_SKU_LENGTH = 40  # Maximum allowed length for SKUs
+ASIN_LENGTH = 10  # ASINs and ISBN-10s are always 10 characters
 MAX_TEMPLATE_LENGTH = 128  # Maximum allowed length for campaign/ad group name templates
 MIN_DAILY_BUDGET = 1.0  # Minimum allowed daily budget in dollars
 MIN_BID_AMOUNT = 0.02  # Minimum allowed bid amount in dollars
@@ -27,6 +33,7 @@ EMPTY_LIST_ERROR = "No {} provided"
 EMPTY_ITEM_ERROR = "Empty value found in {}"
 LENGTH_ERROR = "Invalid length for {}: '{}' exceeds maximum length of {}"
 INVALID_CHARS_ERROR = "Invalid characters in {}: {}"
+INVALID_FORMAT_ERROR = "Invalid format for {}: {}"
 TEMPLATE_LENGTH_ERROR = "{} exceeds maximum length"
 BID_ADJUSTMENT_RANGE_ERROR = "Bid adjustment must be between {}% and {}%"
 
@@ -35,6 +42,7 @@ DAILY_BUDGET_FIELD = "Daily budget"
 BID_FIELD_TEMPLATE = "Bid for {}"
 KEYWORD_FIELD = "Keyword"
 SKU_FIELD = "SKU"
+ASIN_FIELD = "ASIN"
 MATCH_TYPE_FIELD = "Match type"
 PLACEMENT_FIELD = "Placement"
 PERCENTAGE_FIELD = "Percentage"
@@ -54,6 +62,8 @@ KEYWORD_SINGULAR = "keyword"
 SKU_SINGULAR = "SKU"
 KEYWORDS_PLURAL = "keywords"
 SKUS_PLURAL = "SKUs"
+ASIN_SINGULAR = "ASIN"
+ASINS_PLURAL = "ASINs"
 
 # Match type values
 MATCH_TYPE_EXACT = "exact"
@@ -92,6 +102,79 @@ SETTINGS_START_DATE_KEY = "start_date"
 KEYWORD_PATTERN = r'^[\w\s\-\']+$'  # Allows alphanumeric, spaces, hyphens, and apostrophes
 SKU_PATTERN = r'^[a-zA-Z0-9_\-.,></":\;+=]+$'  # Allows alphanumeric and specified special characters
 TEMPLATE_PATTERN = r'^[\w\-_]*$'  # Allows alphanumeric, hyphens, and underscores
+ASIN_PATTERN = r'^(B0[A-Z0-9]{8}|\d{9}[\dX])$'  # Amazon ASIN or ISBN-10 (books)
+
+# Arrow's regex engine (RE2) reads \w and \s as ASCII-only, so the keyword pattern is spelled with
+# Unicode classes for Arrow-backed strings. Arrow's Unicode tables can be newer than Python's, so
+# items with characters outside the BMP are always re-checked with Python's re.
+ARROW_SCREEN_PATTERNS = {
+    KEYWORD_PATTERN: r"^[\p{L}\p{N}_\s\-']+$",
+}
+ASTRAL_CHARACTER_PATTERN = r'[\x{10000}-\x{10FFFF}]'
+
+# Compiled patterns (compiled once at import instead of on every call)
+KEYWORD_REGEX = re.compile(KEYWORD_PATTERN)
+SKU_REGEX = re.compile(SKU_PATTERN)
+ASIN_REGEX = re.compile(ASIN_PATTERN)
+
+# Batch validation
+PARALLEL_VALIDATION_THRESHOLD = 5_000_000  # Inputs larger than this are split across processes
+VALIDATION_CHUNK_SIZE = 1_000_000  # Items per worker chunk in parallel validation
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """A single validation violation in a batch of items"""
+    index: int  # Zero-based row index in the input list
+    value: str
+    reason: str
+
+@dataclass
+class ValidationReport:
+    """Full validation report for a batch of keywords or SKUs"""
+    field: str
+    total: int
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return self.total > 0 and not self.issues
+
+    def to_result(self) -> Tuple[bool, Optional[str]]:
+        """Collapse the report into the standard (valid, first error) tuple"""
+        if self.total == 0:
+            return VALIDATION_FAILURE(EMPTY_LIST_ERROR.format(_BATCH_SPECS[self.field][0]))
+        if self.issues:
+            return VALIDATION_FAILURE(self.issues[0].reason)
+        return VALIDATION_SUCCESS
+
+    def for_rows(self, rows: Sequence[int], total: int, empty_rows: Sequence[int] = ()) -> 'ValidationReport':
+        """
+        Map a report on normalized, de-duplicated items back to the input rows they came from
+        
+        Args:
+            rows: Input row of each validated item (DeduplicationStats.rows)
+            total: Number of input rows
+            empty_rows: Input rows dropped as empty, reported as empty items
+        """
+        issues = [ValidationIssue(rows[issue.index], issue.value, issue.reason) for issue in self.issues]
+        empty_reason = EMPTY_ITEM_ERROR.format(_BATCH_SPECS[self.field][1])
+        issues.extend(ValidationIssue(row, EMPTY_STRING, empty_reason) for row in empty_rows)
+        issues.sort(key=lambda issue: issue.index)
+        return ValidationReport(field=self.field, total=total, issues=issues)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the violations as a DataFrame with Row, Value and Reason columns"""
+        return pd.DataFrame(
+            [(issue.index, issue.value, issue.reason) for issue in self.issues],
+            columns=['Row', 'Value', 'Reason']
+        )
+
+# Field -> (singular name, plural name, max length, pattern, pattern error) for batch validation
+_BATCH_SPECS = {
+    KEYWORD_FIELD: (KEYWORD_SINGULAR, KEYWORDS_PLURAL, MAX_KEYWORD_LENGTH, KEYWORD_PATTERN, INVALID_CHARS_ERROR),
+    SKU_FIELD: (SKU_SINGULAR, SKUS_PLURAL, MAX_SKU_LENGTH, SKU_PATTERN, INVALID_CHARS_ERROR),
+    ASIN_FIELD: (ASIN_SINGULAR, ASINS_PLURAL, ASIN_LENGTH, ASIN_PATTERN, INVALID_FORMAT_ERROR),
+}
 
 def validate_numeric_input(value: Union[float, str], field_name: str, min_value: float = DEFAULT_MIN_VALUE) -> Tuple[bool, Optional[str]]:
     """Validate numeric inputs for campaign settings"""
@@ -124,7 +207,7 @@ def validate_keywords(keywords: List[str]) -> Tuple[bool, Optional[str]]:
             return VALIDATION_FAILURE(EMPTY_ITEM_ERROR.format(KEYWORDS_PLURAL))
         if len(keyword) > MAX_KEYWORD_LENGTH:
             return VALIDATION_FAILURE(LENGTH_ERROR.format(KEYWORD_FIELD, keyword, MAX_KEYWORD_LENGTH))
-        if not re.match(KEYWORD_PATTERN, keyword):
+        if not KEYWORD_REGEX.match(keyword):
             return VALIDATION_FAILURE(INVALID_CHARS_ERROR.format(KEYWORD_FIELD, keyword))
     
     return VALIDATION_SUCCESS
@@ -139,11 +222,92 @@ def validate_skus(skus: List[str]) -> Tuple[bool, Optional[str]]:
             return VALIDATION_FAILURE(EMPTY_ITEM_ERROR.format(SKUS_PLURAL))
         if len(sku) > MAX_SKU_LENGTH:
             return VALIDATION_FAILURE(LENGTH_ERROR.format(SKU_FIELD, sku, MAX_SKU_LENGTH))
-        if not re.match(SKU_PATTERN, sku):
+        if not SKU_REGEX.match(sku):
             return VALIDATION_FAILURE(INVALID_CHARS_ERROR.format(SKU_FIELD, sku))
     
     return VALIDATION_SUCCESS
 
+def validate_asins(asins: List[str]) -> Tuple[bool, Optional[str]]:
+    """Validate ASINs list"""
+    return validate_asins_report(asins).to_result()
+
+def _to_string_series(items: Sequence) -> pd.Series:
+    """Build a string Series, using pandas' default (Arrow-backed when available) string storage"""
+    values = pd.Series(items)
+    if values.dtype == object:
+        values = values.astype('string')
+    return values
+
+def _screen(values: pd.Series, pattern: str) -> pd.Series:
+    """Match a pattern with vectorized string operations; False marks items to re-check with re"""
+    arrow_pattern = ARROW_SCREEN_PATTERNS.get(pattern)
+    if arrow_pattern is None or getattr(values.dtype, 'storage', None) != 'pyarrow':
+        return values.str.fullmatch(pattern).fillna(False).astype(bool)
+    matches = values.str.fullmatch(arrow_pattern).fillna(False).astype(bool)
+    return matches & ~values.str.contains(ASTRAL_CHARACTER_PATTERN).fillna(False).astype(bool)
+
+def _validate_chunk(values: pd.Series, field_name: str) -> List[ValidationIssue]:
+    """Check a chunk of items with vectorized string operations and return all violations"""
+    _, plural, max_length, pattern, pattern_error = _BATCH_SPECS[field_name]
+    regex = re.compile(pattern)
+    
+    missing = values.isna()
+    values = values.fillna(EMPTY_STRING)
+    empty = missing | (values.str.strip() == EMPTY_STRING)
+    too_long = ~empty & (values.str.len() > max_length)
+    # The vectorized regex engine may disagree with Python's re at the edges,
+    # so it is only used as a screen; flagged items are re-checked with the compiled pattern.
+    suspect = ~empty & ~too_long & ~_screen(values, pattern)
+    
+    issues = []
+    for position in (empty | too_long | suspect).to_numpy().nonzero()[0]:
+        value = values.iat[position]
+        if empty.iat[position]:
+            reason = EMPTY_ITEM_ERROR.format(plural)
+        elif too_long.iat[position]:
+            reason = LENGTH_ERROR.format(field_name, value, max_length)
+        elif not regex.match(value):
+            reason = pattern_error.format(field_name, value)
+        else:
+            continue
+        issues.append(ValidationIssue(int(values.index[position]), value, reason))
+    return issues
+
+def _validate_batch(items: Sequence, field_name: str, max_workers: Optional[int]) -> ValidationReport:
+    """Validate every item of a list and collect all violations"""
+    if items is None or len(items) == 0:
+        return ValidationReport(field=field_name, total=0)
+    
+    values = _to_string_series(items).reset_index(drop=True)
+    report = ValidationReport(field=field_name, total=len(values))
+    if len(values) <= PARALLEL_VALIDATION_THRESHOLD or max_workers == 1:
+        report.issues = _validate_chunk(values, field_name)
+    else:
+        # String Series pickle as contiguous buffers, so chunks are cheap to ship to workers
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_validate_chunk, values.iloc[offset:offset + VALIDATION_CHUNK_SIZE], field_name)
+                for offset in range(0, len(values), VALIDATION_CHUNK_SIZE)
+            ]
+            for future in futures:
+                report.issues.extend(future.result())
+    
+    ITEMS_VALIDATED.inc(report.total, field=field_name)
+    VALIDATION_FAILURES.inc(len(report.issues), field=field_name)
+    return report
+
+def validate_keywords_report(keywords: Sequence[str], max_workers: Optional[int] = None) -> ValidationReport:
+    """Validate all keywords at once and report every violation with its row index"""
+    return _validate_batch(keywords, KEYWORD_FIELD, max_workers)
+
+def validate_skus_report(skus: Sequence[str], max_workers: Optional[int] = None) -> ValidationReport:
+    """Validate all SKUs at once and report every violation with its row index"""
+    return _validate_batch(skus, SKU_FIELD, max_workers)
+
+def validate_asins_report(asins: Sequence[str], max_workers: Optional[int] = None) -> ValidationReport:
+    """Validate all ASINs at once and report every violation with its row index"""
+    return _validate_batch(asins, ASIN_FIELD, max_workers)
+
 def validate_match_types(match_types: List[str]) -> Tuple[bool, Optional[str]]:
     """Validate match types"""
     valid_match_types = {
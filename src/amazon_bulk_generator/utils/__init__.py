@@ -1,10 +1,16 @@
 """Utility functions for Amazon Bulk Campaign Generator"""
 
 from .file_handlers import FileHandler
-from .formatters import TextFormatter, DataFormatter
+from .formatters import TextFormatter, DataFormatter, DeduplicationStats
+from .output_store import OutputStore, RetentionPolicy
+from .resource_cache import ResourceCache
 
 __all__ = [
     'FileHandler',
     'TextFormatter',
-    'DataFormatter'
+    'DataFormatter',
+    'DeduplicationStats',
+    'OutputStore',
+    'RetentionPolicy',
+    'ResourceCache'
 ]
@@ -1,24 +1,109 @@
 import pandas as pd
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
 import os
 from datetime import datetime
+import gzip
+import io
 import logging
+import queue
+import threading
+import uuid
+import zipfile
 from pathlib import Path
 
+from .readers import CSV_CHUNK_SIZE, Source, iter_column_values
+from .output_store import OutputStore, RetentionPolicy, atomic_path
+from .metrics import EXPORT_SECONDS, ROWS_EXPORTED
+from .resource_cache import ResourceCache
+from .xlsx import write_xlsx
+
 logger = logging.getLogger(__name__)
 
+# Formats save_bulk_sheet_chunks can write; 'zip' bundles the sheet as CSV and XLSX
+FORMAT_CSV_GZ = 'csv.gz'
+FORMAT_ZIP = 'zip'
+STREAM_FORMATS = ('csv', 'xlsx', 'parquet', FORMAT_CSV_GZ, FORMAT_ZIP)
+DEFAULT_COMPRESS_LEVEL = 6  # gzip/deflate level (1 fastest .. 9 smallest)
+TEE_QUEUE_CHUNKS = 4  # Chunks buffered per writer in save_bulk_sheet_formats
+EXCEL_SHEET_NAME = 'Sponsored Products'
+
+T = TypeVar('T')
+
+# Markers closing a tee writer's queue: after the last chunk, or when the producer failed
+_END = object()
+_ABORT = object()
+
+class _TeeAborted(Exception):
+    """Raised in a tee writer when chunk production failed, so its partial file is discarded"""
+
+class _TeeQueue:
+    """Bounded queue of chunks feeding one format writer of save_bulk_sheet_formats"""
+
+    def __init__(self, maxsize: int):
+        self.queue: 'queue.Queue' = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        while True:
+            item = self.queue.get()
+            if item is _END or item is _ABORT:
+                self.closed = True
+                if item is _ABORT:
+                    raise _TeeAborted()
+                return
+            yield item
+
+    def drain(self) -> None:
+        """Discard chunks until the queue is closed, so the producer never blocks on a failed writer"""
+        while not self.closed:
+            item = self.queue.get()
+            self.closed = item is _END or item is _ABORT
+
+def parquet_supported() -> bool:
+    """Whether Parquet output is available (it requires pyarrow)"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def read_text(path: str) -> str:
+    """Read a whole text file"""
+    with open(path, 'r') as f:
+        return f.read()
+
+def new_job_id() -> str:
+    """
+    Create a unique, sortable identifier for a generation job
+    
+    Returns:
+        Timestamp followed by a random suffix, e.g. '20250423_101500_1a2b3c4d'
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
 class FileHandler:
-    """Class to handle file operations for the bulk campaign generator"""
+    """Class to handle file operations for the bulk campaign generator
+    
+    Instances hold no per-call state and output files are written atomically under
+    unique names, so one FileHandler can be shared across threads and sessions.
+    """
     
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, retention: Optional[RetentionPolicy] = None,
+                 resource_cache: Optional[ResourceCache] = None):
         """
         Initialize FileHandler
         
         Args:
             base_dir: Base directory for file operations. Defaults to current directory.
+            retention: Size and age limits for the output directory. Defaults to
+                RetentionPolicy.from_env().
+            resource_cache: Cache of parsed templates and other resource files.
+                Defaults to the process-wide ResourceCache.
         """
         self.base_dir = base_dir or os.getcwd()
         self._ensure_directories()
+        self.output_store = OutputStore.shared(os.path.join(self.base_dir, 'output'), retention)
+        self.resource_cache = resource_cache if resource_cache is not None else ResourceCache.shared()
 
     def _ensure_directories(self) -> None:
         """Ensure required directories exist"""
@@ -29,12 +114,26 @@ class FileHandler:
                 os.makedirs(dir_path)
                 logger.info(f"Created directory: {dir_path}")
 
-    def load_csv_data(self, file_path: str) -> List[str]:
+    def get_cache_dir(self, name: str) -> str:
+        """
+        Get (and create) a cache directory for derived data such as indexes
+        
+        Args:
+            name: Cache name, e.g. 'bulk_exports'
+            
+        Returns:
+            Path to the cache directory
+        """
+        cache_dir = os.path.join(self.base_dir, 'cache', name)
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    def load_csv_data(self, file_path: Source) -> List[str]:
         """
         Load data from CSV file
         
         Args:
-            file_path: Path to the CSV file
+            file_path: Path or file object of the CSV file (.xlsx, .gz and .zip are also accepted)
             
         Returns:
             List of values from the first column
@@ -43,98 +142,335 @@ class FileHandler:
             FileNotFoundError: If the file doesn't exist
             pd.errors.EmptyDataError: If the file is empty
         """
+        return self.load_input_data(file_path)
+
+    def iter_input_data(self, source: Source, column: int = 0,
+                        chunksize: int = CSV_CHUNK_SIZE) -> Iterator[List[str]]:
+        """
+        Stream values of one column from a CSV, XLSX, .gz or .zip input in chunks
+        
+        Args:
+            source: File path or uploaded file object
+            column: Zero-based column index to read
+            chunksize: Number of rows per chunk
+            
+        Returns:
+            Iterator over lists of values
+        """
+        return iter_column_values(source, column=column, chunksize=chunksize)
+
+    def load_input_data(self, source: Source, column: int = 0) -> List[str]:
+        """
+        Load all values of one column from a CSV, XLSX, .gz or .zip input
+        
+        Args:
+            source: File path or uploaded file object
+            column: Zero-based column index to read
+            
+        Returns:
+            List of non-empty values from the column
+        
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            pd.errors.EmptyDataError: If the file has no values
+        """
         try:
-            df = pd.read_csv(file_path)
-            if df.empty:
-                raise pd.errors.EmptyDataError("CSV file is empty")
-            return df.iloc[:, 0].tolist()
+            values = []
+            for chunk in self.iter_input_data(source, column=column):
+                values.extend(chunk)
+            if not values:
+                raise pd.errors.EmptyDataError("Input file is empty")
+            return values
         except FileNotFoundError:
-            logger.error(f"File not found: {file_path}")
+            logger.error(f"File not found: {source}")
             raise
         except pd.errors.EmptyDataError:
-            logger.error(f"Empty CSV file: {file_path}")
+            logger.error(f"Empty input file: {source}")
             raise
         except Exception as e:
-            logger.error(f"Error loading CSV file {file_path}: {str(e)}")
+            logger.error(f"Error loading input file {source}: {str(e)}")
             raise
 
-    def save_bulk_sheet(self, df: pd.DataFrame, format: str = 'xlsx') -> str:
+    def save_bulk_sheet(self, df: pd.DataFrame, format: str = 'xlsx', job_id: Optional[str] = None) -> str:
         """
         Save bulk sheet to file
         
         Args:
             df: DataFrame containing bulk sheet data
             format: Output format ('xlsx' or 'csv')
+            job_id: Identifier used in the filename. Pass the same ID to save several
+                formats of one job under matching names. Defaults to a new unique ID.
             
         Returns:
             Path to the saved file
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        job_id = job_id or new_job_id()
         output_dir = os.path.join(self.base_dir, 'output')
         
-        if format.lower() == 'xlsx':
-            return self._save_excel(df, output_dir, timestamp)
-        elif format.lower() == 'csv':
-            return self._save_csv(df, output_dir, timestamp)
-        else:
+        if format.lower() not in ('xlsx', 'csv'):
+            raise ValueError(f"Unsupported format: {format}")
+        with EXPORT_SECONDS.time(format=format.lower()):
+            if format.lower() == 'xlsx':
+                output_path = self._save_excel(df, output_dir, job_id)
+            else:
+                output_path = self._save_csv(df, output_dir, job_id)
+        ROWS_EXPORTED.inc(len(df), format=format.lower())
+        
+        # Register the file so old outputs are evicted once limits are exceeded
+        self.output_store.add(output_path)
+        return output_path
+
+    def save_bulk_sheet_chunks(self, chunks: Iterable[pd.DataFrame], format: str = 'csv',
+                               job_id: Optional[str] = None, prefix: str = 'amazon_bulk_upload',
+                               compress_level: int = DEFAULT_COMPRESS_LEVEL) -> str:
+        """
+        Save a bulk sheet streamed as DataFrame chunks without holding it in memory
+        
+        Args:
+            chunks: DataFrames with identical columns, written in order
+            format: Output format: 'xlsx', 'csv', 'parquet', 'csv.gz' or 'zip' (CSV and
+                XLSX in one archive)
+            job_id: Identifier used in the filename. Defaults to a new unique ID.
+            prefix: Filename prefix
+            compress_level: Compression level (1-9) for 'csv.gz' and 'zip'
+            
+        Returns:
+            Path to the saved file
+        """
+        job_id = job_id or new_job_id()
+        if format.lower() not in STREAM_FORMATS:
             raise ValueError(f"Unsupported format: {format}")
+        output_path = os.path.join(self.base_dir, 'output', f"{prefix}_{job_id}.{format.lower()}")
+        writers = {
+            'csv': self._stream_csv,
+            'xlsx': self._stream_excel,
+            'parquet': self._stream_parquet,
+            FORMAT_CSV_GZ: lambda chunks, path: self._stream_csv_gz(chunks, path, compress_level),
+            FORMAT_ZIP: lambda chunks, path: self._stream_zip(chunks, path, compress_level, f"{prefix}_{job_id}"),
+        }
+        
+        with EXPORT_SECONDS.time(format=format.lower()), atomic_path(output_path) as temp_path:
+            rows = writers[format.lower()](chunks, temp_path)
+        ROWS_EXPORTED.inc(rows, format=format.lower())
+        
+        logger.info(f"Saved {rows} rows to {output_path}")
+        self.output_store.add(output_path)
+        return output_path
+
+    def save_bulk_sheet_formats(self, chunks: Iterable[pd.DataFrame], formats: Sequence[str] = ('xlsx', 'csv'),
+                                job_id: Optional[str] = None, prefix: str = 'amazon_bulk_upload',
+                                compress_level: int = DEFAULT_COMPRESS_LEVEL,
+                                side_outputs: Optional[Dict[str, Callable[[pd.DataFrame], pd.DataFrame]]] = None
+                                ) -> Dict[str, str]:
+        """
+        Save a bulk sheet in several formats from a single pass over its chunks
+        
+        Every format is written by its own thread, fed through a bounded queue, so the
+        chunks are produced once and the writers run side by side: the export takes
+        about as long as the slowest writer rather than the sum of all of them. If the
+        chunks raise (e.g. on cancellation), no file is kept and the error propagates.
+        
+        Args:
+            chunks: DataFrames with identical columns, written in order
+            formats: Output formats, any of STREAM_FORMATS
+            job_id: Identifier used in the filenames. Defaults to a new unique ID.
+            prefix: Filename prefix
+            compress_level: Compression level (1-9) for 'csv.gz' and 'zip'
+            side_outputs: Extra CSV files derived chunk by chunk from the sheet (e.g. a
+                campaign ID mapping), as a function of each chunk by name. Each is saved
+                as <prefix>_<name>_<job_id>.csv.
+            
+        Returns:
+            Path of the saved file per format and per side output name
+        """
+        job_id = job_id or new_job_id()
+        formats = [format.lower() for format in formats]
+        unsupported = [format for format in formats if format not in STREAM_FORMATS]
+        if unsupported:
+            raise ValueError(f"Unsupported format: {', '.join(unsupported)}")
+        
+        # Every output, keyed by the name its path is returned under: (format, prefix, chunk transform)
+        outputs = {format: (format, prefix, None) for format in formats}
+        outputs.update({name: ('csv', f"{prefix}_{name}", transform) for name, transform in (side_outputs or {}).items()})
+        queues = {name: _TeeQueue(TEE_QUEUE_CHUNKS) for name in outputs}
+        paths: Dict[str, str] = {}
+        errors: Dict[str, Exception] = {}
+        
+        def write(name: str) -> None:
+            format, output_prefix, transform = outputs[name]
+            chunks = queues[name] if transform is None else map(transform, queues[name])
+            try:
+                paths[name] = self.save_bulk_sheet_chunks(chunks, format, job_id=job_id, prefix=output_prefix,
+                                                          compress_level=compress_level)
+            except _TeeAborted:
+                pass
+            except Exception as e:
+                logger.error(f"Error writing {name} output: {str(e)}")
+                errors[name] = e
+                queues[name].drain()
+        
+        threads = [threading.Thread(target=write, args=(name,), name=f"tee_{name}", daemon=True)
+                   for name in outputs]
+        for thread in threads:
+            thread.start()
+        
+        end = _ABORT
+        try:
+            for chunk in chunks:
+                for tee_queue in queues.values():
+                    tee_queue.queue.put(chunk)
+            end = _END
+        finally:
+            for tee_queue in queues.values():
+                tee_queue.queue.put(end)
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise next(iter(errors.values()))
+        return {name: paths[name] for name in outputs}
+
+    def _stream_csv(self, chunks: Iterable[pd.DataFrame], path: str) -> int:
+        """Append DataFrame chunks to a CSV file, writing the header once"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            return self._write_csv_chunks(chunks, f)
+
+    def _write_csv_chunks(self, chunks: Iterable[pd.DataFrame], f) -> int:
+        rows = 0
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0, index=False)
+            rows += len(chunk)
+        return rows
 
-    def _save_excel(self, df: pd.DataFrame, output_dir: str, timestamp: str) -> str:
+    def _stream_csv_gz(self, chunks: Iterable[pd.DataFrame], path: str, compress_level: int) -> int:
+        """Append DataFrame chunks to a gzip-compressed CSV file"""
+        with gzip.open(path, 'wt', compresslevel=compress_level, newline='', encoding='utf-8') as f:
+            return self._write_csv_chunks(chunks, f)
+
+    def _stream_zip(self, chunks: Iterable[pd.DataFrame], path: str, compress_level: int, name: str) -> int:
+        """Write a ZIP archive holding the sheet as `name`.csv and `name`.xlsx
+        
+        The CSV entry is deflated as chunks arrive while the same chunks feed the
+        XLSX writer; the finished workbook (already compressed) is then stored as is.
+        """
+        xlsx_path = f"{path}.xlsx.tmp"
+        try:
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compress_level) as archive:
+                csv_rows = [0]
+                # force_zip64 because the entry size is unknown until the stream ends
+                with archive.open(f"{name}.csv", 'w', force_zip64=True) as raw, \
+                        io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                    def to_csv(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+                        for chunk in chunks:
+                            chunk.to_csv(f, header=csv_rows[0] == 0, index=False)
+                            csv_rows[0] += len(chunk)
+                            yield chunk
+                    rows = self._stream_excel(to_csv(chunks), xlsx_path)
+                archive.write(xlsx_path, f"{name}.xlsx", compress_type=zipfile.ZIP_STORED)
+        finally:
+            if os.path.exists(xlsx_path):
+                os.remove(xlsx_path)
+        return rows
+
+    def _stream_excel(self, chunks: Iterable[pd.DataFrame], path: str) -> int:
+        """Write DataFrame chunks to a workbook whose rows are serialized by parallel worker processes"""
+        return write_xlsx(chunks, path, EXCEL_SHEET_NAME)
+
+    def _stream_parquet(self, chunks: Iterable[pd.DataFrame], path: str) -> int:
+        """Write DataFrame chunks as row groups of one Parquet file (requires pyarrow)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        writer = None
+        rows = 0
+        try:
+            for chunk in chunks:
+                # Bulk sheet columns mix numbers and text, so every column is stored as string
+                table = pa.Table.from_pandas(chunk.astype('string'), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            pq.write_table(pa.table({}), path)
+        return rows
+
+    def read_output(self, output_path: str) -> bytes:
+        """
+        Read a saved output file and mark it as recently used
+        
+        Args:
+            output_path: Path returned by save_bulk_sheet
+            
+        Returns:
+            File content
+        """
+        self.output_store.touch(output_path)
+        with open(output_path, 'rb') as f:
+            return f.read()
+
+    def _save_excel(self, df: pd.DataFrame, output_dir: str, job_id: str) -> str:
         """
         Save DataFrame to Excel file
         
         Args:
             df: DataFrame to save
             output_dir: Output directory
-            timestamp: Timestamp for filename
+            job_id: Job identifier for filename
             
         Returns:
             Path to the saved file
         """
-        filename = f"amazon_bulk_upload_{timestamp}.xlsx"
+        filename = f"amazon_bulk_upload_{job_id}.xlsx"
         output_path = os.path.join(output_dir, filename)
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Sponsored Products', index=False)
-            
-            # Get the worksheet
-            worksheet = writer.sheets['Sponsored Products']
-            
-            # Auto-adjust columns' width
-            for column in worksheet.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                try:
-                    max_length = max(
-                        len(str(cell.value)) for cell in column if cell.value
-                    )
-                except ValueError:
-                    max_length = 0
-                adjusted_width = (max_length + 2)
-                worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+        # Passed as one chunk, so the columns are sized from every row
+        with atomic_path(output_path) as temp_path:
+            write_xlsx([df], temp_path, EXCEL_SHEET_NAME)
         
         logger.info(f"Saved Excel file: {output_path}")
         return output_path
 
-    def _save_csv(self, df: pd.DataFrame, output_dir: str, timestamp: str) -> str:
+    def _save_csv(self, df: pd.DataFrame, output_dir: str, job_id: str) -> str:
         """
         Save DataFrame to CSV file
         
         Args:
             df: DataFrame to save
             output_dir: Output directory
-            timestamp: Timestamp for filename
+            job_id: Job identifier for filename
             
         Returns:
             Path to the saved file
         """
-        filename = f"amazon_bulk_upload_{timestamp}.csv"
+        filename = f"amazon_bulk_upload_{job_id}.csv"
         output_path = os.path.join(output_dir, filename)
         
-        df.to_csv(output_path, index=False)
+        with atomic_path(output_path) as temp_path:
+            df.to_csv(temp_path, index=False)
         logger.info(f"Saved CSV file: {output_path}")
         return output_path
 
+    def load_resource(self, path: str, kind: str, parse: Callable[[str], T]) -> T:
+        """
+        Load a resource file through the resource cache
+        
+        Unchanged files are served from memory; a file whose modification time or size
+        changed is parsed again.
+        
+        Args:
+            path: File path
+            kind: Name of the parse, e.g. 'text'
+            parse: Function reading the file at path
+            
+        Returns:
+            The parsed file, shared with other callers (do not modify it)
+        """
+        return self.resource_cache.get(path, kind, parse)
+
     def get_template_path(self, template_type: str) -> str:
         """
         Get path to template file
@@ -160,8 +496,8 @@ class FileHandler:
         """
         template_path = self.get_template_path(template_type)
         try:
-            with open(template_path, 'r') as f:
-                return f.read()
+            # Reruns of the web app reload templates constantly, so they are served from the cache
+            return self.load_resource(template_path, 'text', read_text)
         except FileNotFoundError:
             logger.warning(f"Template file not found: {template_path}")
             return ""
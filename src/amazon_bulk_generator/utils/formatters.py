@@ -1,8 +1,25 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple
+from dataclasses import dataclass, field
 import re
+import unicodedata
 from datetime import datetime
 import pandas as pd
 
+@dataclass
+class DeduplicationStats:
+    """Statistics from a normalization and de-duplication pass"""
+    total: int  # Items received
+    unique: int  # Items kept after de-duplication
+    empty: int = 0  # Items dropped because nothing was left after normalization
+    rows: List[int] = field(default_factory=list)  # Zero-based input row of each kept item
+    empty_rows: List[int] = field(default_factory=list)  # Input rows dropped as empty
+    merged_rows: List[int] = field(default_factory=list)  # Input rows merged into an earlier item
+
+    @property
+    def merged(self) -> int:
+        """Number of items merged into an earlier equivalent item"""
+        return self.total - self.unique - self.empty
+
 class TextFormatter:
     """Class to handle text formatting operations"""
     
@@ -23,6 +40,55 @@ class TextFormatter:
         # Clean each item and filter out empty strings
         return [item.strip() for item in items if item.strip()]
 
+    @staticmethod
+    def normalize_item(item: str, case_fold: bool = False) -> str:
+        """
+        Normalize a keyword or SKU for comparison
+        
+        Args:
+            item: Raw item
+            case_fold: Whether to fold case (for case-insensitive values like keywords)
+            
+        Returns:
+            Item with Unicode (NFKC) normalization and collapsed whitespace
+        """
+        item = ' '.join(unicodedata.normalize('NFKC', item).split())
+        return item.casefold() if case_fold else item
+
+    @staticmethod
+    def deduplicate(items: Iterable[str], case_fold: bool = False) -> Tuple[List[str], DeduplicationStats]:
+        """
+        Normalize items and drop duplicates, keeping the first occurrence
+        
+        Args:
+            items: Raw items
+            case_fold: Whether items differing only in case are duplicates
+            
+        Returns:
+            Tuple of (normalized unique items in input order, de-duplication statistics).
+            The statistics record the input row of every kept, empty and merged item, so
+            validation results on the unique items can be traced back to the input.
+        """
+        unique = {}
+        stats = DeduplicationStats(total=0, unique=0)
+        for row, item in enumerate(items):
+            stats.total += 1
+            normalized = TextFormatter.normalize_item(item)
+            if not normalized:
+                stats.empty_rows.append(row)
+                continue
+            key = normalized.casefold() if case_fold else normalized
+            # The first spelling seen for each key is kept
+            if key in unique:
+                stats.merged_rows.append(row)
+                continue
+            unique[key] = normalized
+            stats.rows.append(row)
+        
+        stats.unique = len(unique)
+        stats.empty = len(stats.empty_rows)
+        return list(unique.values()), stats
+
     @staticmethod
     def format_campaign_name(prefix: str, identifier: str, match_type: str) -> str:
         """
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Optional, Sequence, Tuple
+
+from .lru import BoundedLRU
+
+logger = logging.getLogger(__name__)
+
+# Limits (overridable through environment variables; 0 disables a limit)
+DEFAULT_INPUT_STORE_MAX_MB = 512  # Total memory held by stored input lists
+DEFAULT_INPUT_STORE_IDLE_MINUTES = 120  # Lists unused for this long are evicted
+DIGEST_BATCH_ITEMS = 10_000  # Items joined per hash update in input_digest
+
+@dataclass(frozen=True)
+class InputRef:
+    """Reference to an input list in the InputStore, small enough to keep per session"""
+    digest: str
+    count: int
+    nbytes: int
+
+    def __str__(self) -> str:
+        return f"{self.count} items, {self.nbytes / 1024:.0f} KB, sha256 {self.digest[:12]}"
+
+class _Entry:
+    __slots__ = ('items', 'nbytes', 'last_access')
+
+    def __init__(self, items: Tuple[str, ...], nbytes: int, last_access: float):
+        self.items = items
+        self.nbytes = nbytes
+        self.last_access = last_access
+
+def input_digest(items: Iterable[str]) -> str:
+    """Content hash of an input list (order-sensitive): SHA-256 of each item followed by a NUL"""
+    digest = hashlib.sha256()
+    items = iter(items)
+    # Joining batches of items keeps the per-item work in C
+    while True:
+        batch = list(islice(items, DIGEST_BATCH_ITEMS))
+        if not batch:
+            return digest.hexdigest()
+        batch.append('')
+        digest.update('\0'.join(batch).encode('utf-8', 'surrogatepass'))
+
+def _sizeof(items: Tuple[str, ...]) -> int:
+    return sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+
+class InputStore:
+    """Process-wide, content-addressed store for keyword/SKU/ASIN input lists
+
+    Identical lists uploaded by different sessions are stored once; sessions keep only
+    an InputRef. Lists are evicted when idle for too long or, least recently used
+    first, when the store exceeds its memory limit. A store is safe to use from
+    multiple threads; use InputStore.shared() to get the process-wide instance.
+    """
+
+    _shared: Optional['InputStore'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: Optional[int] = None, idle_seconds: Optional[float] = None):
+        """
+        Initialize InputStore
+
+        Args:
+            max_bytes: Memory limit. Defaults to INPUT_STORE_MAX_MB; 0 disables it.
+            idle_seconds: Idle eviction age. Defaults to INPUT_STORE_IDLE_MINUTES; 0 disables it.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('INPUT_STORE_MAX_MB', DEFAULT_INPUT_STORE_MAX_MB)) * 1024 * 1024)
+        if idle_seconds is None:
+            idle_seconds = float(os.environ.get('INPUT_STORE_IDLE_MINUTES', DEFAULT_INPUT_STORE_IDLE_MINUTES)) * 60
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._entries: BoundedLRU[str, _Entry] = BoundedLRU(max_size=max_bytes)
+
+    @classmethod
+    def shared(cls) -> 'InputStore':
+        """Get the process-wide store, creating it on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._entries.size
+
+    def put(self, items: Sequence[str]) -> InputRef:
+        """
+        Store an input list, reusing an identical list if one is already stored
+
+        Returns:
+            Reference to keep in the session instead of the list
+        """
+        digest = input_digest(items)
+        now = time.time()
+        # The lock makes concurrent puts of one list store it once
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                stored = tuple(items)
+                entry = _Entry(stored, _sizeof(stored), now)
+                self._entries.put(digest, entry, entry.nbytes)
+            else:
+                entry.last_access = now
+            self._evict(now, protect=digest)
+            return InputRef(digest, len(entry.items), entry.nbytes)
+
+    def get(self, ref: InputRef) -> Optional[Tuple[str, ...]]:
+        """Get a stored list, or None if it was evicted"""
+        entry = self._entries.get(ref.digest)
+        if entry is None:
+            return None
+        entry.last_access = time.time()
+        return entry.items
+
+    def _evict(self, now: float, protect: Optional[str] = None) -> None:
+        """Drop idle lists, then least recently used ones while over the memory limit"""
+        idle = None
+        if self.idle_seconds:
+            idle = lambda _, entry: now - entry.last_access > self.idle_seconds
+        evicted = self._entries.evict(protect=[protect] if protect else (), expired=idle)
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} input lists; {len(self._entries)} held, {self.total_bytes / 1024 / 1024:.1f} MB")
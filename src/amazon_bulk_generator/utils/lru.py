@@ -0,0 +1,124 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+def approximate_size(value: Any) -> int:
+    """Approximate memory held by a value, following containers and DataFrames
+
+    Other objects reporting their own size through an integer `nbytes` attribute are taken at their word.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+class BoundedLRU(Generic[K, V]):
+    """Thread-safe mapping that evicts least recently used entries beyond its limits
+
+    Each entry has a size (bytes, or 1 to count entries). put() and get() make an entry
+    the most recently used. evict() drops expired entries, then least recently used ones
+    while the total size or the number of entries is over its limit, and returns what it
+    dropped, so owners can release what the entries stand for (e.g. delete files).
+    """
+
+    def __init__(self, max_size: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Initialize BoundedLRU
+
+        Args:
+            max_size: Limit on the total size of the entries; None or 0 disables it
+            max_entries: Limit on the number of entries; None or 0 disables it
+        """
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.size = 0
+        self._lock = threading.Lock()
+        # Ordered from least to most recently used
+        self._entries: 'OrderedDict[K, Tuple[V, float]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Get an entry's value and mark it as most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: K, value: V, size: float = 1) -> None:
+        """Add or replace an entry as the most recently used; call evict() to enforce the limits"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, size)
+            self.size += size
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove an entry and return its value"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.size -= entry[1]
+            return entry[0]
+
+    def items(self) -> List[Tuple[K, V]]:
+        """Entries from least to most recently used"""
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def evict(self, protect: Iterable[K] = (),
+              expired: Optional[Callable[[K, V], bool]] = None) -> List[Tuple[K, V]]:
+        """
+        Drop expired entries, then least recently used ones until within the limits
+
+        Args:
+            protect: Keys that must not be evicted (e.g. the entry just added)
+            expired: Predicate marking entries to drop regardless of the limits
+
+        Returns:
+            The evicted (key, value) pairs
+        """
+        protected = set(protect)
+        evicted = []
+        with self._lock:
+            if expired is not None:
+                for key, (value, _) in list(self._entries.items()):
+                    if key not in protected and expired(key, value):
+                        evicted.append(self._remove(key))
+            for key in list(self._entries):
+                if not self._over_limits():
+                    break
+                if key not in protected:
+                    evicted.append(self._remove(key))
+        return evicted
+
+    def _over_limits(self) -> bool:
+        return bool((self.max_size and self.size > self.max_size)
+                    or (self.max_entries and len(self._entries) > self.max_entries))
+
+    def _remove(self, key: K) -> Tuple[K, V]:
+        value, size = self._entries.pop(key)
+        self.size -= size
+        return key, value
@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .lru import BoundedLRU
+
+logger = logging.getLogger(__name__)
+
+# Retention defaults (overridable through environment variables)
+DEFAULT_MAX_OUTPUT_MB = 500  # Total size of stored artifacts
+DEFAULT_MAX_OUTPUT_AGE_HOURS = 24  # Artifacts older than this are deleted
+DEFAULT_MAX_OUTPUT_FILES = 200  # Number of stored artifacts
+INDEX_FILENAME = '.index.json'
+
+@dataclass
+class RetentionPolicy:
+    """Limits for the output store; None disables a limit"""
+    max_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_MB * 1024 * 1024
+    max_age_seconds: Optional[float] = DEFAULT_MAX_OUTPUT_AGE_HOURS * 3600
+    max_files: Optional[int] = DEFAULT_MAX_OUTPUT_FILES
+
+    @classmethod
+    def from_env(cls, prefix: str = 'OUTPUT', max_mb: float = DEFAULT_MAX_OUTPUT_MB,
+                 max_age_hours: float = DEFAULT_MAX_OUTPUT_AGE_HOURS,
+                 max_files: int = DEFAULT_MAX_OUTPUT_FILES) -> 'RetentionPolicy':
+        """
+        Build a policy from <prefix>_MAX_MB, <prefix>_MAX_AGE_HOURS and <prefix>_MAX_FILES
+
+        A value of 0 disables the corresponding limit. The other arguments are the
+        defaults used for unset variables (those of the output directory by default).
+        """
+        def read(name: str, default: float) -> Optional[float]:
+            value = float(os.environ.get(f'{prefix}_{name}', default))
+            return value if value > 0 else None
+
+        max_mb = read('MAX_MB', max_mb)
+        max_age_hours = read('MAX_AGE_HOURS', max_age_hours)
+        max_files = read('MAX_FILES', max_files)
+        return cls(
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+            max_age_seconds=max_age_hours * 3600 if max_age_hours else None,
+            max_files=int(max_files) if max_files else None
+        )
+
+@dataclass
+class Artifact:
+    """An output file tracked by the store"""
+    name: str
+    size: int
+    created: float
+    last_access: float
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Yield a temporary path next to `path` and move it into place once writing succeeds
+
+    Readers never observe a partially written file: the rename is atomic on the
+    same filesystem, and the temporary file is removed if writing fails.
+    """
+    directory, name = os.path.split(path)
+    stem, extension = os.path.splitext(name)
+    # Keep the extension so writers that dispatch on it (e.g. pandas ExcelWriter) still work
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{stem}.', suffix=f'.tmp{extension}')
+    os.close(fd)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+class OutputStore:
+    """Size- and age-bounded store for generated output files with LRU eviction
+    
+    A store is safe to use from multiple threads. Use OutputStore.shared() so that all
+    sessions writing to the same directory share one index.
+    """
+    
+    _shared: Dict[str, 'OutputStore'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str, policy: Optional[RetentionPolicy] = None):
+        """
+        Initialize OutputStore
+
+        Args:
+            directory: Directory holding the artifacts
+            policy: Retention limits. Defaults to RetentionPolicy.from_env().
+        """
+        self.directory = directory
+        self.policy = policy or RetentionPolicy.from_env()
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._artifacts = self._load_index()
+
+    @classmethod
+    def shared(cls, directory: str, policy: Optional[RetentionPolicy] = None) -> 'OutputStore':
+        """
+        Get the process-wide store for a directory, creating it on first use
+
+        Args:
+            directory: Directory holding the artifacts
+            policy: Retention limits, used only when the store is created
+        """
+        key = os.path.realpath(directory)
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None:
+                store = cls._shared[key] = cls(directory, policy)
+            return store
+
+    def _load_index(self) -> BoundedLRU[str, Artifact]:
+        """Load the artifact index, rebuilding it from the directory if missing or corrupt"""
+        try:
+            with open(self.index_path, 'r') as f:
+                entries = [Artifact(**entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            entries = self._scan_directory()
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Rebuilding corrupt output index {self.index_path}: {str(e)}")
+            entries = self._scan_directory()
+
+        artifacts = BoundedLRU(max_size=self.policy.max_bytes, max_entries=self.policy.max_files)
+        for artifact in sorted(entries, key=lambda artifact: artifact.last_access):
+            artifacts.put(artifact.name, artifact, artifact.size)
+        return artifacts
+
+    def _scan_directory(self) -> List[Artifact]:
+        """Build index entries for files already present in the directory"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith('.'):
+                stat = entry.stat()
+                entries.append(Artifact(entry.name, stat.st_size, stat.st_mtime, stat.st_mtime))
+        return entries
+
+    def _save_index(self) -> None:
+        """Persist the index atomically"""
+        with atomic_path(self.index_path) as temp_path:
+            with open(temp_path, 'w') as f:
+                json.dump([asdict(artifact) for artifact in self.artifacts()], f)
+
+    def artifacts(self) -> List[Artifact]:
+        """List tracked artifacts from least to most recently used"""
+        return [artifact for _, artifact in self._artifacts.items()]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._artifacts.size
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def add(self, path: str) -> Artifact:
+        """
+        Register a file written into the store directory and enforce the limits
+
+        Args:
+            path: Path of the new artifact
+
+        Returns:
+            The registered artifact
+        """
+        name = os.path.basename(path)
+        now = time.time()
+        artifact = Artifact(name, os.path.getsize(path), now, now)
+        with self._lock:
+            self._artifacts.put(name, artifact, artifact.size)
+            self.enforce(protect=[name])
+        return artifact
+
+    def touch(self, path: str) -> None:
+        """Mark an artifact as recently used"""
+        with self._lock:
+            artifact = self._artifacts.get(os.path.basename(path))
+            if artifact:
+                artifact.last_access = time.time()
+                self._save_index()
+
+    def remove(self, path: str) -> None:
+        """Delete an artifact and drop it from the index"""
+        name = os.path.basename(path)
+        with self._lock:
+            self._artifacts.pop(name)
+            self._delete_file(name)
+            self._save_index()
+
+    def enforce(self, protect: Iterable[str] = (), now: Optional[float] = None) -> List[str]:
+        """
+        Delete expired artifacts, then evict least recently used ones until within limits
+
+        Args:
+            protect: Artifact names that must not be evicted (e.g. the file just written)
+            now: Current time, for testing
+
+        Returns:
+            Names of the evicted artifacts
+        """
+        with self._lock:
+            now = now or time.time()
+            max_age = self.policy.max_age_seconds
+            expired = None
+            if max_age is not None:
+                expired = lambda _, artifact: now - artifact.created > max_age
+            evicted = [name for name, _ in self._artifacts.evict(protect=protect, expired=expired)]
+
+            for name in evicted:
+                self._delete_file(name)
+            if evicted:
+                logger.info(f"Evicted {len(evicted)} output files from {self.directory}")
+            self._save_index()
+            return evicted
+
+    def _delete_file(self, name: str) -> None:
+        try:
+            os.remove(self.path_for(name))
+        except FileNotFoundError:
+            pass
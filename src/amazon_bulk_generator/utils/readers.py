@@ -0,0 +1,304 @@
+import codecs
+import gzip
+import io
+import os
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# Input formats
+SUPPORTED_INPUT_EXTENSIONS = ('.csv', '.txt', '.xlsx', '.gz', '.zip')
+UPLOAD_FILE_TYPES = ['csv', 'txt', 'xlsx', 'gz', 'zip']  # For Streamlit file uploaders
+CSV_CHUNK_SIZE = 100_000  # Rows per chunk when streaming CSV input
+ENCODING_SAMPLE_SIZE = 64 * 1024  # Bytes inspected when detecting encoding
+
+# Byte order marks checked before falling back to trial decoding
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Detect the text encoding of a file from a sample of its first bytes
+
+    Args:
+        sample: Leading bytes of the file
+
+    Returns:
+        Encoding name usable by pandas and open()
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+
+    # A full-size sample may end in the middle of a multi-byte character, which is tolerated
+    try:
+        final = len(sample) < ENCODING_SAMPLE_SIZE
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=final)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def _source_name(source: Source) -> str:
+    """Get the file name of a path or uploaded file object"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, 'name', '') or ''
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+@contextmanager
+def _open_input(source: Source) -> Iterator[Tuple[Union[str, BinaryIO], str]]:
+    """
+    Open an input source, transparently unwrapping .gz and .zip containers
+
+    Yields:
+        Tuple of (path or binary stream, name of the inner file)
+    """
+    name = _source_name(source)
+    extension = _extension(name)
+
+    if extension == '.gz':
+        with gzip.open(source, 'rb') as stream:
+            yield stream, name[:-len('.gz')]
+    elif extension == '.zip':
+        with zipfile.ZipFile(source) as archive:
+            members = [
+                member for member in archive.infolist()
+                if not member.is_dir() and _extension(member.filename) in SUPPORTED_INPUT_EXTENSIONS
+            ]
+            if not members:
+                raise ValueError(f"No supported input file found in archive: {name}")
+            with archive.open(members[0]) as stream:
+                yield stream, members[0].filename
+    else:
+        if not isinstance(source, (str, os.PathLike)) and hasattr(source, 'seek'):
+            source.seek(0)
+        yield source, name
+
+def _peek(stream: BinaryIO, size: int) -> Tuple[bytes, BinaryIO]:
+    """Read a sample from a stream and return a stream positioned back at the start"""
+    if stream.seekable():
+        position = stream.tell()
+        sample = stream.read(size)
+        stream.seek(position)
+        return sample, stream
+
+    sample = stream.read(size)
+    return sample, io.BufferedReader(_PrefixedStream(sample, stream))
+
+class _PrefixedStream(io.RawIOBase):
+    """Non-seekable stream that replays an already consumed prefix"""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def _iter_csv_column(handle: Union[str, BinaryIO], column: int, chunksize: int) -> Iterator[List[str]]:
+    """Stream one column of a CSV file in chunks"""
+    if isinstance(handle, (str, os.PathLike)):
+        with open(handle, 'rb') as f:
+            encoding = detect_encoding(f.read(ENCODING_SAMPLE_SIZE))
+        # Chunked reads keep RSS flat; memory-mapping would fault the whole file into RSS
+        reader = pd.read_csv(
+            handle, usecols=[column], dtype=str, encoding=encoding,
+            chunksize=chunksize, skip_blank_lines=True
+        )
+    else:
+        sample, handle = _peek(handle, ENCODING_SAMPLE_SIZE)
+        reader = pd.read_csv(
+            handle, usecols=[column], dtype=str, encoding=detect_encoding(sample),
+            chunksize=chunksize, skip_blank_lines=True
+        )
+
+    with reader:
+        for chunk in reader:
+            values = chunk.iloc[:, 0].dropna()
+            if not values.empty:
+                yield values.tolist()
+
+def _iter_xlsx_column(handle: Union[str, BinaryIO], column: int, chunksize: int) -> Iterator[List[str]]:
+    """Stream one column of the first worksheet using openpyxl's read-only parser"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(handle, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        rows = worksheet.iter_rows(min_row=2, min_col=column + 1, max_col=column + 1, values_only=True)
+        chunk = []
+        for (value,) in rows:
+            if value is None:
+                continue
+            chunk.append(str(value))
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+def iter_column_values(source: Source, column: int = 0, chunksize: int = CSV_CHUNK_SIZE) -> Iterator[List[str]]:
+    """
+    Stream the values of one column from a CSV, XLSX, .gz or .zip input in chunks
+
+    The first row is treated as a header. Only the requested column is parsed,
+    so memory stays flat regardless of file size.
+
+    Args:
+        source: File path or binary file object (e.g. a Streamlit upload)
+        column: Zero-based column index to read
+        chunksize: Number of rows per yielded chunk
+
+    Yields:
+        Lists of non-empty string values
+    """
+    with _open_input(source) as (handle, name):
+        if _extension(name) == '.xlsx':
+            yield from _iter_xlsx_column(handle, column, chunksize)
+        else:
+            yield from _iter_csv_column(handle, column, chunksize)
+
+# Bulk export layout
+BULK_EXPORT_CHUNK_SIZE = 50_000  # Rows per chunk when streaming bulk exports
+INFORMATIONAL_SUFFIX = ' (Informational only)'  # Suffix Amazon adds to read-only export columns
+BULK_EXPORT_SHEET_NAME = 'Sponsored Products Campaigns'
+
+def normalize_bulk_header(header) -> str:
+    """Map an export column header to the bulk upload header name"""
+    header = str(header or '').strip()
+    if header.endswith(INFORMATIONAL_SUFFIX):
+        header = header[:-len(INFORMATIONAL_SUFFIX)]
+    return header
+
+def _bulk_export_worksheet(workbook):
+    """Find the Sponsored Products worksheet of a bulk export workbook"""
+    if BULK_EXPORT_SHEET_NAME in workbook.sheetnames:
+        return workbook[BULK_EXPORT_SHEET_NAME]
+    for worksheet in workbook.worksheets:
+        first_row = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+        if 'Entity' in {normalize_bulk_header(value) for value in first_row}:
+            return worksheet
+    return workbook.worksheets[0]
+
+def _iter_xlsx_table_chunks(handle, columns: List[str], chunksize: int, normalize) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(handle, read_only=True, data_only=True)
+    try:
+        rows = _bulk_export_worksheet(workbook).iter_rows(values_only=True)
+        headers = [normalize(value) for value in next(rows, ())]
+        positions = {}
+        for position, header in enumerate(headers):
+            if header in columns:
+                positions.setdefault(header, position)
+        wanted = [(column, positions.get(column)) for column in columns]
+
+        def build(chunk):
+            data = {
+                column: [
+                    '' if position is None or position >= len(row) or row[position] is None else str(row[position])
+                    for row in chunk
+                ]
+                for column, position in wanted
+            }
+            return pd.DataFrame(data, columns=columns)
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunksize:
+                yield build(chunk)
+                chunk = []
+        if chunk:
+            yield build(chunk)
+    finally:
+        workbook.close()
+
+def _iter_csv_table_chunks(handle, columns: List[str], chunksize: int, normalize) -> Iterator[pd.DataFrame]:
+    if isinstance(handle, (str, os.PathLike)):
+        with open(handle, 'rb') as f:
+            encoding = detect_encoding(f.read(ENCODING_SAMPLE_SIZE))
+    else:
+        sample, handle = _peek(handle, ENCODING_SAMPLE_SIZE)
+        encoding = detect_encoding(sample)
+
+    reader = pd.read_csv(
+        handle, dtype=str, keep_default_na=False, encoding=encoding, chunksize=chunksize,
+        usecols=lambda header: normalize(header) in columns
+    )
+    with reader:
+        for chunk in reader:
+            chunk.columns = [normalize(header) for header in chunk.columns]
+            chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+            yield chunk.reindex(columns=columns, fill_value='')
+
+def iter_table_chunks(source: Source, columns: List[str], chunksize: int = BULK_EXPORT_CHUNK_SIZE,
+                      aliases: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream selected columns of a tabular file (XLSX, CSV, .gz or .zip) in chunks
+
+    Headers are matched after dropping Amazon's " (Informational only)" suffix and
+    applying `aliases`. Columns missing from the file are returned as empty strings.
+
+    Args:
+        source: File path or binary file object
+        columns: Headers to read
+        chunksize: Number of rows per chunk
+        aliases: Optional mapping of alternative header names to names in `columns`
+
+    Yields:
+        DataFrames with exactly the requested columns, all values as strings
+    """
+    aliases = aliases or {}
+
+    def normalize(header) -> str:
+        header = normalize_bulk_header(header)
+        return aliases.get(header, header)
+
+    with _open_input(source) as (handle, name):
+        if _extension(name) == '.xlsx':
+            yield from _iter_xlsx_table_chunks(handle, columns, chunksize, normalize)
+        else:
+            yield from _iter_csv_table_chunks(handle, columns, chunksize, normalize)
+
+def iter_bulk_export_chunks(source: Source, columns: List[str],
+                            chunksize: int = BULK_EXPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream selected columns of an Amazon bulk export (XLSX, CSV, .gz or .zip) in chunks
+
+    Args:
+        source: File path or binary file object
+        columns: Bulk sheet headers to read (e.g. 'Entity', 'Campaign ID')
+        chunksize: Number of rows per chunk
+
+    Yields:
+        DataFrames with exactly the requested columns, all values as strings
+    """
+    return iter_table_chunks(source, columns, chunksize)
@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from typing import Callable, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+from .lru import BoundedLRU, approximate_size
+
+logger = logging.getLogger(__name__)
+
+# Memory limit default (overridable through RESOURCE_CACHE_MAX_MB; 0 disables caching)
+DEFAULT_RESOURCE_CACHE_MAX_MB = 64
+
+T = TypeVar('T')
+
+class _Entry(NamedTuple):
+    signature: Tuple[int, int]
+    value: object
+
+class ResourceCache:
+    """Process-wide cache of objects parsed from files, invalidated when a file changes
+
+    Each entry holds what a parse function made of a file (text, a DataFrame, a dict of
+    bids...) together with the file's modification time and size. A lookup stats the
+    file and serves the entry only if both are unchanged; otherwise the file is parsed
+    again, so edited files are picked up without restarting. Entries are evicted least
+    recently used first once the cache exceeds its memory limit. A cache is safe to use
+    from multiple threads; use ResourceCache.shared() to get the process-wide instance.
+
+    Cached values are shared by every caller: treat them as read-only.
+    """
+
+    _shared: Optional['ResourceCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize ResourceCache
+
+        Args:
+            max_bytes: Memory limit. Defaults to RESOURCE_CACHE_MAX_MB; 0 disables caching.
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('RESOURCE_CACHE_MAX_MB', DEFAULT_RESOURCE_CACHE_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: BoundedLRU[Hashable, _Entry] = BoundedLRU(max_size=max_bytes)
+
+    @classmethod
+    def shared(cls) -> 'ResourceCache':
+        """Get the process-wide cache, creating it on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._entries.size
+
+    def get(self, path: str, kind: str, parse: Callable[[str], T]) -> T:
+        """
+        Get a file parsed by `parse`, parsing it only if it is not cached or has changed
+
+        Args:
+            path: File path
+            kind: Name of the parse, so one file can be cached parsed in several ways
+            parse: Function reading the file at path
+
+        Raises:
+            OSError: If the file does not exist or cannot be read
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (kind, path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            self.hits += 1
+            return entry.value
+
+        # If the file changes while it is parsed, the next lookup sees a new signature
+        value = parse(path)
+        nbytes = approximate_size(value)
+        self.misses += 1
+        if nbytes <= self.max_bytes:
+            self._entries.put(key, _Entry(signature, value), nbytes)
+            evicted = self._entries.evict(protect=[key])
+            if evicted:
+                logger.info(f"Evicted {len(evicted)} cached resources; {len(self._entries)} held, "
+                            f"{self.total_bytes / 1024 / 1024:.1f} MB")
+        else:
+            self._entries.pop(key)
+        return value
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop the entries of one file, or of every file"""
+        for key, _ in self._entries.items():
+            if path is None or key[1] == os.path.abspath(path):
+                self._entries.pop(key)
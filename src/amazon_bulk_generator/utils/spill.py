@@ -0,0 +1,160 @@
+import logging
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Memory budget default (overridable through GENERATION_MEMORY_BUDGET_MB; 0 disables spilling)
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+SPILL_FORMAT_PARQUET = 'parquet'
+SPILL_FORMAT_CSV = 'csv'
+
+def memory_budget_from_env() -> int:
+    """Read the generation memory budget in bytes; 0 means spilling is disabled"""
+    budget_mb = float(os.environ.get('GENERATION_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB))
+    return int(budget_mb * 1024 * 1024) if budget_mb > 0 else 0
+
+@lru_cache(maxsize=None)
+def default_spill_format() -> str:
+    """Parquet when pyarrow is installed, CSV otherwise (logged once per process)"""
+    try:
+        import pyarrow  # noqa: F401
+        return SPILL_FORMAT_PARQUET
+    except ImportError:
+        logger.warning("pyarrow is not installed; spill and checkpoint parts are written as CSV")
+        return SPILL_FORMAT_CSV
+
+def write_part(part: pd.DataFrame, path: str, spill_format: str) -> None:
+    """Write a DataFrame part in the spill format"""
+    if spill_format == SPILL_FORMAT_PARQUET:
+        # Parts are only read back by read_part, so all values are stored as strings to keep one schema
+        part.astype('string').to_parquet(path, index=False)
+    else:
+        part.to_csv(path, index=False)
+
+def read_part(path: str, dtypes: pd.Series, spill_format: str) -> pd.DataFrame:
+    """Read a part written by write_part back with the dtypes it was written with"""
+    if spill_format == SPILL_FORMAT_PARQUET:
+        part = pd.read_parquet(path)
+    else:
+        part = pd.read_csv(path, dtype=str, keep_default_na=False).replace('', None)
+    for column, dtype in dtypes.items():
+        if dtype == object:
+            part[column] = part[column].astype(object).where(part[column].notna(), None)
+        else:
+            part[column] = part[column].astype(dtype)
+    return part
+
+class SpillBuffer:
+    """Ordered buffer of DataFrame chunks that spills to temporary files beyond a memory budget
+
+    Chunks are kept in memory until their combined size exceeds the budget; the buffered
+    chunks are then written to a temporary columnar (Parquet) file and released. Reading
+    back yields the spilled parts followed by the in-memory chunks, so order is preserved
+    and at most one part is held in memory at a time.
+
+    Use as a context manager so spill files are removed when the job is done.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, directory: Optional[str] = None,
+                 spill_format: Optional[str] = None):
+        """
+        Initialize SpillBuffer
+
+        Args:
+            budget_bytes: Memory budget for buffered chunks. Defaults to
+                memory_budget_from_env(); 0 keeps everything in memory.
+            directory: Parent directory for spill files. Defaults to the system temp directory.
+            spill_format: 'parquet' or 'csv'. Defaults to Parquet if pyarrow is available.
+        """
+        self.budget_bytes = memory_budget_from_env() if budget_bytes is None else budget_bytes
+        self.directory = directory
+        self.spill_format = spill_format or default_spill_format()
+        self.rows = 0
+        self.memory_bytes = 0
+        self._chunks: List[pd.DataFrame] = []
+        self._parts: List[Tuple[str, pd.Series]] = []  # (path, dtypes) per spilled part
+        self._columns: Optional[List[str]] = None
+        self._spill_dir: Optional[str] = None
+
+    def __enter__(self) -> 'SpillBuffer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def spilled(self) -> bool:
+        return bool(self._parts)
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        """Add a chunk, spilling buffered chunks to disk if the budget is exceeded"""
+        if chunk.empty:
+            return
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+        self._chunks.append(chunk)
+        self.rows += len(chunk)
+        if self.budget_bytes:
+            self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+            if self.memory_bytes > self.budget_bytes:
+                self._spill()
+
+    def extend(self, chunks: Iterable[pd.DataFrame]) -> None:
+        for chunk in chunks:
+            self.append(chunk)
+
+    def _spill(self) -> None:
+        """Write the buffered chunks to a new part file and release them"""
+        if self._spill_dir is None:
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix='spill_', dir=self.directory)
+
+        path = os.path.join(self._spill_dir, f"part_{len(self._parts):05d}.{self.spill_format}")
+        part = pd.concat(self._chunks, ignore_index=True)
+        write_part(part, path, self.spill_format)
+        self._parts.append((path, part.dtypes))
+        logger.info(f"Spilled {len(part)} rows ({self.memory_bytes / 1024 / 1024:.1f} MB) to {path}")
+        self._chunks = []
+        self.memory_bytes = 0
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield all chunks in insertion order; can be called repeatedly"""
+        for path, dtypes in self._parts:
+            yield read_part(path, dtypes, self.spill_format)
+        yield from self._chunks
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Get the first n rows without reading all spilled parts"""
+        frames = []
+        remaining = n
+        for chunk in self.iter_chunks():
+            frames.append(chunk.head(remaining))
+            remaining -= len(frames[-1])
+            if remaining <= 0:
+                break
+        if not frames:
+            return pd.DataFrame(columns=self._columns or [])
+        return pd.concat(frames, ignore_index=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Assemble all chunks into one DataFrame (only sensible when nothing was spilled)"""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame(columns=self._columns or [])
+        return pd.concat(chunks, ignore_index=True)
+
+    def close(self) -> None:
+        """Release buffered chunks and delete spill files"""
+        self._chunks = []
+        self._parts = []
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
@@ -0,0 +1,277 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import fields, is_dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from .input_store import input_digest
+from .metrics import resident_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+# Trace log defaults (JOB_TRACE_LOG overrides the location; an empty value disables tracing)
+DEFAULT_TRACE_FILE = os.path.join('logs', 'jobs.jsonl')
+TRACE_FLUSH_INTERVAL = 1.0  # Seconds between writes of buffered records
+TRACE_QUEUE_SIZE = 10_000  # Records buffered before new ones are dropped
+RSS_SAMPLE_INTERVAL = 0.1  # Seconds between resident memory samples while a job runs
+
+# Trace log rotation defaults (overridable through JOB_TRACE_LOG_MAX_MB, 0 disables rotation,
+# and JOB_TRACE_LOG_BACKUPS)
+DEFAULT_TRACE_MAX_MB = 50
+DEFAULT_TRACE_BACKUPS = 5
+
+def trace_log_path(base_dir: str) -> Optional[str]:
+    """Location of the job trace log for a FileHandler base directory, or None if disabled"""
+    path = os.environ.get('JOB_TRACE_LOG')
+    if path is None:
+        return os.path.join(base_dir, DEFAULT_TRACE_FILE)
+    return path or None
+
+class _RssSampler:
+    """Sample the process's resident memory while any job trace is open
+
+    One daemon thread serves every open trace and stops when none is left. Traces are
+    held weakly, so a trace that is never finished does not keep the thread running.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._traces: 'weakref.WeakSet[JobTrace]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, trace: 'JobTrace') -> None:
+        with self._lock:
+            self._traces.add(trace)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+                self._thread.start()
+
+    def untrack(self, trace: 'JobTrace') -> None:
+        with self._lock:
+            self._traces.discard(trace)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                traces = list(self._traces)
+                if not traces:
+                    self._thread = None
+                    return
+            rss = resident_memory_bytes()
+            for trace in traces:
+                trace.observe_rss(rss)
+            del traces
+            time.sleep(self.interval)
+
+_RSS_SAMPLER = _RssSampler()
+
+class JobTrace:
+    """Structured record of one generation job, written as a single JSON line when it finishes
+
+    The record holds the job ID, input fingerprints and sizes, settings, per-stage
+    durations, memory and the outputs written. Build it from the job's own thread
+    and hand it to a TraceWriter with `finish()`.
+
+    Memory is the process's resident size when the job started and the highest sample
+    taken while it ran. Jobs running at the same time share the process, so their peaks
+    include each other's allocations.
+    """
+
+    def __init__(self, job_id: str, kind: str):
+        self.job_id = job_id
+        self.kind = kind
+        self.started = time.time()
+        self._perf_start = time.perf_counter()
+        self._rss_start = self._rss_peak = resident_memory_bytes()
+        _RSS_SAMPLER.track(self)
+        self.record: Dict[str, Any] = {
+            'job_id': job_id,
+            'kind': kind,
+            'started_at': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'inputs': {},
+            'settings': {},
+            'stages': {},
+            'outputs': [],
+        }
+
+    def set_inputs(self, inputs: Dict[str, Sequence[str]]) -> None:
+        """Record each input list's size and content digest, plus a fingerprint of all of them"""
+        combined = hashlib.sha256()
+        for name, items in sorted(inputs.items()):
+            digest = input_digest(items)
+            self.record['inputs'][name] = {'count': len(items), 'digest': digest}
+            combined.update(f"{name}:{digest}\n".encode('utf-8'))
+        self.record['input_fingerprint'] = combined.hexdigest()
+
+    def set_settings(self, settings: Any) -> None:
+        """Record generation settings (a dataclass or a dict)
+
+        Keyword bids can hold thousands of entries, so only their count and digest are recorded.
+        """
+        if is_dataclass(settings):
+            settings = {f.name: getattr(settings, f.name) for f in fields(settings)}
+        else:
+            settings = dict(settings)
+        keyword_bids = settings.get('keyword_bids')
+        if keyword_bids:
+            settings['keyword_bids'] = {
+                'count': len(keyword_bids),
+                'digest': input_digest([f"{keyword}\t{bid!r}" for keyword, bid in sorted(keyword_bids.items())]),
+            }
+        self.record['settings'] = settings
+
+    def observe_rss(self, rss: float) -> None:
+        """Account a resident memory sample to this job"""
+        if rss > self._rss_peak:
+            self._rss_peak = rss
+
+    def set(self, **fields: Any) -> None:
+        """Record additional top-level fields, e.g. rows=..."""
+        self.record.update(fields)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the duration of the enclosed block to the named stage, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stages = self.record['stages']
+            stages[name] = round(stages.get(name, 0.0) + time.perf_counter() - start, 6)
+
+    def add_output(self, path: str) -> None:
+        """Record an output file with its size"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None
+        self.record['outputs'].append({'path': path, 'bytes': size})
+
+    def finish(self, status: str, error: Optional[str] = None, writer: Optional['TraceWriter'] = None) -> Dict[str, Any]:
+        """Complete the record and queue it on the writer, if any"""
+        _RSS_SAMPLER.untrack(self)
+        self.observe_rss(resident_memory_bytes())
+        self.record.update(
+            status=status,
+            error=error,
+            duration_seconds=round(time.perf_counter() - self._perf_start, 6),
+            rss_start_bytes=self._rss_start,
+            rss_peak_bytes=self._rss_peak,
+        )
+        if writer is not None:
+            writer.write(self.record)
+        return self.record
+
+class TraceWriter:
+    """Append JSON records to a file from a background thread
+
+    write() only puts the record on a bounded queue, so callers never wait for disk.
+    The thread writes whatever has accumulated every TRACE_FLUSH_INTERVAL seconds;
+    records arriving while the queue is full are dropped and counted. Once the file
+    would exceed max_bytes it is rolled over to path.1 (path.1 to path.2 and so on),
+    keeping at most `backups` old files. Use TraceWriter.shared(path) to get one
+    writer per log file in the process.
+    """
+
+    _shared: Dict[str, 'TraceWriter'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str, flush_interval: float = TRACE_FLUSH_INTERVAL, max_queue: int = TRACE_QUEUE_SIZE,
+                 max_bytes: Optional[int] = None, backups: Optional[int] = None):
+        self.path = path
+        self.flush_interval = flush_interval
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('JOB_TRACE_LOG_MAX_MB', DEFAULT_TRACE_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.backups = int(os.environ.get('JOB_TRACE_LOG_BACKUPS', DEFAULT_TRACE_BACKUPS)) if backups is None else backups
+        self.dropped = 0
+        self._queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='trace-writer', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls, path: str) -> 'TraceWriter':
+        """Get the process-wide writer for a log file, creating it on first use"""
+        path = os.path.abspath(path)
+        with cls._shared_lock:
+            writer = cls._shared.get(path)
+            if writer is None:
+                writer = cls._shared[path] = cls(path)
+                # Daemon threads are killed at exit, so flush what is still queued
+                atexit.register(writer.close)
+            return writer
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue a record for writing without blocking"""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Trace queue full, dropped record for job {record.get('job_id')}")
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            # Collect everything that arrives within the flush interval into one write
+            deadline = time.monotonic() + self.flush_interval
+            while record is not None:
+                try:
+                    record = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                batch.append(record)
+
+            records = [r for r in batch if r is not None]
+            if records:
+                self._append(records)
+            if len(records) < len(batch):
+                return
+
+    def _append(self, records) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            lines = ''.join(json.dumps(r, default=str, separators=(',', ':')) + '\n' for r in records)
+            self._rotate_if_full(len(lines.encode('utf-8')))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        except Exception as e:
+            logger.error(f"Error writing job trace to {self.path}: {str(e)}")
+
+    def _rotate_if_full(self, incoming: int) -> None:
+        """Roll the log over if appending `incoming` bytes would exceed max_bytes"""
+        if self.max_bytes <= 0:
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for number in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{number}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self, timeout: Optional[float] = 5) -> None:
+        """Write queued records and stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
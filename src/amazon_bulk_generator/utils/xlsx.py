@@ -0,0 +1,398 @@
+import logging
+import multiprocessing
+import numbers
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import BinaryIO, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import quoteattr
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Rows serialized per worker task; chunks are split into blocks of this size
+XLSX_BLOCK_ROWS = 10_000
+# Rows of XML held at once while a block is serialized, before they are compressed
+XLSX_SLICE_ROWS = 500
+# Sheets are serialized in-process up to this many rows; only larger ones are worth the worker processes
+XLSX_PARALLEL_MIN_ROWS = 20_000
+DEFAULT_XLSX_COMPRESS_LEVEL = 6
+
+# Escapes cell text for XML, dropping the control characters XML 1.0 does not allow
+XML_TEXT_TRANSLATION = {
+    **{code: None for code in range(0x20) if code not in (0x09, 0x0A, 0x0D)},
+    ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;',
+}
+
+# A deflated part: (raw deflate data ending on a byte boundary, CRC-32 and length of the uncompressed data)
+DeflatedPart = Tuple[bytes, int, int]
+
+_FINAL_DEFLATE_BLOCK = b'\x03\x00'  # Empty final block closing concatenated deflate parts
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NAMESPACE = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_RELATIONSHIP_TYPES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+_CONTENT_TYPES = (
+    _XML_DECLARATION +
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    _XML_DECLARATION +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_RELATIONSHIP_TYPES}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = (
+    _XML_DECLARATION +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_RELATIONSHIP_TYPES}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_RELATIONSHIP_TYPES}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+_STYLES = (
+    _XML_DECLARATION +
+    f'<styleSheet xmlns="{_MAIN_NAMESPACE}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+def xlsx_workers_from_env() -> int:
+    """Worker processes serializing XLSX sheets (XLSX_WORKERS, default one per CPU); 1 serializes in-process"""
+    return max(1, int(os.environ.get('XLSX_WORKERS', os.cpu_count() or 1)))
+
+def column_letter(position: int) -> str:
+    """Spreadsheet column letter of a 1-based column position, e.g. 28 -> 'AB'"""
+    letters = ''
+    while position:
+        position, remainder = divmod(position - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def crc32_combine(crc1: int, crc2: int, length2: int) -> int:
+    """CRC-32 of A + B from the CRC-32 of A, the CRC-32 of B and the length of B (as zlib's crc32_combine)"""
+    operators = _crc32_zero_operators()
+    bit = 0
+    while length2:
+        if length2 & 1:
+            crc1 = _gf2_times(operators[bit], crc1)
+        length2 >>= 1
+        bit += 1
+    return crc1 ^ crc2
+
+def _gf2_times(matrix: Sequence[int], vector: int) -> int:
+    result = 0
+    row = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[row]
+        vector >>= 1
+        row += 1
+    return result
+
+def _gf2_square(matrix: Sequence[int]) -> List[int]:
+    return [_gf2_times(matrix, matrix[row]) for row in range(32)]
+
+@lru_cache(maxsize=None)
+def _crc32_zero_operators() -> Tuple[List[int], ...]:
+    """Operators appending 2**k zero bytes to a CRC-32, for k up to 63"""
+    operator = [0xEDB88320] + [1 << row for row in range(31)]  # One zero bit
+    for _ in range(3):
+        operator = _gf2_square(operator)
+    operators = [operator]
+    for _ in range(63):
+        operators.append(_gf2_square(operators[-1]))
+    return tuple(operators)
+
+def deflate_part(data: bytes, compress_level: int = DEFAULT_XLSX_COMPRESS_LEVEL) -> DeflatedPart:
+    """Deflate data into a part that can be concatenated with other parts into one stream"""
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH), zlib.crc32(data), len(data)
+
+def serialize_rows(rows: Iterable[Sequence], first_row: int, letters: Sequence[str],
+                   compress_level: int = DEFAULT_XLSX_COMPRESS_LEVEL) -> DeflatedPart:
+    """
+    Serialize rows into deflated worksheet XML (runs in the worker processes)
+
+    The XML is compressed every XLSX_SLICE_ROWS rows, so only the compressed block
+    and one slice of XML are held at a time.
+
+    Args:
+        rows: Row values, None for empty cells. A list when sent to a worker process.
+        first_row: 1-based sheet row number of the first row
+        letters: Column letter of each value
+        compress_level: Deflate level (1-9)
+    """
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = []
+    crc = length = 0
+    parts = []
+    inline_strings = {}  # Bulk sheets repeat most values, so each string is escaped once per block
+    for number, row in enumerate(rows, start=first_row):
+        if (number - first_row) % XLSX_SLICE_ROWS == 0 and parts:
+            data = ''.join(parts).encode('utf-8')
+            parts.clear()
+            compressed.append(compressor.compress(data))
+            crc = zlib.crc32(data, crc)
+            length += len(data)
+        parts.append(f'<row r="{number}">')
+        for letter, value in zip(letters, row):
+            if value is None:
+                continue
+            if value.__class__ is not str:
+                if isinstance(value, bool):
+                    parts.append(f'<c r="{letter}{number}" t="b"><v>{int(value)}</v></c>')
+                    continue
+                if isinstance(value, numbers.Real) and value == value and abs(value) != float('inf'):
+                    parts.append(f'<c r="{letter}{number}"><v>{value}</v></c>')
+                    continue
+                value = str(value)
+            # Strings are written inline rather than to a shared string table, so blocks are independent
+            inline = inline_strings.get(value)
+            if inline is None:
+                text = value.translate(XML_TEXT_TRANSLATION)
+                space = ' xml:space="preserve"' if text != text.strip() else ''
+                inline = inline_strings[value] = f'<is><t{space}>{text}</t></is>'
+            parts.append(f'<c r="{letter}{number}" t="inlineStr">{inline}</c>')
+        parts.append('</row>')
+    data = ''.join(parts).encode('utf-8')
+    compressed.append(compressor.compress(data))
+    compressed.append(compressor.flush(zlib.Z_SYNC_FLUSH))
+    return b''.join(compressed), zlib.crc32(data, crc), length + len(data)
+
+class _ZipWriter:
+    """Minimal ZIP writer for entries deflated elsewhere, in parts
+
+    zipfile compresses entries itself, so it cannot take the worksheet parts deflated
+    by worker processes. Each entry's local header is rewritten once its CRC and sizes
+    are known, so the output file must be seekable.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._entries: List[Tuple[bytes, int, int, int, int]] = []  # name, CRC, compressed, size, offset
+        now = time.localtime()
+        self._time = (now.tm_hour << 11) | (now.tm_min << 5) | (now.tm_sec // 2)
+        self._date = ((now.tm_year - 1980) << 9) | (now.tm_mon << 5) | now.tm_mday
+
+    def write(self, name: str, data: bytes, compress_level: int) -> None:
+        self.write_parts(name, [deflate_part(data, compress_level)], zip64=False)
+
+    def write_parts(self, name: str, parts: Iterable[DeflatedPart], zip64: bool = True) -> None:
+        """Write an entry from deflated parts; zip64 allows it to exceed 4 GiB"""
+        encoded = name.encode('utf-8')
+        offset = self._f.tell()
+        self._f.write(self._local_header(encoded, 0, 0, 0, zip64))
+        crc = compressed = size = 0
+        for data, part_crc, length in parts:
+            self._f.write(data)
+            crc = crc32_combine(crc, part_crc, length)
+            compressed += len(data)
+            size += length
+        self._f.write(_FINAL_DEFLATE_BLOCK)
+        compressed += len(_FINAL_DEFLATE_BLOCK)
+        if not zip64 and max(compressed, size) >= _ZIP32_LIMIT:
+            raise ValueError(f"{name} exceeds 4 GiB")
+        end = self._f.tell()
+        self._f.seek(offset)
+        self._f.write(self._local_header(encoded, crc, compressed, size, zip64))
+        self._f.seek(end)
+        self._entries.append((encoded, crc, compressed, size, offset))
+
+    def close(self) -> None:
+        """Write the central directory"""
+        directory_offset = self._f.tell()
+        for name, crc, compressed, size, offset in self._entries:
+            extra = b''
+            if size >= _ZIP32_LIMIT:
+                extra += struct.pack('<Q', size)
+            if compressed >= _ZIP32_LIMIT:
+                extra += struct.pack('<Q', compressed)
+            if offset >= _ZIP32_LIMIT:
+                extra += struct.pack('<Q', offset)
+            if extra:
+                extra = struct.pack('<HH', 0x0001, len(extra)) + extra
+            self._f.write(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014B50, 45, 45 if extra else 20, 0x0800, zlib.DEFLATED,
+                self._time, self._date, crc, min(compressed, _ZIP32_LIMIT), min(size, _ZIP32_LIMIT),
+                len(name), len(extra), 0, 0, 0, 0, min(offset, _ZIP32_LIMIT)
+            ) + name + extra)
+        directory_size = self._f.tell() - directory_offset
+        count = len(self._entries)
+        if count > 0xFFFF or max(directory_offset, directory_size) >= _ZIP32_LIMIT:
+            zip64_offset = self._f.tell()
+            self._f.write(struct.pack('<IQHHIIQQQQ', 0x06064B50, 44, 45, 45, 0, 0, count, count,
+                                      directory_size, directory_offset))
+            self._f.write(struct.pack('<IIQI', 0x07064B50, 0, zip64_offset, 1))
+        self._f.write(struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                  min(directory_size, _ZIP32_LIMIT), min(directory_offset, _ZIP32_LIMIT), 0))
+
+    def _local_header(self, name: bytes, crc: int, compressed: int, size: int, zip64: bool) -> bytes:
+        if zip64:
+            extra = struct.pack('<HHQQ', 0x0001, 16, size, compressed)
+            compressed = size = _ZIP32_LIMIT
+        else:
+            extra = b''
+        return struct.pack('<IHHHHHIIIHH', 0x04034B50, 45 if zip64 else 20, 0x0800, zlib.DEFLATED,
+                           self._time, self._date, crc, compressed, size, len(name), len(extra)) + name + extra
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all XLSX writes, started on first use and kept for later ones"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned rather than forked: the app forks from threads (web server, tee writers)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+def _reset_worker_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+def _python_rows(chunk: pd.DataFrame, start: int, stop: int) -> Iterator[tuple]:
+    """Rows start..stop of a chunk as tuples of Python values, None for missing ones
+
+    Converted column by column, XLSX_SLICE_ROWS rows at a time, so consuming the rows
+    one by one holds only one slice of Python values.
+    """
+    columns = [chunk.iloc[:, position].array for position in range(chunk.shape[1])]
+    for slice_start in range(start, stop, XLSX_SLICE_ROWS):
+        slice_stop = min(slice_start + XLSX_SLICE_ROWS, stop)
+        values = []
+        for column in columns:
+            column_values = column[slice_start:slice_stop].to_numpy(dtype=object)
+            column_values[pd.isna(column_values)] = None
+            values.append(column_values)
+        yield from zip(*values)
+
+class _SheetParts:
+    """Deflated parts of a worksheet streamed from DataFrame chunks, in order"""
+
+    def __init__(self, chunks: Iterable[pd.DataFrame], workers: int, compress_level: int):
+        self.rows = 0
+        self._chunks = chunks
+        self._workers = workers
+        self._compress_level = compress_level
+
+    def __iter__(self) -> Iterator[DeflatedPart]:
+        letters: List[str] = []
+        pending: Deque[Future] = deque()
+        pool = None
+        try:
+            for chunk in self._chunks:
+                if not letters:
+                    letters = [column_letter(position) for position in range(1, len(chunk.columns) + 1)]
+                    yield deflate_part(self._prologue(chunk).encode('utf-8'), self._compress_level)
+                    yield serialize_rows([list(chunk.columns)], 1, letters, self._compress_level)
+                for start in range(0, len(chunk), XLSX_BLOCK_ROWS):
+                    stop = min(start + XLSX_BLOCK_ROWS, len(chunk))
+                    first_row = self.rows + 2  # Row 1 is the header
+                    self.rows += stop - start
+                    if pool is None and self._workers > 1 and self.rows > XLSX_PARALLEL_MIN_ROWS:
+                        pool = _worker_pool(self._workers)
+                    if pool is None:
+                        # Serialized as converted, so only one slice of rows is held in Python values
+                        yield serialize_rows(_python_rows(chunk, start, stop), first_row, letters, self._compress_level)
+                        continue
+                    block = list(_python_rows(chunk, start, stop))
+                    pending.append(pool.submit(serialize_rows, block, first_row, letters, self._compress_level))
+                    # Parts are written in order; a bounded backlog keeps every worker busy without hoarding rows
+                    while len(pending) >= 2 * self._workers:
+                        yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except BrokenProcessPool:
+            _reset_worker_pool()
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+        if not letters:
+            yield deflate_part(self._prologue(None).encode('utf-8'), self._compress_level)
+        yield deflate_part(b'</sheetData></worksheet>', self._compress_level)
+
+    @staticmethod
+    def _prologue(chunk: Optional[pd.DataFrame]) -> str:
+        """Worksheet XML up to the first row, sizing the columns from the first chunk"""
+        columns = ''
+        if chunk is not None:
+            widths = []
+            for position, column in enumerate(chunk.columns, start=1):
+                lengths = chunk[column].dropna().astype(str).str.len()
+                max_length = max(len(str(column)), int(lengths.max()) if not lengths.empty else 0)
+                widths.append(f'<col min="{position}" max="{position}" width="{max_length + 2}" customWidth="1"/>')
+            columns = f"<cols>{''.join(widths)}</cols>"
+        return f'{_XML_DECLARATION}<worksheet xmlns="{_MAIN_NAMESPACE}">{columns}<sheetData>'
+
+def write_xlsx(chunks: Iterable[pd.DataFrame], path: str, sheet_name: str = 'Sheet1',
+               workers: Optional[int] = None, compress_level: int = DEFAULT_XLSX_COMPRESS_LEVEL) -> int:
+    """
+    Write DataFrame chunks as a one-sheet XLSX workbook
+
+    Rows are split into blocks that are turned into deflated worksheet XML and written
+    to the workbook in order. Strings are stored inline in their cells, so no block
+    depends on another. Columns are sized from the first chunk. The first
+    XLSX_PARALLEL_MIN_ROWS rows are serialized in this process; with more than one
+    worker, later blocks go to a pool of worker processes, started on first use and
+    reused by later writes. Blocks are pickled to and from the workers, so they only
+    speed up writes on hosts with spare cores. As with any multiprocessing code,
+    scripts calling this with workers need an `if __name__ == "__main__"` guard.
+
+    Args:
+        chunks: DataFrames with identical columns, written in order
+        path: Output path (a new file)
+        sheet_name: Worksheet name
+        workers: Worker processes. Defaults to XLSX_WORKERS; 1 serializes in-process.
+        compress_level: Deflate level (1-9)
+
+    Returns:
+        Number of rows written, excluding the header
+    """
+    workers = xlsx_workers_from_env() if workers is None else max(1, workers)
+    workbook = (
+        _XML_DECLARATION +
+        f'<workbook xmlns="{_MAIN_NAMESPACE}" xmlns:r="{_RELATIONSHIP_TYPES}">'
+        f'<sheets><sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/></sheets></workbook>'
+    )
+    sheet = _SheetParts(chunks, workers, compress_level)
+    with open(path, 'wb') as f:
+        archive = _ZipWriter(f)
+        for name, content in (('[Content_Types].xml', _CONTENT_TYPES), ('_rels/.rels', _ROOT_RELS),
+                              ('xl/workbook.xml', workbook), ('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS),
+                              ('xl/styles.xml', _STYLES)):
+            archive.write(name, content.encode('utf-8'), compress_level)
+        archive.write_parts('xl/worksheets/sheet1.xml', sheet)
+        archive.close()
+    return sheet.rows
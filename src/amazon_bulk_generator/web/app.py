@@ -3,31 +3,106 @@ import pandas as pd
 from datetime import datetime
 import logging
 import os
-from typing import Dict, Any, Tuple, List
+import time
+from typing import Dict, Any, Tuple, List, Callable, Iterable, Iterator, Optional, Union
 import re
 import json
 
-from amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignSettings
+from amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignIdIndex, CampaignSettings, CAMPAIGN_ID_MAP_PREFIX
+from amazon_bulk_generator.core.bulk_export import BulkExportIndex
+from amazon_bulk_generator.core.checkpoint import (
+    GenerationCheckpoint,
+    checkpoint_min_rows_from_env,
+    generation_fingerprint,
+    iter_checkpointed_chunks
+)
+from amazon_bulk_generator.core.harvesting import HarvestThresholds, harvest_search_terms
+from amazon_bulk_generator.core.bid_updates import (
+    BidRule,
+    BidUpdateEngine,
+    DEFAULT_BID_RULES,
+    OPERATORS,
+    VALID_METRICS
+)
 from amazon_bulk_generator.core.validators import (
     validate_keywords,
     validate_skus,
     validate_campaign_settings,
-    validate_name_template
+    validate_name_template,
+    validate_keywords_report,
+    validate_skus_report,
+    validate_asins_report,
+    ValidationReport
+)
+from amazon_bulk_generator.utils.file_handlers import (
+    FileHandler,
+    new_job_id,
+    parquet_supported,
+    DEFAULT_COMPRESS_LEVEL,
+    FORMAT_CSV_GZ,
+    FORMAT_ZIP
 )
-from amazon_bulk_generator.utils.file_handlers import FileHandler
-from amazon_bulk_generator.utils.formatters import TextFormatter, DataFormatter
+from amazon_bulk_generator.utils.readers import UPLOAD_FILE_TYPES
+from amazon_bulk_generator.utils.spill import SpillBuffer
+from amazon_bulk_generator.utils.input_store import InputRef, InputStore
+from amazon_bulk_generator.utils.metrics import record_generation, start_metrics_server
+from amazon_bulk_generator.utils.tracing import JobTrace, TraceWriter, trace_log_path
+from amazon_bulk_generator.web.jobs import BackgroundJob, JOB_DONE, JOB_FAILED
+from amazon_bulk_generator.utils.formatters import TextFormatter, DataFormatter, DeduplicationStats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JOB_POLL_INTERVAL = 0.5  # Seconds between progress refreshes of a running generation job
+MAX_LISTED_ROWS = 10  # Input rows named in a de-duplication message
+PAIR_PREVIEW_ROWS = 20  # Rows of an uploaded pair table shown in Step 1
+
+# Step 1 input modes of "Create campaigns"
+INPUT_MODE_LISTS = "Keyword and SKU lists"
+INPUT_MODE_PAIRS = "SKU/keyword pair table"
+
+# Output formats written for each compression choice
+NO_COMPRESSION = "None"
+COMPRESSION_OPTIONS = {
+    NO_COMPRESSION: ['xlsx', 'csv'],
+    "Gzip CSV": ['xlsx', FORMAT_CSV_GZ],
+    "ZIP bundle (Excel + CSV)": [FORMAT_ZIP],
+}
+
+# Download button label, MIME type and widget key per output format
+DOWNLOAD_FORMATS = {
+    'xlsx': ("Download Excel File", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "download_excel"),
+    'csv': ("Download CSV File", "text/csv", "download_csv"),
+    FORMAT_CSV_GZ: ("Download CSV File (gzip)", "application/gzip", "download_csv_gz"),
+    FORMAT_ZIP: ("Download Excel + CSV (zip)", "application/zip", "download_zip"),
+    'parquet': ("Download Parquet File", "application/vnd.apache.parquet", "download_parquet"),
+    CAMPAIGN_ID_MAP_PREFIX: ("Download Campaign ID Map", "text/csv", "download_campaign_ids"),
+}
+
+@st.cache_resource
+def get_shared_file_handler() -> FileHandler:
+    """FileHandler shared by all sessions so they use one output store"""
+    return FileHandler()
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Serve Prometheus metrics once per process when METRICS_PORT is set"""
+    return start_metrics_server()
+
+@st.cache_resource
+def get_trace_writer() -> Optional[TraceWriter]:
+    """Writer for the JSONL job trace log, or None if JOB_TRACE_LOG disables it"""
+    path = trace_log_path(get_shared_file_handler().base_dir)
+    return TraceWriter.shared(path) if path else None
+
 class BulkCampaignApp:
     def __init__(self):
         # Cache expensive object initializations
         if 'generator' not in st.session_state:
             st.session_state.generator = BulkSheetGenerator()
         if 'file_handler' not in st.session_state:
-            st.session_state.file_handler = FileHandler()
+            st.session_state.file_handler = get_shared_file_handler()
         if 'text_formatter' not in st.session_state:
             st.session_state.text_formatter = TextFormatter()
         if 'data_formatter' not in st.session_state:
@@ -38,12 +113,43 @@ class BulkCampaignApp:
         self.file_handler = st.session_state.file_handler
         self.text_formatter = st.session_state.text_formatter
         self.data_formatter = st.session_state.data_formatter
+        # Input lists live in a process-wide store; sessions keep only InputRefs
+        self.input_store = InputStore.shared()
+
+    def _display_validation_report(self, report: ValidationReport, label: str):
+        """Display every validation violation so all of them can be fixed in one pass"""
+        if not report.total:
+            st.error(report.to_result()[1])
+            return
+        st.error(f"{len(report.issues)} of {report.total} {label} failed validation")
+        st.dataframe(report.to_frame(), use_container_width=True, hide_index=True)
+
+    def _load_upload(self, state_key: str, upload, load: Callable[[], Any], *params) -> Any:
+        """Parse an uploaded file once; reruns reuse the result until the upload or params change"""
+        fingerprint = (upload.file_id, upload.size) + params
+        cached = st.session_state.get(state_key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        value = load()
+        st.session_state[state_key] = (fingerprint, value)
+        return value
+
+    def _report_deduplication(self, stats: DeduplicationStats, label: str):
+        """Tell the user which input rows normalization merged into earlier ones
+
+        Rows left empty fail validation, so they are listed in the validation report instead.
+        """
+        if stats.merged:
+            rows = ', '.join(str(row) for row in stats.merged_rows[:MAX_LISTED_ROWS])
+            if stats.merged > MAX_LISTED_ROWS:
+                rows += ', ...'
+            st.info(f"Merged {stats.merged} duplicate {label} (row{'s' if stats.merged > 1 else ''} {rows})")
 
     def get_keywords_input(self) -> Tuple[list, bool, int]:
         """Get and validate keywords input"""
         input_method = st.radio(
             "Choose input method for keywords:",
-            ["Type/Paste", "Upload CSV"],
+            ["Type/Paste", "Upload File", "Harvest from Search Term Report"],
             help="Select how you want to input your keywords",
             key="keywords_input_method"
         )
@@ -66,25 +172,33 @@ class BulkCampaignApp:
             
             if keyword_text:
                 keywords = self.text_formatter.clean_text_input(keyword_text)
+        elif input_method == "Harvest from Search Term Report":
+            keywords, has_error = self.get_harvested_keywords()
         else:
             keyword_file = st.file_uploader(
-                "Upload keywords CSV",
-                type=['csv'],
+                "Upload keywords file",
+                type=UPLOAD_FILE_TYPES,
+                help="CSV, Excel (.xlsx) or compressed (.gz/.zip) file; keywords are read from the first column",
                 key="keyword_file_upload"
             )
             if keyword_file:
                 try:
-                    keywords = self.file_handler.load_csv_data(keyword_file)
+                    keywords = self.file_handler.load_input_data(keyword_file)
                 except Exception as e:
                     st.error(f"Error loading keywords: {str(e)}")
                     has_error = True
         
         if keywords and not has_error:
-            valid, error = validate_keywords(keywords)
-            if not valid:
-                st.error(error)
+            # Keywords are case-insensitive on Amazon, so case variants are merged too.
+            # Normalization can change a keyword, so the normalized keywords are validated,
+            # and violations are reported against the rows they came from.
+            keywords, stats = self.text_formatter.deduplicate(keywords, case_fold=True)
+            report = validate_keywords_report(keywords).for_rows(stats.rows, stats.total, stats.empty_rows)
+            if not report.is_valid:
+                self._display_validation_report(report, "keywords")
                 has_error = True
             else:
+                self._report_deduplication(stats, "keywords")
                 st.success(f"Successfully loaded {len(keywords)} keywords")
                 
                 enable_grouping = st.checkbox(
@@ -111,11 +225,61 @@ class BulkCampaignApp:
         
         return keywords, has_error, group_size
 
+    def get_harvested_keywords(self) -> Tuple[list, bool]:
+        """Select converting search terms from a search term report as keywords"""
+        report_file = st.file_uploader(
+            "Upload search term report",
+            type=UPLOAD_FILE_TYPES,
+            help="Sponsored Products search term report (CSV, Excel or compressed)",
+            key="search_term_report_upload"
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            min_clicks = st.number_input("Minimum clicks", min_value=0, value=5, key="harvest_min_clicks")
+        with col2:
+            min_orders = st.number_input("Minimum orders", min_value=0, value=1, key="harvest_min_orders")
+        with col3:
+            max_acos = st.number_input(
+                "Maximum ACoS (%)",
+                min_value=0.0,
+                value=0.0,
+                help="0 disables the ACoS limit",
+                key="harvest_max_acos"
+            )
+
+        if not report_file:
+            return [], False
+
+        try:
+            thresholds = HarvestThresholds(
+                min_clicks=int(min_clicks),
+                min_orders=int(min_orders),
+                max_acos=max_acos / 100 if max_acos else None
+            )
+            def harvest():
+                with st.spinner("Harvesting search terms..."):
+                    return harvest_search_terms(report_file, thresholds)
+            # The report can be gigabytes, so it is only streamed again when it or the thresholds change
+            result = self._load_upload('harvested_search_terms', report_file, harvest, thresholds)
+        except Exception as e:
+            st.error(f"Error reading search term report: {str(e)}")
+            return [], True
+
+        st.info(
+            f"Read {result.rows_read:,} report rows with {result.terms_seen:,} distinct search terms; "
+            f"{len(result.candidates):,} meet the thresholds"
+        )
+        if result.rejected.issues:
+            st.warning(f"Skipped {len(result.rejected.issues)} search terms that are not valid keywords")
+        if not result.candidates.empty:
+            st.dataframe(result.candidates, use_container_width=True, hide_index=True)
+        return result.keywords, False
+
     def get_skus_input(self) -> Tuple[list, bool, int]:
         """Get and validate SKUs input"""
         input_method = st.radio(
             "Choose input method for SKUs:",
-            ["Type/Paste", "Upload CSV"],
+            ["Type/Paste", "Upload File"],
             help="Select how you want to input your SKUs",
             key="skus_input_method"
         )
@@ -140,23 +304,26 @@ class BulkCampaignApp:
                 skus = self.text_formatter.clean_text_input(sku_text)
         else:
             sku_file = st.file_uploader(
-                "Upload SKUs CSV",
-                type=['csv'],
+                "Upload SKUs file",
+                type=UPLOAD_FILE_TYPES,
+                help="CSV, Excel (.xlsx) or compressed (.gz/.zip) file; SKUs are read from the first column",
                 key="sku_file_upload"
             )
             if sku_file:
                 try:
-                    skus = self.file_handler.load_csv_data(sku_file)
+                    skus = self.file_handler.load_input_data(sku_file)
                 except Exception as e:
                     st.error(f"Error loading SKUs: {str(e)}")
                     has_error = True
         
         if skus and not has_error:
-            valid, error = validate_skus(skus)
-            if not valid:
-                st.error(error)
+            skus, stats = self.text_formatter.deduplicate(skus)
+            report = validate_skus_report(skus).for_rows(stats.rows, stats.total, stats.empty_rows)
+            if not report.is_valid:
+                self._display_validation_report(report, "SKUs")
                 has_error = True
             else:
+                self._report_deduplication(stats, "SKUs")
                 st.success(f"Successfully loaded {len(skus)} SKUs")
                 
                 enable_grouping = st.checkbox(
@@ -183,6 +350,72 @@ class BulkCampaignApp:
         
         return skus, has_error, group_size
 
+    def get_keyword_pairs_input(self) -> Tuple[Optional[pd.DataFrame], bool, int]:
+        """Get and validate a SKU/keyword pair table"""
+        pairs_file = st.file_uploader(
+            "Upload pair table",
+            type=['csv'],
+            help="CSV with SKU and Keyword columns and optional Bid and Match Type columns; "
+                 "campaigns are generated only for the listed pairs",
+            key="pairs_file_upload"
+        )
+        
+        pairs = None
+        has_error = False
+        group_size = None
+        
+        if pairs_file:
+            try:
+                # Read as text so SKUs like 00123 keep their leading zeros
+                pairs = self._load_upload('keyword_pairs', pairs_file, lambda: BulkSheetGenerator.normalize_keyword_pairs(
+                    pd.read_csv(pairs_file, dtype=str, keep_default_na=False)
+                ))
+            except Exception as e:
+                st.error(f"Error loading keyword pairs: {str(e)}")
+                has_error = True
+        
+        if pairs is not None and not has_error:
+            if pairs.empty:
+                st.error("The pair table has no rows with both a SKU and a keyword")
+                return pairs, True, group_size
+            
+            st.success(
+                f"Successfully loaded {len(pairs)} pairs for {pairs['SKU'].nunique()} SKUs "
+                f"and {pairs['Keyword'].nunique()} keywords"
+            )
+            st.dataframe(pairs.head(PAIR_PREVIEW_ROWS), use_container_width=True, hide_index=True)
+            
+            enable_grouping = st.checkbox(
+                "Enable keyword grouping",
+                help="Group multiple keywords of a SKU into a single campaign",
+                key="enable_pair_keyword_grouping"
+            )
+            if enable_grouping:
+                group_size = st.number_input(
+                    "Keywords per group",
+                    min_value=1,
+                    value=3,
+                    key="pair_keyword_group_size"
+                )
+        
+        return pairs, has_error, group_size
+
+    def _store_keyword_pairs(self, pairs: pd.DataFrame) -> Dict[str, InputRef]:
+        """Put each column of a pair table in the input store"""
+        return {column: self.input_store.put([str(value) for value in pairs[column]]) for column in pairs.columns}
+
+    def _stored_keyword_pairs(self) -> Optional[pd.DataFrame]:
+        """Rebuild the pair table stored in Step 1, or None if it was evicted"""
+        columns = {}
+        for column, ref in st.session_state['stored_pairs'].items():
+            values = self.input_store.get(ref)
+            if values is None:
+                return None
+            columns[column] = list(values)
+        pairs = pd.DataFrame(columns)
+        pairs['Bid'] = pd.to_numeric(pairs['Bid'], errors='coerce')
+        return pairs
+
     def get_campaign_settings(self) -> Tuple[Dict[str, Any], bool]:
         """Get and validate campaign settings"""
         has_error = False
@@ -239,6 +472,14 @@ class BulkCampaignApp:
                     value=0.75,
                     key=f"bid_{match_type}"
                 )
+            
+            isolate_match_types = False
+            if "exact" in match_types and {"phrase", "broad"} & set(match_types):
+                isolate_match_types = st.checkbox(
+                    "Isolate match types",
+                    help="Add exact keywords as negative exact keywords to the broad/phrase campaigns they would also match",
+                    key="isolate_match_types"
+                )
         
         # Create CampaignSettings object for validation
         try:
@@ -248,7 +489,8 @@ class BulkCampaignApp:
                 daily_budget=daily_budget,
                 start_date=start_date,
                 match_types=match_types,
-                bids=bids
+                bids=bids,
+                isolate_match_types=isolate_match_types
             )
             
             # Validate settings
@@ -264,7 +506,8 @@ class BulkCampaignApp:
                 'daily_budget': campaign_settings.daily_budget,
                 'start_date': campaign_settings.start_date,
                 'match_types': campaign_settings.match_types,
-                'bids': campaign_settings.bids
+                'bids': campaign_settings.bids,
+                'isolate_match_types': campaign_settings.isolate_match_types
             }
             
             return settings, has_error
@@ -273,34 +516,203 @@ class BulkCampaignApp:
             st.error(f"Error creating campaign settings: {str(e)}")
             return {}, True
 
-    def _display_bulk_sheet_results(self, df: pd.DataFrame):
+    def get_existing_campaigns(self) -> Tuple[Any, bool]:
+        """Optionally load a bulk export so combinations already live in the account are skipped"""
+        export_file = st.file_uploader(
+            "Existing bulk export (optional)",
+            type=UPLOAD_FILE_TYPES,
+            help="Upload a Sponsored Products bulk export to skip SKU/keyword/match type combinations that already exist",
+            key="bulk_export_upload"
+        )
+        if not export_file:
+            return None, False
+        
+        try:
+            # Hashing and unpickling a large export on every rerun is expensive, so the
+            # loaded index is kept in the session
+            existing = self._load_upload('existing_campaigns', export_file, lambda: BulkExportIndex.from_file(
+                export_file,
+                cache_dir=self.file_handler.get_cache_dir('bulk_exports')
+            ))
+            st.info(
+                f"Found {len(existing.campaigns)} campaigns and {len(existing.keywords)} keywords "
+                f"in the export; existing combinations will be skipped"
+            )
+            return existing, False
+        except Exception as e:
+            st.error(f"Error reading bulk export: {str(e)}")
+            return None, True
+
+    def get_output_options(self):
+        """Compression and extra formats of the generated files; read back by _output_options when a job starts"""
+        with st.expander("Output options"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.selectbox(
+                    "Compression",
+                    list(COMPRESSION_OPTIONS),
+                    help="Gzip the CSV file, or bundle the Excel and CSV files in one ZIP archive",
+                    key="output_compression"
+                )
+            with col2:
+                st.slider(
+                    "Compression level",
+                    min_value=1,
+                    max_value=9,
+                    value=DEFAULT_COMPRESS_LEVEL,
+                    help="Higher levels give smaller files but take longer",
+                    key="compression_level"
+                )
+            if parquet_supported():
+                st.checkbox(
+                    "Also write a Parquet file",
+                    help="Columnar copy of the bulk sheet for analysis tools",
+                    key="output_parquet"
+                )
+
+    def _output_options(self) -> Tuple[List[str], int]:
+        """Output formats and compression level selected in get_output_options"""
+        formats = list(COMPRESSION_OPTIONS[st.session_state.get('output_compression', NO_COMPRESSION)])
+        if st.session_state.get('output_parquet') and parquet_supported():
+            formats.append('parquet')
+        return formats, int(st.session_state.get('compression_level', DEFAULT_COMPRESS_LEVEL))
+
+    def _save_bulk_sheet_results(self, results: Union[SpillBuffer, GenerationCheckpoint], job: BackgroundJob, job_id: str,
+                                 trace: JobTrace, formats: List[str], compress_level: int) -> Dict[str, Any]:
+        """Write a generated bulk sheet in the selected formats (runs inside the generation job, no UI calls)"""
+        def checked(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            for chunk in chunks:
+                job.check_cancelled()
+                yield chunk
+        
+        job.report(results.rows, "Writing files")
+        # One pass over the chunks (read back from disk if they were spilled) feeds all writers at once
+        with trace.stage('write'):
+            paths = self.file_handler.save_bulk_sheet_formats(
+                checked(results.iter_chunks()), formats, job_id=job_id, compress_level=compress_level,
+                side_outputs={CAMPAIGN_ID_MAP_PREFIX: self.generator.campaign_id_map}
+            )
+        for path in paths.values():
+            trace.add_output(path)
+        
+        return {
+            'paths': paths,
+            'preview': self.data_formatter.prepare_preview_data(results.head(5)),
+            'rows': results.rows
+        }
+
+    def _start_generation_job(self, make_chunks: Callable[[], Iterable[pd.DataFrame]], total_rows: int,
+                              kind: str, inputs: Dict[str, List[str]], settings: CampaignSettings,
+                              checkpoint_fingerprint: Optional[str] = None,
+                              make_checkpointed_chunks: Optional[Callable[[GenerationCheckpoint], Iterable[pd.DataFrame]]] = None):
+        """Generate a bulk sheet in a background job kept in the session, so reruns do not interrupt it
+        
+        With a checkpoint fingerprint, the job generates through make_checkpointed_chunks into
+        a durable checkpoint, continuing where an interrupted job with the same fingerprint stopped.
+        """
+        spill_dir = self.file_handler.get_cache_dir('spill')
+        checkpoint_dir = self.file_handler.get_cache_dir('checkpoints')
+        job_id = new_job_id()
+        trace = JobTrace(job_id, kind)
+        trace_writer = get_trace_writer()
+        formats, compress_level = self._output_options()
+        
+        def work(job: BackgroundJob) -> Dict[str, Any]:
+            trace.set_inputs(inputs)
+            trace.set_settings(settings)
+            trace.set(planned_rows=total_rows, formats=formats, compress_level=compress_level)
+            checkpoint = None
+            if checkpoint_fingerprint:
+                checkpoint = GenerationCheckpoint.open(checkpoint_dir, checkpoint_fingerprint)
+            if checkpoint is not None:
+                # Each finished SKU group is committed to disk, so a restarted job skips it
+                results, chunks = checkpoint, make_checkpointed_chunks(checkpoint)
+                trace.set(checkpoint=checkpoint_fingerprint, resumed_rows=checkpoint.rows)
+            else:
+                # Chunks beyond the memory budget are spilled to disk instead of accumulating in RAM
+                results = SpillBuffer(directory=spill_dir)
+                chunks = self._buffered(make_chunks(), results)
+            
+            with results:
+                resumed_rows = results.rows
+                started = time.perf_counter()
+                generated = resumed_rows
+                with trace.stage('generate'):
+                    for chunk in chunks:
+                        job.check_cancelled()
+                        generated += len(chunk)
+                        job.report(generated)
+                job.check_cancelled()
+                record_generation(kind, results.rows - resumed_rows, time.perf_counter() - started)
+                trace.set(rows=results.rows, spilled=results.spilled)
+                output = self._save_bulk_sheet_results(results, job, job_id, trace, formats, compress_level)
+                if checkpoint is not None:
+                    checkpoint.clear()
+                return output
+        
+        def on_finished(job: BackgroundJob):
+            trace.set(rows_done=job.done)
+            trace.finish(job.status, job.error, trace_writer)
+        
+        st.session_state['generation_job'] = BackgroundJob(
+            work, total=total_rows, name=f"generate_{job_id}", on_finished=on_finished
+        ).start()
+
+    @staticmethod
+    def _buffered(chunks: Iterable[pd.DataFrame], buffer: SpillBuffer) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            buffer.append(chunk)
+            yield chunk
+
+    def _generation_running(self) -> bool:
+        job = st.session_state.get('generation_job')
+        return job is not None and not job.finished
+
+    def _render_generation_job(self):
+        """Show the progress of the session's generation job, or its results once finished"""
+        job = st.session_state.get('generation_job')
+        if job is None:
+            return
+        if not job.finished:
+            st.fragment(self._render_job_progress, run_every=JOB_POLL_INTERVAL)()
+        elif job.status == JOB_DONE:
+            self._display_bulk_sheet_results(job.result)
+        elif job.status == JOB_FAILED:
+            st.error(f"Error generating bulk sheet: {job.error}")
+        else:
+            st.warning(f"Generation cancelled after {job.done:,} rows")
+
+    def _render_job_progress(self):
+        """Progress bar and cancel button, refreshed on its own while the job runs"""
+        job = st.session_state.get('generation_job')
+        if job is None or job.finished:
+            # Rerun the whole app so the results render outside this fragment
+            st.rerun()
+        
+        text = job.message or f"Generated {job.done:,} of about {job.total:,} rows"
+        st.progress(job.fraction, text=f"{text} ({job.elapsed:.0f}s)")
+        if st.button("Cancel", key="cancel_generation", disabled=job.cancel_requested):
+            job.cancel()
+            st.info("Cancelling...")
+
+    def _display_bulk_sheet_results(self, output: Dict[str, Any]):
         """Display bulk sheet results including download buttons and preview"""
         try:
-            preview_df = self.data_formatter.prepare_preview_data(df)
-            excel_path = self.file_handler.save_bulk_sheet(df, 'xlsx')
-            csv_path = self.file_handler.save_bulk_sheet(df, 'csv')
+            paths = output['paths']
+            preview_df = output['preview']
             
             st.success("Bulk sheet generated successfully!")
             
-            col1, col2 = st.columns(2)
-            with col1:
-                with open(excel_path, 'rb') as f:
+            columns = st.columns(len(paths))
+            for column, (format, path) in zip(columns, paths.items()):
+                label, mime, key = DOWNLOAD_FORMATS[format]
+                with column:
                     st.download_button(
-                        "Download Excel File",
-                        f.read(),
-                        file_name=os.path.basename(excel_path),
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_excel"
-                    )
-            
-            with col2:
-                with open(csv_path, 'rb') as f:
-                    st.download_button(
-                        "Download CSV File",
-                        f.read(),
-                        file_name=os.path.basename(csv_path),
-                        mime="text/csv",
-                        key="download_csv"
+                        label,
+                        self.file_handler.read_output(path),
+                        file_name=os.path.basename(path),
+                        mime=mime,
+                        key=key
                     )
             
             st.markdown("### 🔍 Preview")
@@ -310,50 +722,286 @@ class BulkCampaignApp:
             logger.error(f"Error displaying bulk sheet results: {str(e)}")
             st.error(f"Error displaying bulk sheet results: {str(e)}")
 
-    def generate_bulk_sheet(self, keywords: list, skus: list, settings: Dict[str, Any], group_size: int = None):
+    @staticmethod
+    def _campaign_settings(settings: Dict[str, Any], group_size: int = None) -> CampaignSettings:
+        """Build CampaignSettings from the Step 2 settings"""
+        return CampaignSettings(
+            daily_budget=settings['daily_budget'],
+            start_date=settings['start_date'],
+            match_types=settings['match_types'],
+            bids=settings['bids'],
+            campaign_name_template=settings['campaign_name_template'],
+            ad_group_name_template=settings['ad_group_name_template'],
+            keyword_group_size=group_size,
+            isolate_match_types=settings.get('isolate_match_types', False)
+        )
+
+    def generate_bulk_sheet(self, keywords: list, skus: list, settings: Dict[str, Any], group_size: int = None,
+                            existing: BulkExportIndex = None):
         """Generate bulk sheet"""
         try:
-            campaign_settings = CampaignSettings(
-                daily_budget=settings['daily_budget'],
-                start_date=settings['start_date'],
-                match_types=settings['match_types'],
-                bids=settings['bids'],
-                campaign_name_template=settings['campaign_name_template'],
-                ad_group_name_template=settings['ad_group_name_template'],
-                keyword_group_size=group_size
-            )
+            campaign_settings = self._campaign_settings(settings, group_size)
             
             if st.session_state.get('stored_sku_group_size'):
                 # Generate bulk sheets for each SKU group
                 sku_groups = [skus[i:i + st.session_state.stored_sku_group_size] 
                             for i in range(0, len(skus), st.session_state.stored_sku_group_size)]
-                all_dfs = []
-                for sku_group in sku_groups:
-                    df = self.generator.generate_bulk_sheet(keywords, sku_group, campaign_settings)
-                    all_dfs.append(df)
-                
-                # Combine all dataframes
-                final_df = pd.concat(all_dfs, ignore_index=True)
             else:
                 # Original behavior without SKU grouping
-                final_df = self.generator.generate_bulk_sheet(keywords, skus, campaign_settings)
+                sku_groups = [skus]
+            
+            def make_chunks() -> Iterator[pd.DataFrame]:
+                # One ID index across the SKU groups keeps campaign IDs unique in the whole sheet
+                ids = CampaignIdIndex()
+                for sku_group in sku_groups:
+                    yield from self.generator.iter_bulk_sheet_chunks(keywords, sku_group, campaign_settings, existing,
+                                                                     ids=ids)
             
-            # Display results
-            self._display_bulk_sheet_results(final_df)
+            # Long jobs are checkpointed so an interrupted one resumes instead of starting over
+            planned_rows = self.generator.planned_rows(keywords, skus, campaign_settings)
+            min_rows = checkpoint_min_rows_from_env()
+            fingerprint = None
+            if min_rows and planned_rows >= min_rows:
+                fingerprint = generation_fingerprint('keywords', {'keywords': keywords, 'skus': skus},
+                                                     campaign_settings, existing)
             
+            self._start_generation_job(
+                make_chunks,
+                planned_rows,
+                'keywords',
+                {'keywords': keywords, 'skus': skus},
+                campaign_settings,
+                checkpoint_fingerprint=fingerprint,
+                make_checkpointed_chunks=lambda checkpoint: iter_checkpointed_chunks(
+                    self.generator, keywords, skus, campaign_settings, checkpoint, existing
+                )
+            )
+            
+        except Exception as e:
+            logger.error(f"Error generating bulk sheet: {str(e)}")
+            st.error(f"Error generating bulk sheet: {str(e)}")
+
+    def generate_keyword_pairs_sheet(self, pairs: pd.DataFrame, settings: Dict[str, Any], group_size: int = None,
+                                     existing: BulkExportIndex = None):
+        """Generate a bulk sheet from a SKU/keyword pair table"""
+        try:
+            campaign_settings = self._campaign_settings(settings, group_size)
+            # Pair sheets are not checkpointed: they are generated per SKU rather than per SKU group.
+            # Planning also checks the pairs' match types against the settings before the job starts.
+            self._start_generation_job(
+                lambda: self.generator.iter_keyword_pairs_chunks(pairs, campaign_settings, existing),
+                self.generator.planned_keyword_pairs_rows(pairs, campaign_settings),
+                'keywords',
+                {'skus': pairs['SKU'].tolist(), 'keywords': pairs['Keyword'].tolist()},
+                campaign_settings
+            )
         except Exception as e:
             logger.error(f"Error generating bulk sheet: {str(e)}")
             st.error(f"Error generating bulk sheet: {str(e)}")
 
+    def get_asins_input(self) -> Tuple[list, bool]:
+        """Get and validate the ASINs to target"""
+        input_method = st.radio(
+            "Choose input method for ASINs:",
+            ["Type/Paste", "Upload File"],
+            key="asins_input_method"
+        )
+        
+        asins = []
+        if input_method == "Type/Paste":
+            asin_text = st.text_area(
+                "Enter ASINs",
+                height=150,
+                help="Enter competitor ASINs (one per line or comma-separated)",
+                key="asin_text_input"
+            )
+            if asin_text:
+                asins = self.text_formatter.clean_text_input(asin_text)
+        else:
+            asin_file = st.file_uploader(
+                "Upload ASINs file",
+                type=UPLOAD_FILE_TYPES,
+                help="CSV, Excel (.xlsx) or compressed (.gz/.zip) file; ASINs are read from the first column",
+                key="asin_file_upload"
+            )
+            if asin_file:
+                try:
+                    asins = self.file_handler.load_input_data(asin_file)
+                except Exception as e:
+                    st.error(f"Error loading ASINs: {str(e)}")
+                    return [], True
+        
+        if not asins:
+            return [], False
+        
+        asins, stats = self.text_formatter.deduplicate(asin.upper() for asin in asins)
+        report = validate_asins_report(asins).for_rows(stats.rows, stats.total, stats.empty_rows)
+        if not report.is_valid:
+            self._display_validation_report(report, "ASINs")
+            return asins, True
+        
+        self._report_deduplication(stats, "ASINs")
+        st.success(f"Successfully loaded {len(asins)} ASINs")
+        return asins, False
+
+    def run_product_targeting(self):
+        """Generate product targeting campaigns advertising SKUs on competitor ASINs"""
+        st.header("Target Competitor ASINs")
+        col1, col2 = st.columns(2)
+        with col1:
+            asins, asins_error = self.get_asins_input()
+        with col2:
+            skus, skus_error, _ = self.get_skus_input()
+        
+        st.subheader("Campaign Settings")
+        col1, col2 = st.columns(2)
+        with col1:
+            daily_budget = st.number_input("Daily Budget ($)", min_value=1.0, value=10.0, key="asin_daily_budget")
+            start_date = st.date_input("Campaign Start Date", min_value=datetime.today(), key="asin_start_date")
+        with col2:
+            bid = st.number_input("Bid per ASIN target ($)", min_value=0.02, value=0.75, key="asin_bid")
+            group_size = st.number_input(
+                "ASINs per campaign",
+                min_value=1,
+                value=1,
+                help="Number of ASIN targets grouped into each campaign",
+                key="asin_group_size"
+            )
+        existing, export_error = self.get_existing_campaigns()
+        self.get_output_options()
+        
+        if not (asins and skus) or asins_error or skus_error or export_error:
+            return
+        if st.button("🎯 Generate Bulk Sheet", type="primary", key="generate_asin_sheet",
+                     disabled=self._generation_running()):
+            try:
+                settings = CampaignSettings(
+                    daily_budget=daily_budget,
+                    start_date=start_date,
+                    match_types=[],
+                    bids={},
+                    campaign_name_template="SP_[SKU]_match_type",
+                    ad_group_name_template="AG_[SKU]_match_type",
+                    keyword_group_size=int(group_size),
+                    product_targeting_bid=bid
+                )
+                self._start_generation_job(
+                    lambda: self.generator.iter_product_targeting_chunks(asins, skus, settings, existing),
+                    self.generator.planned_product_targeting_rows(asins, skus, settings),
+                    'product_targeting',
+                    {'asins': asins, 'skus': skus},
+                    settings
+                )
+            except Exception as e:
+                logger.error(f"Error generating product targeting sheet: {str(e)}")
+                st.error(f"Error generating product targeting sheet: {str(e)}")
+        self._render_generation_job()
+
+    def run_bid_updates(self):
+        """Generate a bid update sheet from a bulk export and a performance report"""
+        st.header("Update Bids from Performance Report")
+        col1, col2 = st.columns(2)
+        with col1:
+            export_file = st.file_uploader(
+                "Bulk export", type=UPLOAD_FILE_TYPES,
+                help="Sponsored Products bulk export containing the live keywords",
+                key="bid_update_export"
+            )
+        with col2:
+            report_file = st.file_uploader(
+                "Performance report", type=UPLOAD_FILE_TYPES,
+                help="Keyword report with Keyword ID, Clicks, Spend, Sales and Orders",
+                key="bid_update_report"
+            )
+        
+        st.subheader("Bid Rules")
+        st.caption("Rules are applied in order; the first matching rule sets the bid change (e.g. -0.2 = -20%)")
+        rules_df = st.data_editor(
+            pd.DataFrame([vars(rule) for rule in DEFAULT_BID_RULES]),
+            num_rows="dynamic",
+            column_config={
+                'metric': st.column_config.SelectboxColumn("Metric", options=sorted(VALID_METRICS), required=True),
+                'operator': st.column_config.SelectboxColumn("Operator", options=list(OPERATORS), required=True),
+                'threshold': st.column_config.NumberColumn("Threshold", required=True),
+                'change': st.column_config.NumberColumn("Bid change", required=True),
+                'min_clicks': st.column_config.NumberColumn("Min clicks", min_value=0, step=1),
+            },
+            key="bid_rules"
+        )
+        max_bid = st.number_input("Maximum bid ($, 0 = no limit)", min_value=0.0, value=0.0, key="max_bid")
+        
+        if export_file and report_file and st.button("Generate Bid Update Sheet", type="primary"):
+            try:
+                rules = [
+                    BidRule(row.metric, row.operator, float(row.threshold), float(row.change), int(row.min_clicks or 0))
+                    for row in rules_df.dropna(subset=['metric', 'operator', 'threshold', 'change']).itertuples()
+                ]
+                engine = BidUpdateEngine(rules, max_bid=max_bid or None)
+                output_path = self.file_handler.save_bulk_sheet_chunks(
+                    engine.run(export_file, report_file), 'csv', prefix='amazon_bid_updates'
+                )
+                st.success("Bid update sheet generated successfully!")
+                st.download_button(
+                    "Download Bid Updates (CSV)",
+                    self.file_handler.read_output(output_path),
+                    file_name=os.path.basename(output_path),
+                    mime="text/csv",
+                    key="download_bid_updates"
+                )
+            except Exception as e:
+                logger.error(f"Error generating bid updates: {str(e)}")
+                st.error(f"Error generating bid updates: {str(e)}")
+
+    def run_keyword_pairs_input(self):
+        """Step 1 for a SKU/keyword pair table"""
+        pairs, pairs_error, keyword_group_size = self.get_keyword_pairs_input()
+        if pairs is None or pairs_error:
+            return
+        
+        st.markdown("<br>", unsafe_allow_html=True)  # Add some space
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("Continue to Campaign Settings ➡️", type="primary", use_container_width=True,
+                         key="continue_with_pairs"):
+                st.session_state['stored_pairs'] = self._store_keyword_pairs(pairs)
+                st.session_state['stored_keyword_group_size'] = keyword_group_size
+                st.session_state['stored_sku_group_size'] = None
+                st.session_state['step'] = 2
+                st.rerun()
+
+    def _session_summary(self) -> str:
+        """Describe the session state by sizes and hashes only, so logging cost does not grow with inputs"""
+        parts = []
+        for key in sorted(st.session_state.keys()):
+            value = st.session_state[key]
+            if isinstance(value, InputRef):
+                parts.append(f"{key}=<{value}>")
+            elif isinstance(value, (list, tuple, dict, set, str)):
+                parts.append(f"{key}=<{type(value).__name__} len={len(value)}>")
+            elif isinstance(value, (int, float, bool)) or value is None:
+                parts.append(f"{key}={value}")
+            else:
+                parts.append(f"{key}=<{type(value).__name__}>")
+        return ", ".join(parts)
+
     def run(self):
         """Run the Streamlit application"""
         logger.info("Starting application")
-        logger.info(f"Current session state: {st.session_state}")
+        logger.info(f"Current session state: {self._session_summary()}")
+        start_metrics_endpoint()
         
         # Main app content
         st.title("Amazon Ads Bulk Campaign Generator 🎯")
         st.markdown("Create properly formatted bulk sheets for Amazon Sponsored Products campaigns")
         
+        mode = st.radio("Mode", ["Create campaigns", "Target ASINs", "Update bids"], horizontal=True, key="app_mode")
+        if mode == "Update bids":
+            self.run_bid_updates()
+            return
+        if mode == "Target ASINs":
+            self.run_product_targeting()
+            return
+        
         # Initialize all required session state keys
         for key in ['step', 'keywords', 'skus', 'keyword_group_size', 'sku_group_size']:
             if key not in st.session_state:
@@ -368,6 +1016,16 @@ class BulkCampaignApp:
         # Create two columns for Step 1
         if st.session_state['step'] == 1:
             st.header("Step 1: Enter Keywords and SKUs")
+            input_mode = st.radio(
+                "Campaign inputs",
+                [INPUT_MODE_LISTS, INPUT_MODE_PAIRS],
+                horizontal=True,
+                help="Lists target every keyword on every SKU; a pair table targets only the listed SKU/keyword pairs",
+                key="campaign_input_mode"
+            )
+            if input_mode == INPUT_MODE_PAIRS:
+                self.run_keyword_pairs_input()
+                return
             
             col1, col2 = st.columns(2)
             with col1:
@@ -389,8 +1047,9 @@ class BulkCampaignApp:
                     with col2:
                         if st.button("Continue to Campaign Settings ➡️", type="primary", use_container_width=True):
                             # Store values in session state using different keys to avoid widget conflicts
-                            st.session_state['stored_keywords'] = keywords
-                            st.session_state['stored_skus'] = skus
+                            st.session_state['stored_keywords'] = self.input_store.put(keywords)
+                            st.session_state['stored_skus'] = self.input_store.put(skus)
+                            st.session_state.pop('stored_pairs', None)
                             st.session_state['stored_keyword_group_size'] = keyword_group_size
                             st.session_state['stored_sku_group_size'] = sku_group_size
                             st.session_state['step'] = 2
@@ -400,6 +1059,8 @@ class BulkCampaignApp:
         elif st.session_state['step'] == 2:
             st.header("Step 2: Configure Campaign Settings")
             settings, settings_error = self.get_campaign_settings()
+            existing, export_error = self.get_existing_campaigns()
+            self.get_output_options()
             
             # Add container for better organization
             with st.container():
@@ -412,19 +1073,40 @@ class BulkCampaignApp:
                         st.session_state['step'] = 1
                         st.rerun()
                 with col2:
-                    if settings and not settings_error:
-                        if st.button("🎯 Generate Bulk Sheet", type="primary", use_container_width=True):
-                            # Retrieve values from session state
-                            if 'stored_keywords' not in st.session_state or 'stored_skus' not in st.session_state:
+                    if settings and not settings_error and not export_error:
+                        if st.button("🎯 Generate Bulk Sheet", type="primary", use_container_width=True,
+                                     disabled=self._generation_running()):
+                            if st.session_state.get('stored_pairs'):
+                                pairs = self._stored_keyword_pairs()
+                                if pairs is None:
+                                    st.error("Keyword pairs not found. Please go back to Step 1.")
+                                    return
+                                self.generate_keyword_pairs_sheet(
+                                    pairs,
+                                    settings,
+                                    st.session_state.get('stored_keyword_group_size'),
+                                    existing
+                                )
+                                self._render_generation_job()
+                                return
+                            # Retrieve values from the input store
+                            keywords = skus = None
+                            if 'stored_keywords' in st.session_state and 'stored_skus' in st.session_state:
+                                keywords = self.input_store.get(st.session_state['stored_keywords'])
+                                skus = self.input_store.get(st.session_state['stored_skus'])
+                            if keywords is None or skus is None:
                                 st.error("Keywords or SKUs not found. Please go back to Step 1.")
                                 return
                             # Generate bulk sheet with both keyword and SKU grouping
                             self.generate_bulk_sheet(
-                                st.session_state['stored_keywords'],
-                                st.session_state['stored_skus'],
+                                list(keywords),
+                                list(skus),
                                 settings,
-                                st.session_state.get('stored_keyword_group_size')
+                                st.session_state.get('stored_keyword_group_size'),
+                                existing
                             )
+            
+            self._render_generation_job()
 
 if __name__ == "__main__":
     app = BulkCampaignApp()
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from ..utils.metrics import ACTIVE_JOBS, JOBS
+
+logger = logging.getLogger(__name__)
+
+# Job states
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = {JOB_DONE, JOB_FAILED, JOB_CANCELLED}
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function when cancellation was requested"""
+
+class BackgroundJob:
+    """Run a function in a daemon thread with progress reporting and cooperative cancellation
+
+    The work function receives the job and should call `job.report(done)` as it makes
+    progress and `job.check_cancelled()` between units of work. The job object holds
+    the result, so it survives Streamlit reruns when kept in st.session_state. Work
+    functions must not call Streamlit APIs; the script run reads the job state instead.
+    """
+
+    def __init__(self, work: Callable[['BackgroundJob'], Any], total: int = 0, name: str = "job",
+                 on_finished: Optional[Callable[['BackgroundJob'], None]] = None):
+        """
+        Initialize BackgroundJob
+
+        Args:
+            work: Function doing the work; its return value becomes the job result
+            total: Planned number of work units (e.g. rows), used for the progress fraction
+            name: Name for logs and the thread
+            on_finished: Called from the job thread once the job has a final status
+        """
+        self.work = work
+        self.total = total
+        self.name = name
+        self.on_finished = on_finished
+        self.done = 0
+        self.message = ""
+        self.status = JOB_PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BackgroundJob':
+        self.status = JOB_RUNNING
+        self.started_at = time.time()
+        ACTIVE_JOBS.inc()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self.result = self.work(self)
+            self.status = JOB_DONE
+        except JobCancelled:
+            self.status = JOB_CANCELLED
+            logger.info(f"Job {self.name} cancelled after {self.done} of {self.total}")
+        except Exception as e:
+            self.error = str(e)
+            self.status = JOB_FAILED
+            logger.error(f"Job {self.name} failed: {str(e)}")
+        finally:
+            self.finished_at = time.time()
+            ACTIVE_JOBS.dec()
+            JOBS.inc(status=self.status)
+            if self.on_finished is not None:
+                try:
+                    self.on_finished(self)
+                except Exception as e:
+                    logger.error(f"Job {self.name} finish callback failed: {str(e)}")
+
+    def report(self, done: int, message: Optional[str] = None) -> None:
+        """Record progress (work units completed so far) and optionally the current stage"""
+        self.done = done
+        if message is not None:
+            self.message = message
+
+    def cancel(self) -> None:
+        """Request cancellation; the work stops at its next check_cancelled()"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def fraction(self) -> float:
+        """Progress in [0, 1]; stays below 1 until the job has finished"""
+        if self.status == JOB_DONE:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.done / self.total, 0.99)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the job thread to finish"""
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,27 @@
+from datetime import datetime
+import pytest
+from src.amazon_bulk_generator.core.generator import CampaignSettings
+
+# Default bid per match type used by make_settings
+DEFAULT_BIDS = {"exact": 0.75, "phrase": 0.6, "broad": 0.5}
+
+@pytest.fixture
+def make_settings():
+    """Build CampaignSettings with test defaults; keyword arguments override them"""
+    def make(match_types=("exact",), **overrides):
+        values = dict(
+            daily_budget=10.0,
+            start_date=datetime(2025, 1, 1),
+            match_types=list(match_types),
+            bids={match_type: DEFAULT_BIDS[match_type] for match_type in match_types},
+            campaign_name_template="SP_[SKU]_match_type",
+            ad_group_name_template="AG_[SKU]_match_type",
+        )
+        values.update(overrides)
+        return CampaignSettings(**values)
+    return make
+
+@pytest.fixture
+def settings(make_settings):
+    """Exact match campaigns with a $0.75 bid"""
+    return make_settings()
@@ -0,0 +1,186 @@
+import os
+import json
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.batch import (
+    BATCH_JOB_DONE, BATCH_JOB_FAILED, BatchRunner, load_manifest, parse_manifest
+)
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator, GenerationCache
+
+KEYWORDS = [f"shared keyword {i}" for i in range(40)]
+
+DEFAULTS = {
+    "daily_budget": 10,
+    "start_date": "2099-01-01",
+    "match_types": ["exact", "phrase"],
+    "bids": {"exact": 0.75, "phrase": 0.6},
+    "campaign_name_template": "SP_[SKU]_match_type",
+    "ad_group_name_template": "AG_[SKU]_match_type",
+    "isolate_match_types": True,
+}
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    (tmp_path / "keywords.csv").write_text("Keyword\n" + "\n".join(KEYWORDS) + "\n")
+    for brand in ("a", "b"):
+        (tmp_path / f"skus_{brand}.csv").write_text("SKU\n" + "\n".join(f"{brand.upper()}-{i}" for i in range(3)) + "\n")
+    manifest = {
+        "output_dir": "out",
+        "formats": ["csv"],
+        "workers": 2,
+        "defaults": DEFAULTS,
+        "jobs": [
+            {"name": "brand-a", "keywords": "keywords.csv", "skus": "skus_a.csv"},
+            {"name": "brand-b", "keywords": "keywords.csv", "skus": "skus_b.csv", "settings": {"daily_budget": 25}},
+        ],
+    }
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest))
+    return path
+
+def test_manifest_merges_defaults_and_resolves_paths(manifest_path, tmp_path):
+    manifest = load_manifest(str(manifest_path))
+
+    assert [job.name for job in manifest.jobs] == ["brand-a", "brand-b"]
+    assert manifest.jobs[0].keywords == str(tmp_path / "keywords.csv")
+    assert manifest.output_dir == str(tmp_path / "out")
+    assert manifest.jobs[0].settings.daily_budget == 10
+    assert manifest.jobs[1].settings.daily_budget == 25
+    assert manifest.jobs[1].settings.bids == DEFAULTS["bids"]
+
+@pytest.mark.parametrize("jobs, error", [
+    ([{"name": "a", "keywords": ["x"], "skus": ["S1"]}, {"name": "a", "keywords": ["x"], "skus": ["S2"]}],
+     "Duplicate job name"),
+    ([{"name": "a/b", "keywords": ["x"], "skus": ["S1"]}], "name must use"),
+    ([{"name": "a", "keywords": ["x"]}], "missing skus"),
+    ([{"name": "a", "keywords": ["x"], "pairs": "pairs.csv"}], "pairs replace keywords and skus"),
+    ([{"name": "a", "keywords": ["x"], "skus": ["S1"], "settings": {"daily_budget": 0}}], "Job a:"),
+    ([{"name": "a", "keywords": ["x"], "skus": ["S1"], "settings": {"budget": 5}}], "Unknown settings"),
+    ([], "no jobs"),
+])
+def test_invalid_manifests_are_rejected(jobs, error):
+    with pytest.raises(ValueError, match=error):
+        parse_manifest({"defaults": DEFAULTS, "jobs": jobs}, ".")
+
+def test_batch_writes_each_account_and_shares_work(manifest_path):
+    manifest = load_manifest(str(manifest_path))
+    runner = BatchRunner(manifest)
+    results = runner.run(batch_id="test")
+
+    assert [result.status for result in results] == [BATCH_JOB_DONE, BATCH_JOB_DONE]
+    # The keyword file is loaded once for both accounts, and its negative index built once
+    assert runner.inputs.loads == 3
+    assert runner.generator.cache.hits > 0
+
+    for job, result in zip(manifest.jobs, results):
+        expected = BulkSheetGenerator().generate_bulk_sheet(
+            runner.inputs.keywords(job.keywords), runner.inputs.skus(job.skus), job.settings
+        )
+        written = pd.read_csv(result.paths["csv"], dtype=str)
+        assert result.paths["csv"].endswith(f"{job.name}_test.csv")
+        assert result.rows == len(written) == len(expected)
+        assert list(written["Campaign Name"].dropna()) == list(expected["Campaign Name"].dropna())
+
+    with open(runner.summary_path("test"), encoding="utf-8") as f:
+        summary = json.load(f)
+    assert [job["name"] for job in summary["jobs"]] == ["brand-a", "brand-b"]
+
+def test_failed_job_does_not_stop_the_batch(tmp_path):
+    manifest = parse_manifest({
+        "output_dir": "out",
+        "formats": ["csv"],
+        "defaults": DEFAULTS,
+        "jobs": [
+            {"name": "good", "keywords": KEYWORDS, "skus": ["GOOD-1"]},
+            {"name": "bad", "keywords": KEYWORDS, "skus": ["bad sku!"]},
+        ],
+    }, str(tmp_path))
+    results = BatchRunner(manifest).run()
+
+    assert results[0].status == BATCH_JOB_DONE
+    assert results[1].status == BATCH_JOB_FAILED
+    assert "bad sku!" in results[1].error
+
+def test_inputs_are_validated_after_normalization(tmp_path):
+    manifest = parse_manifest({
+        "output_dir": "out",
+        "formats": ["csv"],
+        "defaults": DEFAULTS,
+        "jobs": [{"name": "fraction", "keywords": ["\u00bd price"], "skus": ["SKU-1"]}],
+    }, str(tmp_path))
+    result, = BatchRunner(manifest).run()
+
+    assert result.status == BATCH_JOB_FAILED
+    assert "1\u20442 price" in result.error
+
+def test_pair_jobs_generate_only_their_pairs(tmp_path):
+    (tmp_path / "pairs.csv").write_text("SKU,Keyword,Bid\nPAIR-1,shared keyword 1,1.25\nPAIR-2,shared keyword 2,\n")
+    manifest = parse_manifest({
+        "output_dir": "out",
+        "formats": ["csv"],
+        "defaults": DEFAULTS,
+        "jobs": [{"name": "pairs", "pairs": "pairs.csv"}],
+    }, str(tmp_path))
+    result, = BatchRunner(manifest).run(batch_id="test")
+
+    assert result.status == BATCH_JOB_DONE
+    written = pd.read_csv(result.paths["csv"], dtype=str)
+    keywords = written[written["Entity"] == "Keyword"]
+    assert list(zip(keywords["Keyword Text"], keywords["Bid"])) == [
+        ("shared keyword 1", "1.25"), ("shared keyword 1", "1.25"), ("shared keyword 2", "0.75"), ("shared keyword 2", "0.60")
+    ]
+    assert result.rows == len(written)
+
+def test_generation_cache_is_bounded_lru():
+    cache = GenerationCache(max_bytes=300)  # Room for two of the ~133-byte values below
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return bytes(100) + bytes([value])
+
+    assert cache.get("a", lambda: build(1))[-1] == 1
+    assert cache.get("b", lambda: build(2))[-1] == 2
+    assert cache.get("a", lambda: build(3))[-1] == 1
+    cache.get("c", lambda: build(4))  # Evicts "b", the least recently used
+    assert cache.get("b", lambda: build(5))[-1] == 5
+    assert builds == [1, 2, 4, 5]
+    assert len(cache) == 2
+    assert cache.total_bytes <= 300
+
+def test_generation_cache_tracks_growing_values():
+    class Growing:
+        nbytes = 100
+
+    cache = GenerationCache(max_bytes=300)
+    value = cache.get("grows", Growing)
+    cache.get("other", lambda: bytes(100))
+    value.nbytes = 250  # e.g. a negative keyword index memoizing lookups
+    assert cache.get("grows", Growing) is value
+    assert len(cache) == 1  # Re-measured on the hit, so "other" is evicted
+    assert cache.total_bytes == 250
+
+def test_generators_share_the_process_cache(settings):
+    keywords = ["shared keyword 1", "shared keyword 2"]
+    BulkSheetGenerator().generate_bulk_sheet(keywords, ["SKU1"], settings)
+    cache = GenerationCache.shared()
+    hits = cache.hits
+    BulkSheetGenerator().generate_bulk_sheet(list(keywords), ["SKU1"], settings)
+    assert BulkSheetGenerator().cache is cache
+    assert cache.hits > hits
+
+def test_large_jobs_are_checkpointed(manifest_path, monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_MIN_ROWS", "1")
+    manifest = load_manifest(str(manifest_path))
+    runner = BatchRunner(manifest)
+    results = runner.run(batch_id="checkpointed")
+
+    assert [result.status for result in results] == [BATCH_JOB_DONE, BATCH_JOB_DONE]
+    job = manifest.jobs[0]
+    expected = BulkSheetGenerator().generate_bulk_sheet(
+        runner.inputs.keywords(job.keywords), runner.inputs.skus(job.skus), job.settings
+    )
+    written = pd.read_csv(results[0].paths["csv"], dtype=str)
+    assert results[0].rows == len(written) == len(expected)
+    # Finished jobs leave no checkpoint behind
+    assert os.listdir(runner.file_handler.get_cache_dir("checkpoints")) == []
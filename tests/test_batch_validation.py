@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core import validators
+from src.amazon_bulk_generator.core.validators import (
+    validate_keywords,
+    validate_skus,
+    validate_keywords_report,
+    validate_skus_report
+)
+
+def test_report_collects_every_violation():
+    skus = ["ABC-123", "", "A" * 41, "ABC#123", "ABC=123", "ABC@123"]
+    report = validate_skus_report(skus)
+
+    assert not report.is_valid
+    assert report.total == len(skus)
+    assert [issue.index for issue in report.issues] == [1, 2, 3, 5]
+    assert "Empty value" in report.issues[0].reason
+    assert "Invalid length" in report.issues[1].reason
+    assert "Invalid characters" in report.issues[2].reason
+
+def test_report_matches_sequential_validator():
+    cases = [
+        ["gaming keyboard", "wireless mouse"],
+        ["gaming keyboard", "gaming@keyboard"],
+        ["café crème", "kid's toys"],  # Unicode word characters are valid
+        ["   "],
+        ["k" * 81],
+        [],
+    ]
+    for keywords in cases:
+        assert validate_keywords_report(keywords).to_result() == validate_keywords(keywords), keywords
+
+    for skus in [["ABC123"], ["ABC(123"], [""], []]:
+        assert validate_skus_report(skus).to_result() == validate_skus(skus), skus
+
+def test_non_ascii_keywords_pass_the_vectorized_screen():
+    keywords = validators._to_string_series(["café crème", "naïve größe", "日本語 キーワード", "£5 off"])
+    # Valid keywords must not fall through to the per-item re check
+    assert validators._screen(keywords[:3], validators.KEYWORD_PATTERN).all()
+    assert [issue.index for issue in validate_keywords_report(keywords).issues] == [3]
+
+    # Characters outside the BMP are always decided by Python's re
+    keywords = ["\U0001d400bc", "sale \U0001f600"]
+    assert validate_keywords_report(keywords).to_result() == validate_keywords(keywords)
+    assert validate_keywords_report(keywords[:1]).is_valid
+
+def test_screen_never_accepts_what_re_rejects():
+    characters = [chr(code) for code in range(0x10000) if not 0xD800 <= code <= 0xDFFF]
+    screened = validators._screen(validators._to_string_series(characters), validators.KEYWORD_PATTERN)
+    accepted = [validators.KEYWORD_REGEX.match(character) is not None for character in characters]
+    assert not (screened & ~pd.Series(accepted)).any()
+
+def test_report_frame():
+    frame = validate_keywords_report(["ok", "bad!"]).to_frame()
+    assert list(frame.columns) == ["Row", "Value", "Reason"]
+    assert frame.iloc[0]["Row"] == 1
+    assert frame.iloc[0]["Value"] == "bad!"
+
+def test_parallel_validation_keeps_row_indexes(monkeypatch):
+    monkeypatch.setattr(validators, "PARALLEL_VALIDATION_THRESHOLD", 10)
+    monkeypatch.setattr(validators, "VALIDATION_CHUNK_SIZE", 7)
+    skus = [f"SKU{i}" for i in range(30)]
+    skus[3] = "bad#"
+    skus[22] = "bad$"
+
+    report = validate_skus_report(skus, max_workers=2)
+    assert [issue.index for issue in report.issues] == [3, 22]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.core.bid_updates import (
+    BidRule,
+    BidUpdateEngine,
+    load_keyword_table,
+    load_performance_report
+)
+
+EXPORT = """Product,Entity,Operation,Campaign ID,Ad Group ID,Keyword ID,State,Ad Group Default Bid,Bid,Keyword Text,Match Type
+Sponsored Products,Ad Group,,C1,AG1,,enabled,0.80,,,
+Sponsored Products,Keyword,,C1,AG1,K1,enabled,,1.00,unprofitable,exact
+Sponsored Products,Keyword,,C1,AG1,K2,enabled,,1.00,profitable,exact
+Sponsored Products,Keyword,,C1,AG1,K3,enabled,,,no orders,exact
+Sponsored Products,Keyword,,C1,AG1,K4,paused,,0.02,at minimum,exact
+Sponsored Products,Keyword,,C1,AG1,K5,archived,,1.00,archived,exact
+"""
+
+# Two rows for K1 (e.g. two report days) are aggregated before rules are applied
+REPORT = """Keyword ID,Clicks,Spend,7 Day Total Sales,7 Day Total Orders (#)
+K1,10,$30.00,$20.00,1
+K1,10,$30.00,$20.00,1
+K2,15,5.00,"$1,000.00",10
+K3,25,12.50,0,0
+K4,30,20.00,10.00,1
+K5,30,20.00,0,0
+"""
+
+@pytest.fixture
+def sources(tmp_path):
+    export_path = tmp_path / "export.csv"
+    export_path.write_text(EXPORT)
+    report_path = tmp_path / "report.csv"
+    report_path.write_text(REPORT)
+    return str(export_path), str(report_path)
+
+def test_performance_report_is_aggregated(sources):
+    report = load_performance_report(sources[1])
+    assert report.loc["K1", "Clicks"] == 20
+    assert report.loc["K1", "Spend"] == 60
+    assert report.loc["K2", "Sales"] == 1000
+
+def test_keyword_table_uses_ad_group_default_bid(sources):
+    keywords = load_keyword_table(sources[0]).set_index("Keyword ID")
+    assert keywords.loc["K3", "Bid"] == "0.80"
+    assert "K5" not in keywords.index
+
+def test_rules_are_applied_and_clamped(sources):
+    engine = BidUpdateEngine(rules=[
+        BidRule("orders", "==", 0, -0.30, min_clicks=20),
+        BidRule("acos", ">", 0.5, -0.20, min_clicks=10),
+        BidRule("acos", "<", 0.2, 0.15, min_clicks=10),
+    ])
+    updates = engine.compute(load_keyword_table(sources[0]), load_performance_report(sources[1]))
+    new_bids = dict(zip(updates["Keyword ID"], updates["New Bid"]))
+
+    assert new_bids["K1"] == pytest.approx(0.80)  # ACoS 300%
+    assert new_bids["K2"] == pytest.approx(1.15)  # ACoS 0.5%
+    assert new_bids["K3"] == pytest.approx(0.56)  # No orders, default bid 0.80
+    assert "K4" not in new_bids  # Already at the minimum bid after clamping
+    assert list(updates[updates["Keyword ID"] == "K1"]["Rule"]) == [1]
+
+def test_update_rows_use_bulk_sheet_layout(sources):
+    engine = BidUpdateEngine()
+    chunks = list(engine.run(*sources))
+    rows = chunks[0]
+
+    assert list(rows.columns) == engine.headers
+    assert set(rows["Operation"]) == {"Update"}
+    assert set(rows["Entity"]) == {"Keyword"}
+    assert rows.set_index("Keyword ID").loc["K1", "Bid"] == "0.80"
+
+def test_update_sheet_is_streamed_to_file(sources, tmp_path):
+    handler = FileHandler(base_dir=str(tmp_path))
+    csv_path = handler.save_bulk_sheet_chunks(BidUpdateEngine().run(*sources), "csv")
+    xlsx_path = handler.save_bulk_sheet_chunks(BidUpdateEngine().run(*sources), "xlsx")
+
+    assert len(pd.read_csv(csv_path)) == 3
+    assert pd.read_excel(xlsx_path, dtype=str)["Keyword ID"].tolist() == pd.read_csv(csv_path, dtype=str)["Keyword ID"].tolist()
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        BidRule("ctr", ">", 1, 0.1)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,75 @@
+import io
+import pytest
+from openpyxl import Workbook
+from src.amazon_bulk_generator.core.bulk_export import BulkExportIndex
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+EXPORT_HEADERS = [
+    "Product", "Entity", "Operation", "Campaign ID", "Ad Group ID", "Keyword ID",
+    "Campaign Name (Informational only)", "State", "SKU", "Bid", "Keyword Text", "Match Type"
+]
+EXPORT_ROWS = [
+    ["Sponsored Products", "Campaign", "", "C1", "", "", "Campaign One", "enabled", "", "", "", ""],
+    ["Sponsored Products", "Ad Group", "", "C1", "AG1", "", "Campaign One", "enabled", "", "", "", ""],
+    ["Sponsored Products", "Keyword", "", "C1", "AG1", "K1", "Campaign One", "enabled", "", "0.75", "Gaming Keyboard", "Exact"],
+    ["Sponsored Products", "Keyword", "", "C1", "AG1", "K2", "Campaign One", "archived", "", "0.75", "laptop stand", "exact"],
+    ["Sponsored Products", "Product Ad", "", "C1", "AG1", "", "Campaign One", "enabled", "SKU001", "", "", ""],
+]
+
+def make_export(rows):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Sponsored Products Campaigns"
+    worksheet.append(EXPORT_HEADERS)
+    for row in rows:
+        worksheet.append(row)
+    upload = io.BytesIO()
+    workbook.save(upload)
+    upload.name = "bulk_export.xlsx"
+    return upload
+
+@pytest.fixture
+def export_file():
+    return make_export(EXPORT_ROWS)
+
+def test_index_queries(export_file):
+    index = BulkExportIndex.from_file(export_file)
+
+    assert index.campaigns == {"C1": "Campaign One"}
+    assert index.ad_groups == {"AG1": "C1"}
+    assert index.ad_groups_by_sku == {"SKU001": {"AG1"}}
+    assert index.is_targeted("SKU001", "gaming  keyboard", "exact")
+    assert not index.is_targeted("SKU001", "gaming keyboard", "phrase")
+    assert not index.is_targeted("SKU001", "laptop stand", "exact")  # Archived
+    assert [record.keyword_id for record in index.keyword_records("GAMING KEYBOARD")] == ["K1"]
+
+def test_index_is_persisted(export_file, tmp_path):
+    first = BulkExportIndex.from_file(export_file, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    second = BulkExportIndex.from_file(export_file, cache_dir=str(tmp_path))
+    assert second.targeted == first.targeted
+
+def test_persisted_indexes_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setenv("BULK_EXPORT_CACHE_MAX_FILES", "2")
+    for campaign in ["C1", "C2", "C3"]:
+        rows = [[campaign if value == "C1" else value for value in row] for row in EXPORT_ROWS]
+        BulkExportIndex.from_file(make_export(rows), cache_dir=str(tmp_path))
+
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+def test_generation_skips_existing_combinations(export_file, settings):
+    index = BulkExportIndex.from_file(export_file)
+    generator = BulkSheetGenerator()
+    df = generator.generate_bulk_sheet(["gaming keyboard", "wireless mouse"], ["SKU001", "SKU002"], settings, existing=index)
+
+    keywords = df[df["Entity"] == "Keyword"]
+    sku_by_campaign = generator.campaign_id_map(df).set_index("Campaign ID")["SKU"]
+    pairs = set(zip(keywords["Campaign ID"].map(sku_by_campaign), keywords["Keyword Text"]))
+    assert ("SKU001", "gaming keyboard") not in pairs
+    assert ("SKU001", "wireless mouse") in pairs
+    assert ("SKU002", "gaming keyboard") in pairs
+    assert (df["Entity"] == "Campaign").sum() == 3
+
+if __name__ == "__main__":
+    pytest.main([__file__])
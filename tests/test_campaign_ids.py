@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.generator import (
+    BulkSheetGenerator, CampaignIdIndex, CAMPAIGN_ID_LENGTH, CAMPAIGN_ID_MAP_COLUMNS,
+    CAMPAIGN_ID_MAP_PREFIX
+)
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings(["exact", "phrase"])
+
+def test_ids_are_short_and_stable(settings):
+    keywords = ["gaming keyboard", "wireless mouse"]
+    df = BulkSheetGenerator().generate_bulk_sheet(keywords, ["SKU-WITH-A-LONG-NAME-001"], settings)
+    campaigns = df[df["Entity"] == BulkSheetGenerator.ENTITY_CAMPAIGN]
+
+    assert campaigns["Campaign ID"].str.fullmatch(f"[0-9a-f]{{{CAMPAIGN_ID_LENGTH}}}").all()
+    assert campaigns["Campaign ID"].is_unique
+    assert (df["Ad Group ID"].dropna() == df.loc[df["Ad Group ID"].notna(), "Campaign ID"]).all()
+    assert campaigns["Campaign ID"].iloc[0] == CampaignIdIndex.campaign_id("SKU-WITH-A-LONG-NAME-001_exact_gaming_keyboard")
+    regenerated = BulkSheetGenerator().generate_bulk_sheet(keywords, ["SKU-WITH-A-LONG-NAME-001"], settings)
+    pd.testing.assert_series_equal(regenerated["Campaign ID"], df["Campaign ID"])
+
+def test_colliding_groups_are_renamed(settings):
+    # Both keywords clean to the group "red_shoes"
+    df = BulkSheetGenerator().generate_bulk_sheet(["red shoes", "red-shoes"], ["SKU001"], settings)
+    campaigns = df[df["Entity"] == BulkSheetGenerator.ENTITY_CAMPAIGN]
+
+    assert campaigns["Campaign ID"].is_unique
+    assert list(campaigns["Campaign Name"]) == [
+        "SP_SKU001_exact_red_shoes", "SP_SKU001_phrase_red_shoes",
+        "SP_SKU001_exact_red_shoes_2", "SP_SKU001_phrase_red_shoes_2",
+    ]
+
+def test_taken_ids_are_never_reused():
+    taken = CampaignIdIndex.campaign_id("SKU001_exact_red_shoes")
+    ids = CampaignIdIndex([taken])
+
+    campaign_id, identifier = ids.assign("SKU001", "exact", "red_shoes")
+    assert identifier == "red_shoes_2"
+    assert campaign_id == CampaignIdIndex.campaign_id("SKU001_exact_red_shoes_2")
+    assert ids.collisions == 1 and len(ids) == 2
+
+def test_index_shared_across_calls_keeps_ids_unique(settings):
+    generator = BulkSheetGenerator()
+    ids = CampaignIdIndex()
+    first = generator.generate_bulk_sheet(["red shoes"], ["SKU001"], settings, ids=ids)
+    second = generator.generate_bulk_sheet(["red shoes"], ["SKU001"], settings, ids=ids)
+
+    assert not set(first["Campaign ID"]) & set(second["Campaign ID"])
+
+def test_id_map_written_alongside_the_sheet(tmp_path, settings):
+    generator = BulkSheetGenerator()
+    chunks = generator.iter_bulk_sheet_chunks([f"keyword {i}" for i in range(50)], ["SKU001", "SKU002"], settings,
+                                              chunk_rows=40)
+    paths = FileHandler(str(tmp_path)).save_bulk_sheet_formats(
+        chunks, ["csv"], job_id="ids", side_outputs={CAMPAIGN_ID_MAP_PREFIX: generator.campaign_id_map}
+    )
+
+    assert paths[CAMPAIGN_ID_MAP_PREFIX].endswith(f"amazon_bulk_upload_{CAMPAIGN_ID_MAP_PREFIX}_ids.csv")
+    sheet = pd.read_csv(paths["csv"], dtype=str)
+    id_map = pd.read_csv(paths[CAMPAIGN_ID_MAP_PREFIX], dtype=str)
+    assert list(id_map.columns) == CAMPAIGN_ID_MAP_COLUMNS
+    assert list(id_map["Campaign ID"]) == list(sheet.loc[sheet["Entity"] == "Campaign", "Campaign ID"])
+    assert id_map.iloc[0].to_dict() == {
+        "Campaign ID": CampaignIdIndex.campaign_id("SKU001_exact_keyword_0"),
+        "Campaign Name": "SP_SKU001_exact_keyword_0",
+        "Ad Group Name": "AG_SKU001_exact_keyword_0",
+        "SKU": "SKU001",
+        "Targeting": "exact",
+        "First Target": "keyword 0",
+    }
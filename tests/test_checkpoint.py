@@ -0,0 +1,104 @@
+import os
+import time
+from dataclasses import replace
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.bulk_export import BulkExportIndex
+from src.amazon_bulk_generator.core.checkpoint import (
+    GenerationCheckpoint, generation_fingerprint, iter_checkpointed_chunks, prune_checkpoints
+)
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+KEYWORDS = [f"keyword {i}" for i in range(60)] + ["keyword"]
+SKUS = [f"SKU{i:03d}" for i in range(7)]
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings(["exact", "phrase", "broad"], keyword_group_size=4, sku_group_size=2, isolate_match_types=True)
+
+def crash(checkpoint):
+    """Drop the checkpoint the way a killed process would: no cleanup, lock released by the OS"""
+    os.close(checkpoint._lock_fd)
+    checkpoint._lock_fd = None
+
+def test_resumed_generation_matches_uninterrupted_run(tmp_path, settings):
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    directory = str(tmp_path / "checkpoint")
+
+    checkpoint = GenerationCheckpoint(directory)
+    chunks = iter_checkpointed_chunks(generator, KEYWORDS, SKUS, settings, checkpoint, chunk_rows=100)
+    for _ in range(12):  # Stop part-way through the second SKU group
+        next(chunks)
+    assert checkpoint.completed_groups == 1
+    crash(checkpoint)
+
+    with GenerationCheckpoint(directory) as resumed:
+        assert resumed.completed_groups == 1
+        resumed_rows = resumed.rows
+        new_rows = sum(len(chunk) for chunk in iter_checkpointed_chunks(
+            generator, KEYWORDS, SKUS, settings, resumed, chunk_rows=100
+        ))
+        # Only the groups after the first one were generated again
+        assert resumed.completed_groups == 4
+        assert 0 < resumed_rows and new_rows == len(expected) - resumed_rows
+        pd.testing.assert_frame_equal(pd.concat(resumed.iter_chunks(), ignore_index=True), expected)
+        pd.testing.assert_frame_equal(resumed.head(3), expected.head(3))
+
+def test_single_sku_groups_are_committed_in_batches(tmp_path, make_settings, monkeypatch):
+    settings = make_settings(["exact"], keyword_group_size=2)
+    skus = [f"SKU{i:04d}" for i in range(300)]
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS[:2], skus, settings)
+
+    state_writes = []
+    monkeypatch.setattr(GenerationCheckpoint, "_save_state", lambda self: state_writes.append(self.rows))
+    checkpoint = GenerationCheckpoint(str(tmp_path / "checkpoint"))
+    list(iter_checkpointed_chunks(generator, KEYWORDS[:2], skus, settings, checkpoint, chunk_rows=300))
+
+    # One commit and about one part file per chunk_rows rows, not one per SKU
+    limit = len(expected) // 300 + 1
+    assert checkpoint.completed_groups == len(skus)
+    assert len(state_writes) <= limit
+    assert len([name for name in os.listdir(checkpoint.directory) if name.startswith("part_")]) <= limit
+    pd.testing.assert_frame_equal(pd.concat(checkpoint.iter_chunks(), ignore_index=True), expected)
+    checkpoint.close()
+
+def test_uncommitted_parts_are_discarded(tmp_path, settings):
+    directory = str(tmp_path / "checkpoint")
+    checkpoint = GenerationCheckpoint(directory)
+    checkpoint.append(BulkSheetGenerator().generate_bulk_sheet(KEYWORDS[:2], SKUS[:1], settings))
+    crash(checkpoint)
+    assert any(name.startswith("part_") for name in os.listdir(directory))
+
+    with GenerationCheckpoint(directory) as reopened:
+        assert reopened.rows == 0
+        assert not any(name.startswith("part_") for name in os.listdir(directory))
+
+def test_open_checkpoint_is_locked(tmp_path):
+    pytest.importorskip("fcntl")
+    with GenerationCheckpoint.open(str(tmp_path), "abc") as checkpoint:
+        assert GenerationCheckpoint.open(str(tmp_path), "abc") is None
+        checkpoint.clear()
+    assert not os.path.exists(tmp_path / "abc")
+
+def test_fingerprint_covers_inputs_settings_and_export(settings):
+    base = generation_fingerprint("keywords", {"keywords": KEYWORDS, "skus": SKUS}, settings)
+
+    assert base == generation_fingerprint("keywords", {"keywords": list(KEYWORDS), "skus": SKUS}, settings)
+    assert base != generation_fingerprint("keywords", {"keywords": KEYWORDS, "skus": SKUS[:-1]}, settings)
+    assert base != generation_fingerprint("keywords", {"keywords": KEYWORDS, "skus": SKUS},
+                                          replace(settings, daily_budget=11.0))
+    assert base != generation_fingerprint("keywords", {"keywords": KEYWORDS, "skus": SKUS}, settings,
+                                          BulkExportIndex(fingerprint="export"))
+    # An index built in memory has no identity to resume against
+    assert generation_fingerprint("keywords", {"keywords": KEYWORDS, "skus": SKUS}, settings, BulkExportIndex()) is None
+
+def test_abandoned_checkpoints_are_pruned(tmp_path):
+    GenerationCheckpoint(str(tmp_path / "old")).close()
+    GenerationCheckpoint(str(tmp_path / "recent")).close()
+    stale = time.time() - 3600
+    os.utime(tmp_path / "old", (stale, stale))
+
+    assert prune_checkpoints(str(tmp_path), max_age_seconds=60) == 1
+    assert sorted(os.listdir(tmp_path)) == ["recent"]
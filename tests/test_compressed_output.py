@@ -0,0 +1,35 @@
+import gzip
+import io
+import os
+import zipfile
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+
+KEYWORDS = [f"keyword {i}" for i in range(500)]
+SKUS = ["SKU001", "SKU002"]
+
+@pytest.fixture
+def chunks(settings):
+    return list(BulkSheetGenerator().iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=200))
+
+def test_gzip_csv_matches_plain_csv(tmp_path, chunks):
+    handler = FileHandler(str(tmp_path))
+    paths = handler.save_bulk_sheet_formats(iter(chunks), ["csv", "csv.gz"], job_id="gz", compress_level=9)
+
+    assert paths["csv.gz"].endswith("amazon_bulk_upload_gz.csv.gz")
+    with gzip.open(paths["csv.gz"], "rb") as f:
+        assert f.read() == open(paths["csv"], "rb").read()
+    assert os.path.getsize(paths["csv.gz"]) * 5 < os.path.getsize(paths["csv"])
+
+def test_zip_bundles_csv_and_xlsx(tmp_path, chunks):
+    path = FileHandler(str(tmp_path)).save_bulk_sheet_chunks(iter(chunks), "zip", job_id="bundle")
+
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == ["amazon_bulk_upload_bundle.csv", "amazon_bulk_upload_bundle.xlsx"]
+        csv = pd.read_csv(archive.open("amazon_bulk_upload_bundle.csv"), dtype=str)
+        xlsx = pd.read_excel(io.BytesIO(archive.read("amazon_bulk_upload_bundle.xlsx")), dtype=str)
+    assert len(csv) == len(xlsx) == sum(len(chunk) for chunk in chunks)
+    assert list(csv["Keyword Text"].dropna()) == list(xlsx["Keyword Text"].dropna())
+    assert not [name for name in os.listdir(tmp_path / "output") if name.endswith(".tmp")]
@@ -0,0 +1,65 @@
+import pytest
+from src.amazon_bulk_generator.core.validators import validate_keywords_report
+from src.amazon_bulk_generator.utils.formatters import TextFormatter
+
+def test_normalize_item():
+    assert TextFormatter.normalize_item("  gaming   keyboard \t") == "gaming keyboard"
+    assert TextFormatter.normalize_item("ＳＫＵ００１") == "SKU001"  # Full-width characters
+    assert TextFormatter.normalize_item("Gaming Keyboard", case_fold=True) == "gaming keyboard"
+
+def test_deduplicate_keeps_first_occurrence():
+    items = ["gaming keyboard", "Gaming  Keyboard", "wireless mouse", "gaming keyboard "]
+
+    unique, stats = TextFormatter.deduplicate(items)
+    assert unique == ["gaming keyboard", "Gaming Keyboard", "wireless mouse"]
+    assert stats.total == 4
+    assert stats.merged == 1
+
+    unique, stats = TextFormatter.deduplicate(items, case_fold=True)
+    assert unique == ["gaming keyboard", "wireless mouse"]
+    assert stats.unique == 2
+    assert stats.merged == 2
+
+def test_deduplicate_composed_and_decomposed_unicode():
+    unique, stats = TextFormatter.deduplicate(["café", "café"])
+    assert unique == ["café"]
+    assert stats.merged == 1
+
+def test_items_empty_after_normalization_are_not_merged():
+    unique, stats = TextFormatter.deduplicate(["keyboard", "\u3000", "keyboard"])
+    assert unique == ["keyboard"]
+    assert stats.empty == 1
+    assert stats.merged == 1
+
+def test_deduplicate_records_input_rows():
+    unique, stats = TextFormatter.deduplicate(["keyboard", "Keyboard", " \u3000 ", "mouse", "MOUSE"], case_fold=True)
+    assert unique == ["keyboard", "mouse"]
+    assert stats.rows == [0, 3]
+    assert stats.empty_rows == [2]
+    assert stats.merged_rows == [1, 4]
+
+def test_validation_is_reported_against_input_rows():
+    items = ["keyboard", "Keyboard", "\u3000", "\u00a35 off", "keyboard"]
+    unique, stats = TextFormatter.deduplicate(items, case_fold=True)
+    report = validate_keywords_report(unique).for_rows(stats.rows, stats.total, stats.empty_rows)
+
+    assert report.total == 5
+    assert [(issue.index, issue.value) for issue in report.issues] == [(2, ""), (3, "\u00a35 off")]
+    assert report.issues[0].reason == "Empty value found in keywords"
+    assert list(report.to_frame()["Row"]) == [2, 3]
+
+def test_normalized_items_are_what_gets_validated():
+    # NFKC turns the vulgar fraction into "1", FRACTION SLASH, "2", which keywords may not contain
+    unique, _ = TextFormatter.deduplicate(["\u00bd price"])
+    assert unique == ["1\u20442 price"]
+    assert validate_keywords_report(["\u00bd price"]).is_valid
+    assert not validate_keywords_report(unique).is_valid
+
+    # Compatibility characters can expand past the length limit
+    ligatures = "\ufb03" * 30
+    unique, _ = TextFormatter.deduplicate([ligatures])
+    assert validate_keywords_report([ligatures]).is_valid
+    assert "Invalid length" in validate_keywords_report(unique).issues[0].reason
+
+if __name__ == "__main__":
+    pytest.main([__file__])
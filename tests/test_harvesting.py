@@ -0,0 +1,60 @@
+import pytest
+from src.amazon_bulk_generator.core.harvesting import (
+    HarvestThresholds,
+    aggregate_search_terms,
+    harvest_search_terms
+)
+
+REPORT = """Date,Campaign Name,Customer Search Term,Impressions,Clicks,Spend,7 Day Total Sales,7 Day Total Orders (#)
+2025-04-01,C1,gaming keyboard,100,4,$4.00,$30.00,1
+2025-04-02,C1,Gaming  Keyboard,100,4,$4.00,$30.00,1
+2025-04-01,C1,wireless mouse,100,20,$10.00,$0.00,0
+2025-04-01,C1,b07xyz1234,100,10,$5.00,$50.00,2
+2025-04-01,C1,rgb keyboard!,100,10,$5.00,$50.00,2
+2025-04-01,C1,laptop stand,100,6,$30.00,$40.00,1
+2025-04-01,C1,mechanical keyboard,100,9,$2.00,$100.00,3
+"""
+
+@pytest.fixture
+def report_path(tmp_path):
+    path = tmp_path / "search_terms.csv"
+    path.write_text(REPORT)
+    return str(path)
+
+def test_harvest_applies_thresholds(report_path):
+    result = harvest_search_terms(report_path, HarvestThresholds(min_clicks=5, min_orders=1, max_acos=0.5), chunksize=2)
+
+    # Variants are aggregated across chunks; ASIN clicks, high ACoS and non-converting terms are excluded
+    assert result.keywords == ["mechanical keyboard", "gaming keyboard"]
+    assert result.rows_read == 7
+    gaming = result.candidates.set_index("Customer Search Term").loc["gaming keyboard"]
+    assert gaming["Clicks"] == 8
+    assert gaming["Orders"] == 2
+
+def test_invalid_terms_are_rejected(report_path):
+    result = harvest_search_terms(report_path, HarvestThresholds(min_clicks=1, min_orders=1))
+    assert "rgb keyboard!" not in result.keywords
+    assert [issue.value for issue in result.rejected.issues] == ["rgb keyboard!"]
+
+def test_existing_keywords_are_skipped(report_path):
+    result = harvest_search_terms(report_path, existing_keywords=["Mechanical Keyboard"])
+    assert "mechanical keyboard" not in result.keywords
+
+def test_pruning_keeps_converting_terms():
+    import pandas as pd
+    chunks = [
+        pd.DataFrame({
+            "Customer Search Term": [f"term {i}" for i in range(10)] + ["buyer term"],
+            "Clicks": ["1"] * 10 + ["1"],
+            "Spend": ["1"] * 11,
+            "Sales": ["0"] * 10 + ["5"],
+            "Orders": ["0"] * 10 + ["1"],
+        })
+    ]
+    totals, _, pruned = aggregate_search_terms(chunks, max_terms=4)
+    assert len(totals) == 2
+    assert pruned == 9
+    assert "buyer term" in totals.index
+
+if __name__ == "__main__":
+    pytest.main([__file__])
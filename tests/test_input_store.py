@@ -0,0 +1,54 @@
+import threading
+from src.amazon_bulk_generator.utils.input_store import InputStore, input_digest
+
+def test_identical_lists_are_stored_once():
+    store = InputStore(max_bytes=0, idle_seconds=0)
+    first = store.put(["gaming keyboard", "wireless mouse"])
+    second = store.put(["gaming keyboard", "wireless mouse"])
+
+    assert first == second
+    assert len(store) == 1
+    assert store.get(first) == ("gaming keyboard", "wireless mouse")
+    assert store.total_bytes == first.nbytes
+    assert first.digest == input_digest(["gaming keyboard", "wireless mouse"])
+    assert "2 items" in str(first) and first.digest[:12] in str(first)
+
+def test_digest_separates_items():
+    assert input_digest(["ab", "c"]) != input_digest(["a", "bc"])
+    assert input_digest(["a", "b"]) != input_digest(["b", "a"])
+
+def test_least_recently_used_lists_are_evicted_over_the_limit():
+    probe = InputStore(max_bytes=0, idle_seconds=0).put([f"keyword {i}" for i in range(100)])
+    store = InputStore(max_bytes=int(probe.nbytes * 2.5), idle_seconds=0)
+
+    refs = [store.put([f"keyword {i}" for i in range(start, start + 100)]) for start in (0, 1000)]
+    store.get(refs[0])  # refs[1] becomes least recently used
+    newest = store.put([f"keyword {i}" for i in range(2000, 2100)])
+
+    assert store.get(refs[1]) is None
+    assert store.get(refs[0]) is not None
+    assert store.get(newest) is not None
+    assert store.total_bytes <= store.max_bytes
+
+def test_idle_lists_are_evicted(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("src.amazon_bulk_generator.utils.input_store.time.time", lambda: clock[0])
+    store = InputStore(max_bytes=0, idle_seconds=60)
+    old = store.put(["old"])
+    clock[0] += 120
+    new = store.put(["new"])
+
+    assert store.get(old) is None
+    assert store.get(new) == ("new",)
+
+def test_concurrent_puts_share_one_entry():
+    store = InputStore(max_bytes=0, idle_seconds=0)
+    items = [f"sku{i}" for i in range(1000)]
+    refs = []
+    threads = [threading.Thread(target=lambda: refs.append(store.put(list(items)))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(refs)) == 1
+    assert len(store) == 1
@@ -0,0 +1,62 @@
+import threading
+from src.amazon_bulk_generator.web.jobs import BackgroundJob, JOB_DONE, JOB_FAILED, JOB_CANCELLED
+
+def test_job_reports_progress_and_result():
+    step = threading.Event()
+    checkpoints = []
+
+    def work(job):
+        for done in range(1, 5):
+            job.check_cancelled()
+            job.report(done * 10)
+            checkpoints.append(job.fraction)
+        step.wait(5)
+        return "result"
+
+    job = BackgroundJob(work, total=40).start()
+    job.join(0.5)
+    assert not job.finished
+    assert job.fraction == 0.99  # Capped until the job is done
+    step.set()
+    job.join(5)
+
+    assert job.status == JOB_DONE
+    assert job.result == "result"
+    assert job.fraction == 1.0
+    assert checkpoints == [0.25, 0.5, 0.75, 0.99]
+
+def test_cancel_stops_work_at_next_check():
+    started = threading.Event()
+    iterations = []
+
+    def work(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            iterations.append(1)
+            threading.Event().wait(0.01)
+
+    job = BackgroundJob(work, total=100).start()
+    started.wait(5)
+    job.cancel()
+    job.join(5)
+
+    assert job.status == JOB_CANCELLED
+    assert job.finished
+    assert job.result is None
+
+def test_failures_are_captured():
+    def work(job):
+        raise ValueError("bad input")
+
+    job = BackgroundJob(work).start()
+    job.join(5)
+    assert job.status == JOB_FAILED
+    assert job.error == "bad input"
+    assert job.fraction == 0.0
+
+def test_on_finished_sees_final_status():
+    seen = []
+    job = BackgroundJob(lambda job: "result", on_finished=lambda job: seen.append((job.status, job.result))).start()
+    job.join(5)
+    assert seen == [(JOB_DONE, "result")]
@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.bulk_export import BulkExportIndex
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator, KEYWORD_PAIR_COLUMNS
+from src.amazon_bulk_generator.utils.resource_cache import ResourceCache
+
+KEYWORDS = ["red shoes", "blue shoes", "shoes", "red running shoes", "socks"]
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings(["exact", "phrase", "broad"], keyword_group_size=2, isolate_match_types=True)
+
+def with_skus(df, entity):
+    ads = df[df["Entity"] == BulkSheetGenerator.ENTITY_PRODUCT_AD]
+    rows = df[df["Entity"] == entity]
+    return rows["Campaign ID"].map(dict(zip(ads["Campaign ID"], ads["SKU"]))), rows
+
+def keyword_rows(df):
+    skus, keywords = with_skus(df, BulkSheetGenerator.ENTITY_KEYWORD)
+    return list(zip(skus, keywords["Keyword Text"], keywords["Match Type"], keywords["Bid"]))
+
+def test_full_pair_table_matches_the_cartesian_sheet(settings):
+    generator = BulkSheetGenerator()
+    pairs = pd.DataFrame([(sku, keyword) for sku in ("SKU001", "SKU002") for keyword in KEYWORDS], columns=["SKU", "Keyword"])
+
+    pd.testing.assert_frame_equal(
+        generator.generate_keyword_pairs_sheet(pairs, settings),
+        generator.generate_bulk_sheet(KEYWORDS, ["SKU001", "SKU002"], settings)
+    )
+    assert generator.planned_keyword_pairs_rows(pairs, settings) == generator.planned_rows(KEYWORDS, ["SKU001", "SKU002"], settings)
+
+def test_only_real_pairs_are_generated(settings):
+    settings.match_types = ["exact", "phrase"]
+    settings.keyword_bids = {"socks": 0.3}
+    pairs = pd.DataFrame({
+        "SKU": ["SKU002", " SKU001 ", "SKU002", "SKU002", "SKU001", ""],
+        "Keyword": ["socks", "red shoes", "shoes", "socks", "blue shoes", "hats"],
+        "Bid": [None, "1.2", "oops", 9.0, None, None],
+        "Match Type": ["", "Exact", "phrase", "", None, ""],
+    })
+    existing = BulkExportIndex(targeted={("SKU001", "blue shoes", "phrase")})
+    df = BulkSheetGenerator().generate_keyword_pairs_sheet(pairs, settings, existing=existing)
+
+    # SKUs in first-seen order; the first pair of a SKU and keyword wins; pair bids beat keyword bids
+    assert keyword_rows(df) == [
+        ("SKU002", "socks", "exact", "0.30"),
+        ("SKU002", "socks", "phrase", "0.30"),
+        ("SKU002", "shoes", "phrase", "0.60"),
+        ("SKU001", "red shoes", "exact", "1.20"),
+        ("SKU001", "blue shoes", "exact", "0.75"),
+    ]
+    assert len(df[df["Entity"] == BulkSheetGenerator.ENTITY_CAMPAIGN]) == 3
+
+def test_negatives_come_from_the_skus_own_exact_keywords(settings):
+    pairs = pd.DataFrame({
+        "SKU": ["SKU001", "SKU001", "SKU002"],
+        "Keyword": ["red shoes", "shoes", "blue shoes"],
+        "Match Type": ["exact", "broad", "exact"],
+    })
+    df = BulkSheetGenerator().generate_keyword_pairs_sheet(pairs, settings)
+    skus, negatives = with_skus(df, BulkSheetGenerator.ENTITY_NEGATIVE_KEYWORD)
+
+    assert list(zip(skus, negatives["Keyword Text"])) == [("SKU001", "red shoes")]
+
+def test_invalid_pairs_are_rejected(settings):
+    generator = BulkSheetGenerator()
+    with pytest.raises(ValueError, match="'SKU' and 'Keyword'"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["SKU001"]}), settings)
+    with pytest.raises(ValueError, match="Invalid match types"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["A"], "Keyword": ["x"], "Match Type": ["fuzzy"]}), settings)
+    settings.match_types = ["exact"]
+    with pytest.raises(ValueError, match="not in the campaign match types: broad"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["A"], "Keyword": ["x"], "Match Type": ["broad"]}), settings)
+
+def test_pair_keywords_and_skus_are_validated(settings):
+    generator = BulkSheetGenerator()
+    with pytest.raises(ValueError, match="Invalid characters in SKU: SKU 001"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["SKU 001"], "Keyword": ["socks"]}), settings)
+    with pytest.raises(ValueError, match=r"Invalid characters in Keyword: £5 off \(and 1 more invalid items\)"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["A", "A"], "Keyword": ["£5 off", "50% off"]}), settings)
+    with pytest.raises(ValueError, match="exceeds maximum length of 80"):
+        generator.generate_keyword_pairs_sheet(pd.DataFrame({"SKU": ["A"], "Keyword": ["x" * 81]}), settings)
+
+@pytest.mark.parametrize("bid", ["-1", "0", "0.001", "0.02"])
+def test_pair_bids_must_exceed_the_minimum(settings, bid):
+    pairs = pd.DataFrame({"SKU": ["A", "A"], "Keyword": ["socks", "shoes"], "Bid": ["0.5", bid]})
+    with pytest.raises(ValueError, match="Invalid value for Bid: must be greater than 0.02"):
+        BulkSheetGenerator().generate_keyword_pairs_sheet(pairs, settings)
+
+def test_pair_keywords_differing_in_case_are_merged(settings):
+    settings.match_types = ["exact"]
+    pairs = pd.DataFrame({
+        "SKU": ["A", "A", "Ａ"],  # The full-width A normalizes to A
+        "Keyword": ["kw  x", "KW x", "Kw X"],
+        "Bid": ["1.5", "2", None],
+    })
+    df = BulkSheetGenerator().generate_keyword_pairs_sheet(pairs, settings)
+
+    assert keyword_rows(df) == [("A", "kw x", "exact", "1.50")]
+    assert len(df[df["Entity"] == BulkSheetGenerator.ENTITY_CAMPAIGN]) == 1
+
+def test_pairs_are_loaded_from_csv(tmp_path, settings):
+    path = tmp_path / "pairs.csv"
+    path.write_text("SKU,Keyword,Bid\n00123,red shoes,1.5\n00123,socks,\n")
+    cache = ResourceCache(max_bytes=1024 * 1024)
+    pairs = BulkSheetGenerator.load_keyword_pairs(str(path), cache=cache)
+
+    assert list(pairs.columns) == KEYWORD_PAIR_COLUMNS
+    assert list(pairs["SKU"]) == ["00123", "00123"]
+    assert pairs["Bid"].tolist()[0] == 1.5 and pd.isna(pairs["Bid"].tolist()[1])
+    pairs.loc[0, "Keyword"] = "changed"
+    assert BulkSheetGenerator.load_keyword_pairs(str(path), cache=cache)["Keyword"][0] == "red shoes"
+    assert cache.hits == 1
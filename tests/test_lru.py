@@ -0,0 +1,27 @@
+from src.amazon_bulk_generator.utils.lru import BoundedLRU, approximate_size
+
+def test_size_limit_evicts_least_recently_used():
+    lru = BoundedLRU(max_size=250)
+    for key in "abc":
+        lru.put(key, key.upper(), 100)
+        lru.get("a")  # "a" stays the most recently used
+    assert lru.evict(protect=["c"]) == [("b", "B")]
+    assert [key for key, _ in lru.items()] == ["c", "a"]
+    assert lru.size == 200
+
+def test_entry_limit_expiry_and_protection():
+    lru = BoundedLRU(max_entries=1)
+    lru.put("old", 1)
+    lru.put("new", 2)
+    assert lru.evict(protect=["old"]) == [("new", 2)]
+
+    lru.put("new", 2)
+    assert lru.evict(protect=["new"], expired=lambda key, value: value == 1) == [("old", 1)]
+    assert len(lru) == 1 and "new" in lru and lru.pop("new") == 2 and lru.size == 0
+
+def test_replacing_an_entry_updates_the_size():
+    lru = BoundedLRU()
+    lru.put("a", "x", 10)
+    lru.put("a", "y", 4)
+    assert lru.size == 4 and lru.get("a") == "y" and lru.evict() == []
+    assert approximate_size({"k": ["v"]}) > approximate_size({})
@@ -0,0 +1,75 @@
+import socket
+import sys
+import urllib.request
+import pandas as pd
+from src.amazon_bulk_generator.utils.metrics import (
+    MetricsRegistry,
+    EXPORT_SECONDS,
+    VALIDATION_FAILURES,
+    peak_memory_bytes,
+    start_metrics_server
+)
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.core.validators import validate_skus_report
+
+def test_render_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests handled', ['format'])
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1))
+    registry.gauge('temperature', 'Constant', function=lambda: 21.5)
+
+    requests.inc(format='csv')
+    requests.inc(2, format='x"lsx')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    lines = registry.render().splitlines()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{format="csv"} 1' in lines
+    assert 'requests_total{format="x\\"lsx"} 2' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum 5.55' in lines
+    assert 'latency_seconds_count 3' in lines
+    assert 'temperature 21.5' in lines
+
+def test_labels_must_match():
+    registry = MetricsRegistry()
+    counter = registry.counter('things_total', 'Things', ['kind'])
+    try:
+        counter.inc(other='x')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Mismatched labels should be rejected")
+
+def test_exports_and_validation_are_recorded(tmp_path):
+    csv_before = EXPORT_SECONDS.count(format='csv')
+    failures_before = VALIDATION_FAILURES.value(field='SKU')
+
+    FileHandler(base_dir=str(tmp_path)).save_bulk_sheet(pd.DataFrame({'a': [1, 2]}), 'csv')
+    validate_skus_report(['GOOD-SKU', 'bad sku!'])
+
+    assert EXPORT_SECONDS.count(format='csv') == csv_before + 1
+    assert VALIDATION_FAILURES.value(field='SKU') == failures_before + 1
+
+def test_peak_memory_without_resource_module(monkeypatch):
+    assert peak_memory_bytes() > 0
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    assert peak_memory_bytes() == 0
+
+def test_server_serves_registry():
+    assert start_metrics_server(port=0) is None
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = start_metrics_server(port=port)
+    assert start_metrics_server(port=port) is server
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+        body = response.read().decode('utf-8')
+        assert response.headers['Content-Type'].startswith('text/plain')
+    assert '# TYPE bulk_active_jobs gauge' in body
+    assert 'process_resident_memory_bytes' in body
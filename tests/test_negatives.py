@@ -0,0 +1,38 @@
+import time
+from src.amazon_bulk_generator.core.negatives import NegativeKeywordIndex, MATCH_TYPE_NEGATIVE_EXACT
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignIdIndex
+
+EXACT_TERMS = ["red running shoes", "running shoes", "shoes red running", "blue socks", "Running  Shoes"]
+
+def test_phrase_negatives_require_contiguous_tokens():
+    index = NegativeKeywordIndex(EXACT_TERMS)
+    assert len(index) == 4  # "Running  Shoes" duplicates "running shoes"
+    assert index.negatives_for(["running shoes"], "phrase") == ["red running shoes", "running shoes"]
+
+def test_broad_negatives_ignore_token_order():
+    index = NegativeKeywordIndex(EXACT_TERMS)
+    assert index.negatives_for(["shoes running"], "broad") == ["red running shoes", "running shoes", "shoes red running"]
+    assert index.negatives_for(["socks"], "broad") == ["blue socks"]
+    assert index.negatives_for(["sandals"], "broad") == []
+    assert index.negatives_for(["running shoes"], "exact") == []
+
+def test_generator_adds_negative_rows_to_broad_and_phrase_campaigns(make_settings):
+    settings = make_settings(["exact", "phrase", "broad"], isolate_match_types=True)
+    df = BulkSheetGenerator().generate_bulk_sheet(["running shoes", "red running shoes"], ["SKU001"], settings)
+    negatives = df[df["Entity"] == BulkSheetGenerator.ENTITY_NEGATIVE_KEYWORD]
+
+    assert set(negatives["Match Type"]) == {MATCH_TYPE_NEGATIVE_EXACT}
+    keywords = df[df["Entity"] == BulkSheetGenerator.ENTITY_KEYWORD]
+    exact_campaigns = set(keywords.loc[keywords["Match Type"] == "exact", "Campaign ID"])
+    assert not set(negatives["Campaign ID"]) & exact_campaigns
+    by_campaign = negatives.groupby("Campaign ID")["Keyword Text"].apply(list).to_dict()
+    assert by_campaign[CampaignIdIndex.campaign_id("SKU001_phrase_running_shoes")] == ["running shoes", "red running shoes"]
+    assert by_campaign[CampaignIdIndex.campaign_id("SKU001_phrase_red_running_shoes")] == ["red running shoes"]
+
+def test_index_scales_to_large_keyword_lists():
+    keywords = [f"brand{i % 500} product{i} size{i % 7}" for i in range(50_000)]
+    start = time.perf_counter()
+    index = NegativeKeywordIndex(keywords)
+    negatives = [index.negatives_for([keyword], "broad") for keyword in keywords]
+    assert time.perf_counter() - start < 10
+    assert all(negatives[i] == [keywords[i]] for i in range(0, 50_000, 997))
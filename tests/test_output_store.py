@@ -0,0 +1,95 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.utils.output_store import OutputStore, RetentionPolicy, atomic_path
+
+def _write(store, name, size):
+    path = store.path_for(name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    store = OutputStore(str(tmp_path), RetentionPolicy(max_bytes=250, max_age_seconds=None, max_files=None))
+    first = _write(store, "a.csv", 100)
+    store.add(first)
+    store.add(_write(store, "b.csv", 100))
+    store.touch(first)  # "a" is now more recently used than "b"
+    store.add(_write(store, "c.csv", 100))
+
+    assert [artifact.name for artifact in store.artifacts()] == ["a.csv", "c.csv"]
+    assert not os.path.exists(store.path_for("b.csv"))
+    assert store.total_bytes == 200
+
+def test_file_limit_never_evicts_new_artifact(tmp_path):
+    store = OutputStore(str(tmp_path), RetentionPolicy(max_bytes=10, max_age_seconds=None, max_files=1))
+    store.add(_write(store, "a.csv", 50))
+    store.add(_write(store, "b.csv", 50))
+
+    assert [artifact.name for artifact in store.artifacts()] == ["b.csv"]
+
+def test_age_limit(tmp_path):
+    store = OutputStore(str(tmp_path), RetentionPolicy(max_bytes=None, max_age_seconds=60, max_files=None))
+    store.add(_write(store, "old.csv", 10))
+
+    evicted = store.enforce(now=time.time() + 120)
+    assert evicted == ["old.csv"]
+    assert store.artifacts() == []
+
+def test_index_is_persisted_and_rebuilt(tmp_path):
+    policy = RetentionPolicy(max_bytes=None, max_age_seconds=None, max_files=None)
+    store = OutputStore(str(tmp_path), policy)
+    store.add(_write(store, "a.csv", 10))
+    assert [artifact.name for artifact in OutputStore(str(tmp_path), policy).artifacts()] == ["a.csv"]
+
+    # Files present before the index existed are picked up
+    os.remove(store.index_path)
+    _write(store, "b.csv", 10)
+    names = {artifact.name for artifact in OutputStore(str(tmp_path), policy).artifacts()}
+    assert names == {"a.csv", "b.csv"}
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("OUTPUT_MAX_MB", "1")
+    monkeypatch.setenv("OUTPUT_MAX_AGE_HOURS", "0")
+    policy = RetentionPolicy.from_env()
+    assert policy.max_bytes == 1024 * 1024
+    assert policy.max_age_seconds is None
+
+def test_atomic_path_leaves_no_partial_file(tmp_path):
+    target = tmp_path / "out.csv"
+    with pytest.raises(RuntimeError):
+        with atomic_path(str(target)) as temp_path:
+            with open(temp_path, "w") as f:
+                f.write("partial")
+            raise RuntimeError("writer failed")
+
+    assert os.listdir(tmp_path) == []
+
+def test_concurrent_saves_get_unique_files(tmp_path):
+    handler = FileHandler(base_dir=str(tmp_path))
+    df = pd.DataFrame({"SKU": ["SKU001"], "Bid": ["0.75"]})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        paths = list(executor.map(lambda _: handler.save_bulk_sheet(df, "csv"), range(20)))
+
+    assert len(set(paths)) == 20
+    assert len(handler.output_store.artifacts()) == 20
+    assert not [name for name in os.listdir(tmp_path / "output") if ".tmp" in name]
+
+def test_file_handlers_share_output_store(tmp_path):
+    assert FileHandler(base_dir=str(tmp_path)).output_store is FileHandler(base_dir=str(tmp_path)).output_store
+
+def test_formats_of_one_job_share_name(tmp_path):
+    handler = FileHandler(base_dir=str(tmp_path))
+    df = pd.DataFrame({"SKU": ["SKU001"]})
+    excel_path = handler.save_bulk_sheet(df, "xlsx", job_id="job1")
+    csv_path = handler.save_bulk_sheet(df, "csv", job_id="job1")
+
+    assert os.path.splitext(excel_path)[0] == os.path.splitext(csv_path)[0]
+    assert pd.read_excel(excel_path)["SKU"].tolist() == ["SKU001"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,61 @@
+import time
+import pytest
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignIdIndex
+from src.amazon_bulk_generator.core.bulk_export import BulkExportIndex
+from src.amazon_bulk_generator.core.validators import validate_asins, validate_asins_report
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings([], product_targeting_bid=0.6)
+
+def test_asin_validation_reports_every_bad_format():
+    assert validate_asins(["B07XYZ1234", "0306406152"]) == (True, None)
+    report = validate_asins_report(["B07XYZ1234", "INVALID123", "", "B07XYZ12345", "b07xyz1234"])
+    assert [issue.index for issue in report.issues] == [1, 2, 3, 4]
+    assert "format" in report.issues[0].reason.lower()
+    assert not validate_asins([])[0]
+
+def test_product_targeting_rows(settings):
+    df = BulkSheetGenerator().generate_product_targeting_sheet(["B07XYZ1234", "b07abc4567"], ["SKU001"], settings)
+    targets = df[df["Entity"] == BulkSheetGenerator.ENTITY_PRODUCT_TARGETING]
+
+    assert list(targets["Product Targeting Expression"]) == ['asin="B07XYZ1234"', 'asin="B07ABC4567"']
+    assert set(targets["Bid"]) == {"0.60"}
+    assert list(df[df["Entity"] == "Campaign"]["Campaign Name"]) == [
+        "SP_SKU001_asin_b07xyz1234", "SP_SKU001_asin_b07abc4567"
+    ]
+    assert targets["Keyword Text"].isna().all()
+
+def test_sparse_pairs_and_existing_targets(settings):
+    settings.keyword_group_size = 2
+    existing = BulkExportIndex(product_targets={("SKU002", 'asin="b07abc4567"')})
+    pairs = [("SKU001", "B07XYZ1234"), ("SKU002", "B07ABC4567"), ("SKU001", "B07ABC4567"), ("SKU002", "B07DEF8901")]
+    df = BulkSheetGenerator().generate_product_targeting_sheet([], [], settings, existing=existing, pairs=pairs)
+    targets = df[df["Entity"] == BulkSheetGenerator.ENTITY_PRODUCT_TARGETING]
+
+    assert targets.groupby("Campaign ID")["Product Targeting Expression"].apply(list).to_dict() == {
+        CampaignIdIndex.campaign_id("SKU001_asin_b07xyz1234"): ['asin="B07XYZ1234"', 'asin="B07ABC4567"'],
+        CampaignIdIndex.campaign_id("SKU002_asin_b07def8901"): ['asin="B07DEF8901"'],
+    }
+
+def test_missing_bid_is_rejected(settings):
+    settings.product_targeting_bid = None
+    with pytest.raises(ValueError):
+        BulkSheetGenerator().generate_product_targeting_sheet(["B07XYZ1234"], ["SKU001"], settings)
+
+def test_catalog_scale_targeting_matches_keyword_speed(settings):
+    asins = [f"B0{i:08d}" for i in range(20_000)]
+    settings.keyword_group_size = 100
+    settings.match_types = ["exact"]
+    settings.bids = {"exact": 0.6}
+    generator = BulkSheetGenerator()
+
+    start = time.perf_counter()
+    targets = generator.generate_product_targeting_sheet(asins, ["SKU001", "SKU002"], settings)
+    targeting_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    keywords = generator.generate_bulk_sheet([f"keyword {i}" for i in range(20_000)], ["SKU001", "SKU002"], settings)
+    keyword_seconds = time.perf_counter() - start
+
+    assert len(targets) == len(keywords)
+    assert targeting_seconds < keyword_seconds * 2 + 1
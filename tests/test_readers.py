@@ -0,0 +1,75 @@
+import gzip
+import io
+import zipfile
+import pytest
+from openpyxl import Workbook
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.utils.readers import ENCODING_SAMPLE_SIZE, detect_encoding, iter_column_values
+
+CSV_CONTENT = "Keyword,Notes\ngaming keyboard,a\nwireless mouse,b\n\nlaptop stand,c\n"
+EXPECTED = ["gaming keyboard", "wireless mouse", "laptop stand"]
+
+@pytest.fixture
+def file_handler(tmp_path):
+    return FileHandler(base_dir=str(tmp_path))
+
+def test_load_csv(tmp_path, file_handler):
+    path = tmp_path / "keywords.csv"
+    path.write_text(CSV_CONTENT)
+    assert file_handler.load_csv_data(str(path)) == EXPECTED
+
+def test_leading_zeros_are_kept(tmp_path, file_handler):
+    path = tmp_path / "skus.csv"
+    path.write_text("SKU\n00123\n0456\n")
+    assert file_handler.load_input_data(str(path)) == ["00123", "0456"]
+
+def test_load_gzip_and_zip(tmp_path, file_handler):
+    gz_path = tmp_path / "keywords.csv.gz"
+    with gzip.open(gz_path, "wt") as f:
+        f.write(CSV_CONTENT)
+    assert file_handler.load_input_data(str(gz_path)) == EXPECTED
+
+    zip_path = tmp_path / "keywords.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("readme/", "")
+        archive.writestr("keywords.csv", CSV_CONTENT)
+    assert file_handler.load_input_data(str(zip_path)) == EXPECTED
+
+def test_load_xlsx_upload(file_handler):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(["SKU"])
+    for sku in ["SKU001", "SKU002", None, 12345]:
+        worksheet.append([sku])
+    upload = io.BytesIO()
+    workbook.save(upload)
+    upload.name = "skus.xlsx"
+
+    assert file_handler.load_input_data(upload) == ["SKU001", "SKU002", "12345"]
+
+def test_encoding_detection(tmp_path, file_handler):
+    sample = ("a" * (ENCODING_SAMPLE_SIZE - 4) + "café").encode("utf-8")[:ENCODING_SAMPLE_SIZE]
+    assert detect_encoding(sample) == "utf-8"  # Sample ends inside a multi-byte character
+    assert detect_encoding(b"\xef\xbb\xbfabc") == "utf-8-sig"
+    assert detect_encoding("café".encode("cp1252")) == "cp1252"
+
+    path = tmp_path / "keywords.csv"
+    path.write_bytes("Keyword\ncafé crème\n".encode("cp1252"))
+    assert file_handler.load_input_data(str(path)) == ["café crème"]
+
+def test_chunked_iteration_and_column_selection(tmp_path):
+    path = tmp_path / "keywords.csv"
+    path.write_text("Keyword,SKU\n" + "".join(f"kw{i},SKU{i}\n" for i in range(25)))
+
+    chunks = list(iter_column_values(str(path), column=1, chunksize=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[0][0] == "SKU0"
+
+def test_empty_file_raises(tmp_path, file_handler):
+    path = tmp_path / "empty.csv"
+    path.write_text("Keyword\n")
+    with pytest.raises(Exception):
+        file_handler.load_input_data(str(path))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
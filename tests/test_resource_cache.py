@@ -0,0 +1,67 @@
+import os
+import pandas as pd
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.utils.resource_cache import ResourceCache
+
+def write(path, text, mtime_ns=None):
+    with open(path, "w") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_unchanged_files_are_parsed_once(tmp_path):
+    path = str(tmp_path / "bids.csv")
+    write(path, "Keyword,Bid\nred shoes,1.5\n")
+    cache = ResourceCache(max_bytes=1024 * 1024)
+    parses = []
+    parse = lambda p: parses.append(p) or pd.read_csv(p)
+
+    first = cache.get(path, "frame", parse)
+    assert cache.get(path, "frame", parse) is first
+    assert len(parses) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+def test_changed_files_are_parsed_again(tmp_path):
+    path = str(tmp_path / "template.csv")
+    write(path, "Keyword\nold\n", mtime_ns=1_000_000_000)
+    cache = ResourceCache(max_bytes=1024 * 1024)
+    assert cache.get(path, "text", lambda p: open(p).read()) == "Keyword\nold\n"
+
+    # Same size, new modification time
+    write(path, "Keyword\nnew\n", mtime_ns=2_000_000_000)
+    assert cache.get(path, "text", lambda p: open(p).read()) == "Keyword\nnew\n"
+    assert len(cache) == 1 and cache.misses == 2
+
+def test_memory_bound_evicts_least_recently_used(tmp_path):
+    paths = [str(tmp_path / f"file{i}.txt") for i in range(3)]
+    for path in paths:
+        write(path, "x" * 1000)
+    read = lambda p: open(p).read()
+    cache = ResourceCache(max_bytes=2500)
+
+    cache.get(paths[0], "text", read)
+    cache.get(paths[1], "text", read)
+    cache.get(paths[0], "text", read)
+    cache.get(paths[2], "text", read)
+    assert len(cache) == 2 and cache.total_bytes <= 2500
+    cache.get(paths[0], "text", read)
+    assert cache.hits == 2
+
+    cache.invalidate()
+    assert len(cache) == 0 and cache.total_bytes == 0
+    assert ResourceCache(max_bytes=0).get(paths[0], "text", read) == "x" * 1000
+
+def test_loaders_use_the_cache(tmp_path):
+    os.makedirs(tmp_path / "templates")
+    write(str(tmp_path / "templates" / "keywords_template.csv"), "Keyword\nred shoes\n")
+    bids = str(tmp_path / "bids.csv")
+    write(bids, "Keyword,Bid\nred shoes,1.5\nblue shoes,oops\n")
+    cache = ResourceCache(max_bytes=1024 * 1024)
+    handler = FileHandler(str(tmp_path), resource_cache=cache)
+
+    assert handler.load_template_data("keywords") == handler.load_template_data("keywords") == "Keyword\nred shoes\n"
+    assert handler.load_template_data("skus") == ""
+    loaded = BulkSheetGenerator.load_keyword_bids(bids, cache=cache)
+    loaded["green shoes"] = 2.0
+    assert BulkSheetGenerator.load_keyword_bids(bids, cache=cache) == {"red shoes": 1.5}
+    assert (cache.hits, cache.misses) == (2, 2)
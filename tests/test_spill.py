@@ -0,0 +1,72 @@
+import logging
+import os
+import sys
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler
+from src.amazon_bulk_generator.utils.spill import SpillBuffer, SPILL_FORMAT_CSV, SPILL_FORMAT_PARQUET, default_spill_format
+
+KEYWORDS = [f"keyword {i}" for i in range(300)]
+SKUS = ["SKU001", "SKU002", "SKU003"]
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings(["exact", "phrase"], keyword_group_size=7)
+
+def test_chunks_match_full_generation(settings):
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    chunks = list(generator.iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=500))
+
+    assert len(chunks) > 1
+    # Campaigns are never split across chunks
+    assert all(chunk["Entity"].iat[0] == "Campaign" for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+@pytest.mark.parametrize("spill_format", [SPILL_FORMAT_PARQUET, SPILL_FORMAT_CSV])
+def test_spilled_chunks_round_trip_in_order(tmp_path, settings, spill_format):
+    if spill_format == SPILL_FORMAT_PARQUET:
+        pytest.importorskip("pyarrow")
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+
+    with SpillBuffer(budget_bytes=200_000, directory=str(tmp_path), spill_format=spill_format) as buffer:
+        buffer.extend(generator.iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=500))
+        assert buffer.spilled
+        assert buffer.rows == len(expected)
+        assert buffer.memory_bytes <= 200_000
+        pd.testing.assert_frame_equal(buffer.head(3), expected.head(3))
+        pd.testing.assert_frame_equal(buffer.to_frame(), expected)
+    assert os.listdir(tmp_path) == []
+
+def test_small_results_stay_in_memory(tmp_path, settings):
+    with SpillBuffer(budget_bytes=0, directory=str(tmp_path)) as buffer:
+        buffer.extend(BulkSheetGenerator().iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=500))
+        assert not buffer.spilled
+    assert os.listdir(tmp_path) == []
+
+def test_spilled_sheet_streams_to_output(tmp_path, settings):
+    handler = FileHandler(str(tmp_path))
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+
+    with SpillBuffer(budget_bytes=100_000, directory=handler.get_cache_dir("spill")) as buffer:
+        buffer.extend(generator.iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=500))
+        path = handler.save_bulk_sheet_chunks(buffer.iter_chunks(), "csv")
+
+    written = pd.read_csv(path, dtype=str)
+    assert len(written) == len(expected)
+    assert list(written["Keyword Text"].dropna()) == list(expected["Keyword Text"].dropna())
+
+def test_missing_pyarrow_falls_back_to_csv_with_one_warning(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    default_spill_format.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING):
+            assert default_spill_format() == SPILL_FORMAT_CSV
+            assert default_spill_format() == SPILL_FORMAT_CSV
+    finally:
+        default_spill_format.cache_clear()
+
+    assert sum("pyarrow is not installed" in record.getMessage() for record in caplog.records) == 1
@@ -0,0 +1,55 @@
+import os
+import pandas as pd
+import pytest
+from src.amazon_bulk_generator.core.generator import BulkSheetGenerator
+from src.amazon_bulk_generator.utils.file_handlers import FileHandler, parquet_supported
+
+KEYWORDS = [f"keyword {i}" for i in range(300)]
+SKUS = ["SKU001", "SKU002"]
+
+def test_formats_written_from_one_pass(tmp_path, settings):
+    generator = BulkSheetGenerator()
+    expected = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    passes = []
+
+    def chunks():
+        passes.append(1)
+        yield from generator.iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=100)
+
+    formats = ["xlsx", "csv"] + (["parquet"] if parquet_supported() else [])
+    paths = FileHandler(str(tmp_path)).save_bulk_sheet_formats(chunks(), formats, job_id="tee")
+
+    assert passes == [1]
+    assert sorted(paths) == sorted(formats)
+    csv = pd.read_csv(paths["csv"], dtype=str)
+    xlsx = pd.read_excel(paths["xlsx"], dtype=str)
+    assert len(csv) == len(xlsx) == len(expected)
+    assert list(xlsx["Keyword Text"].dropna()) == list(expected["Keyword Text"].dropna())
+    if "parquet" in paths:
+        parquet = pd.read_parquet(paths["parquet"])
+        assert list(parquet["Keyword Text"].dropna()) == list(expected["Keyword Text"].dropna())
+
+def test_failed_production_keeps_no_files(tmp_path, settings):
+    def chunks():
+        yield from BulkSheetGenerator().iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=50)
+        raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError, match="cancelled"):
+        FileHandler(str(tmp_path)).save_bulk_sheet_formats(chunks(), ["xlsx", "csv"])
+    assert [name for name in os.listdir(tmp_path / "output") if not name.startswith(".index")] == []
+
+def test_writer_failure_is_raised(tmp_path, settings, monkeypatch):
+    handler = FileHandler(str(tmp_path))
+
+    def broken(chunks, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(handler, "_stream_excel", broken)
+    with pytest.raises(OSError, match="disk full"):
+        handler.save_bulk_sheet_formats(
+            BulkSheetGenerator().iter_bulk_sheet_chunks(KEYWORDS, SKUS, settings, chunk_rows=10), ["xlsx", "csv"]
+        )
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        FileHandler(str(tmp_path)).save_bulk_sheet_formats(iter([]), ["pdf"])
@@ -0,0 +1,80 @@
+import json
+import time
+from datetime import date
+from src.amazon_bulk_generator.utils.input_store import input_digest
+from src.amazon_bulk_generator.utils import tracing
+from src.amazon_bulk_generator.utils.tracing import JobTrace, TraceWriter, trace_log_path
+
+def test_trace_record_contents(tmp_path, make_settings):
+    output = tmp_path / "sheet.csv"
+    output.write_text("a,b\n1,2\n")
+    settings = make_settings(keyword_bids={"gaming keyboard": 1.5, "wireless mouse": 0.9})
+
+    trace = JobTrace("job1", "keywords")
+    trace.set_inputs({"keywords": ["gaming keyboard"], "skus": ["SKU001", "SKU002"]})
+    trace.set_settings(settings)
+    with trace.stage("generate"):
+        pass
+    trace.add_output(str(output))
+    record = trace.finish("done")
+
+    assert record["job_id"] == "job1"
+    assert record["inputs"]["skus"] == {"count": 2, "digest": input_digest(["SKU001", "SKU002"])}
+    assert len(record["input_fingerprint"]) == 64
+    assert record["settings"]["bids"] == {"exact": 0.75}
+    assert record["settings"]["keyword_bids"] == {
+        "count": 2, "digest": input_digest(["gaming keyboard\t1.5", "wireless mouse\t0.9"])
+    }
+    assert record["stages"]["generate"] >= 0
+    assert record["outputs"] == [{"path": str(output), "bytes": 8}]
+    assert record["status"] == "done"
+    assert 0 < record["rss_start_bytes"] <= record["rss_peak_bytes"]
+
+def test_peak_memory_is_sampled_while_the_job_runs(monkeypatch):
+    monkeypatch.setattr(tracing._RSS_SAMPLER, "interval", 0.01)
+    before = JobTrace("before", "keywords").finish("done")
+    trace = JobTrace("job", "keywords")
+    blob = b"x" * (64 * 1024 * 1024)
+    time.sleep(0.2)
+    del blob
+    record = trace.finish("done")
+
+    # The allocation was freed before the job finished, so only a sample taken while it ran sees it
+    assert record["rss_peak_bytes"] - record["rss_start_bytes"] >= 48 * 1024 * 1024
+    # A job that ran before the allocation does not report it
+    assert before["rss_peak_bytes"] < record["rss_peak_bytes"]
+
+def test_fingerprint_depends_on_inputs():
+    first, second = JobTrace("a", "keywords"), JobTrace("b", "keywords")
+    first.set_inputs({"keywords": ["x"], "skus": ["y"]})
+    second.set_inputs({"keywords": ["y"], "skus": ["x"]})
+    assert first.record["input_fingerprint"] != second.record["input_fingerprint"]
+
+def test_writer_appends_json_lines(tmp_path):
+    path = tmp_path / "logs" / "jobs.jsonl"
+    writer = TraceWriter(str(path), flush_interval=0.05)
+    for job_id in ("a", "b", "c"):
+        writer.write({"job_id": job_id, "started": date(2025, 1, 1)})
+    writer.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["job_id"] for r in records] == ["a", "b", "c"]
+    assert records[0]["started"] == "2025-01-01"
+
+def test_writer_rotates_full_log(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    for number in range(10):
+        writer = TraceWriter(str(path), flush_interval=0.01, max_bytes=100, backups=2)
+        writer.write({"job_id": f"job-{number}", "padding": "x" * 10})
+        writer.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["jobs.jsonl", "jobs.jsonl.1", "jobs.jsonl.2"]
+    assert all(p.stat().st_size <= 100 for p in tmp_path.iterdir())
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[-1]["job_id"] == "job-9"
+
+def test_trace_log_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("JOB_TRACE_LOG", raising=False)
+    assert trace_log_path(str(tmp_path)) == str(tmp_path / "logs" / "jobs.jsonl")
+    monkeypatch.setenv("JOB_TRACE_LOG", "")
+    assert trace_log_path(str(tmp_path)) is None
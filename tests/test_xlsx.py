@@ -0,0 +1,68 @@
+import os
+import zipfile
+import zlib
+import pandas as pd
+from openpyxl import load_workbook
+from src.amazon_bulk_generator.utils import xlsx
+from src.amazon_bulk_generator.utils.xlsx import crc32_combine, write_xlsx
+
+def frame(start, rows):
+    return pd.DataFrame({
+        "Entity": [f"Keyword {i}" for i in range(start, start + rows)],
+        "Keyword Text": [" leading & <trailing> " if i % 3 == 0 else None for i in range(start, start + rows)],
+        "Bid": [i / 4 for i in range(start, start + rows)],
+    })
+
+def test_crc32_combine_matches_zlib():
+    first, second = os.urandom(1000), os.urandom(70_000)
+    assert crc32_combine(zlib.crc32(first), zlib.crc32(second), len(second)) == zlib.crc32(first + second)
+    assert crc32_combine(zlib.crc32(first), 0, 0) == zlib.crc32(first)
+
+def test_workbook_round_trips(tmp_path):
+    path = str(tmp_path / "sheet.xlsx")
+    chunk = pd.DataFrame({
+        "Text": ["plain", " padded ", "a & b < c", "bell\x07char", "ünïcode", None],
+        "Number": [1, 2.5, None, 4, 5, 6],
+        "Flag": [True, False, None, True, None, False],
+    })
+    assert write_xlsx([chunk, chunk.head(2)], path, "Sponsored Products", workers=1) == 8
+
+    assert zipfile.ZipFile(path).testzip() is None
+    worksheet = load_workbook(path)["Sponsored Products"]
+    rows = list(worksheet.iter_rows(values_only=True))
+    assert rows[0] == ("Text", "Number", "Flag")
+    assert [row[0] for row in rows[1:7]] == ["plain", " padded ", "a & b < c", "bellchar", "ünïcode", None]
+    assert rows[2][1:] == (2.5, False)
+    assert rows[3][1:] == (None, None)  # Missing numbers are empty cells, not "nan"
+    assert len(rows) == 9
+    assert worksheet.column_dimensions["B"].width == len("Number") + 2
+
+def test_parallel_workers_write_the_same_sheet(tmp_path, monkeypatch):
+    monkeypatch.setattr(xlsx, "XLSX_BLOCK_ROWS", 7)
+    monkeypatch.setattr(xlsx, "XLSX_PARALLEL_MIN_ROWS", 0)
+    chunks = [frame(0, 40), frame(40, 25), frame(65, 3)]
+    serial, parallel = str(tmp_path / "serial.xlsx"), str(tmp_path / "parallel.xlsx")
+    write_xlsx(chunks, serial, workers=1)
+    assert write_xlsx(chunks, parallel, workers=2) == 68
+
+    with zipfile.ZipFile(serial) as first, zipfile.ZipFile(parallel) as second:
+        assert second.testzip() is None
+        assert first.read("xl/worksheets/sheet1.xml") == second.read("xl/worksheets/sheet1.xml")
+    expected = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(pd.read_excel(parallel), expected)
+
+def test_blocks_are_compressed_in_slices(monkeypatch):
+    rows = frame(0, 25).astype(object).where(frame(0, 25).notna(), None).to_numpy().tolist()
+    letters = ["A", "B", "C"]
+    whole = xlsx.serialize_rows(rows, 2, letters)
+    monkeypatch.setattr(xlsx, "XLSX_SLICE_ROWS", 4)
+    sliced = xlsx.serialize_rows(iter(rows), 2, letters)
+
+    xml = zlib.decompress(whole[0] + b"\x03\x00", -zlib.MAX_WBITS)
+    assert zlib.decompress(sliced[0] + b"\x03\x00", -zlib.MAX_WBITS) == xml
+    assert sliced[1:] == whole[1:] == (zlib.crc32(xml), len(xml))
+
+def test_empty_sheet(tmp_path):
+    path = str(tmp_path / "empty.xlsx")
+    assert write_xlsx([], path, workers=1) == 0
+    assert list(load_workbook(path).active.iter_rows(values_only=True)) == []